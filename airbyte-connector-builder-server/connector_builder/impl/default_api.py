@@ -4,17 +4,20 @@
 
 import json
 import logging
+from itertools import chain
 from json import JSONDecodeError
-from typing import Any, Dict, Iterable, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
 from urllib.parse import parse_qs, urljoin, urlparse
 
 from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, Type
-from fastapi import Body, HTTPException
+from fastapi import Body, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from jsonschema import ValidationError
 
 from connector_builder.generated.apis.default_api_interface import DefaultApi
 from connector_builder.generated.models.http_request import HttpRequest
 from connector_builder.generated.models.http_response import HttpResponse
+from connector_builder.generated.models.known_exception_info import KnownExceptionInfo
 from connector_builder.generated.models.stream_read import StreamRead
 from connector_builder.generated.models.stream_read_pages import StreamReadPages
 from connector_builder.generated.models.stream_read_request_body import StreamReadRequestBody
@@ -22,12 +25,18 @@ from connector_builder.generated.models.stream_read_slices import StreamReadSlic
 from connector_builder.generated.models.streams_list_read import StreamsListRead
 from connector_builder.generated.models.streams_list_read_streams import StreamsListReadStreams
 from connector_builder.generated.models.streams_list_request_body import StreamsListRequestBody
-from connector_builder.impl.low_code_cdk_adapter import LowCodeSourceAdapter
+from connector_builder.impl.low_code_cdk_adapter import LowCodeSourceAdapter, LowCodeSourceAdapterCache
+
+# media type of the read responses streamed page by page, as newline delimited json
+STREAM_READ_MEDIA_TYPE = "application/x-ndjson"
 
 
 class DefaultApiImpl(DefaultApi):
     logger = logging.getLogger("airbyte.connector-builder")
 
+    def __init__(self, adapter_cache: Optional[LowCodeSourceAdapterCache] = None):
+        self.adapter_cache = adapter_cache or LowCodeSourceAdapterCache()
+
     async def get_manifest_template(self) -> str:
         return """version: "0.1.0"
 definitions:
@@ -100,21 +109,28 @@ spec:
             raise HTTPException(status_code=400, detail=f"Could not list streams with with error: {error.args[0]}")
         return StreamsListRead(streams=stream_list_read)
 
-    async def read_stream(self, stream_read_request_body: StreamReadRequestBody = Body(None, description="")) -> StreamRead:
+    async def read_stream(
+        self, stream_read_request_body: StreamReadRequestBody = Body(None, description=""), request: Request = None
+    ) -> StreamRead:
         """
         Using the provided manifest and config, invokes a sync for the specified stream and returns groups of Airbyte messages
         that are produced during the read operation
+        When the request accepts `application/x-ndjson`, the pages and logs are streamed back as soon as they're read instead,
+        one partial StreamRead per line (see _stream_message_groups)
         :param stream_read_request_body: Input parameters to trigger the read operation for a stream
-        :return: Airbyte record messages produced by the sync grouped by slice and page
+        :param request: The HTTP request, injected by FastAPI
+        :return: Airbyte record messages produced by the sync grouped by slice and page (or the StreamingResponse of them,
+        which FastAPI sends as is)
         """
         adapter = self._create_low_code_adapter(manifest=stream_read_request_body.manifest)
+        message_groups = self._get_message_groups(adapter.read_stream(stream_read_request_body.stream, stream_read_request_body.config))
+        if request is not None and STREAM_READ_MEDIA_TYPE in request.headers.get("accept", ""):
+            return self._stream_message_groups(message_groups)
 
         single_slice = StreamReadSlices(pages=[])
         log_messages = []
         try:
-            for message_group in self._get_message_groups(
-                    adapter.read_stream(stream_read_request_body.stream, stream_read_request_body.config)
-            ):
+            for message_group in message_groups:
                 if isinstance(message_group, AirbyteLogMessage):
                     log_messages.append({"message": message_group.message})
                 else:
@@ -125,6 +141,31 @@ spec:
 
         return StreamRead(logs=log_messages, slices=[single_slice])
 
+    def _stream_message_groups(self, message_groups: Iterator[Union[StreamReadPages, AirbyteLogMessage]]) -> StreamingResponse:
+        """
+        Streams the message groups back as they're read, each line is a StreamRead with a single page or a single log message,
+        the client appends them to build the full StreamRead. Errors raised by the first request of the read are still returned
+        with a 400 status code, an error raised once the response is started is sent as a last KnownExceptionInfo line.
+        """
+        try:
+            first_group = next(message_groups)
+        except Exception as error:
+            raise HTTPException(status_code=400, detail=f"Could not perform read with with error: {error.args[0]}")
+
+        def lines() -> Iterator[str]:
+            try:
+                for message_group in chain([first_group], message_groups):
+                    if isinstance(message_group, AirbyteLogMessage):
+                        stream_read = StreamRead(logs=[{"message": message_group.message}], slices=[])
+                    else:
+                        stream_read = StreamRead(logs=[], slices=[StreamReadSlices(pages=[message_group])])
+                    yield stream_read.json(by_alias=True) + "\n"
+            except Exception as error:
+                yield KnownExceptionInfo(message=f"Could not perform read with with error: {error.args[0]}").json(by_alias=True) + "\n"
+
+        # the sync iterator is consumed in a thread pool, the read doesn't block the event loop
+        return StreamingResponse(lines(), media_type=STREAM_READ_MEDIA_TYPE)
+
     def _get_message_groups(self, messages: Iterable[AirbyteMessage]) -> Iterable[Union[StreamReadPages, AirbyteLogMessage]]:
         """
         Message groups are partitioned according to when request log messages are received. Subsequent response log messages
@@ -195,10 +236,9 @@ spec:
             self.logger.warning(f"Failed to parse log message into response object with error: {error}")
             return None
 
-    @staticmethod
-    def _create_low_code_adapter(manifest: Dict[str, Any]) -> LowCodeSourceAdapter:
+    def _create_low_code_adapter(self, manifest: Dict[str, Any]) -> LowCodeSourceAdapter:
         try:
-            return LowCodeSourceAdapter(manifest=manifest)
+            return self.adapter_cache.get(manifest)
         except ValidationError as error:
             # TODO: We're temporarily using FastAPI's default exception model. Ideally we should use exceptions defined in the OpenAPI spec
             raise HTTPException(status_code=400, detail=f"Invalid connector manifest with error: {error.message}")
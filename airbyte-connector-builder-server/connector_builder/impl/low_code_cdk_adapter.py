@@ -2,6 +2,10 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, Iterable, List
 
 from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog
@@ -47,3 +51,38 @@ class LowCodeSourceAdapter:
         generator = self._source.read(logger=self._source.logger, config=config, catalog=configured_catalog)
         for message in generator:
             yield message
+
+
+class LowCodeSourceAdapterCache:
+    """
+    Keeps the adapters of the most recently used manifests, keyed by a hash of the manifest contents.
+    The builder sends the same manifest over and over while the config or the tested stream changes, so the manifest
+    doesn't have to be resolved, built and validated again for each request. The least recently used adapters are evicted.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self._max_size = max_size
+        self._adapters: "OrderedDict[str, LowCodeSourceAdapter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_manifest_hash(manifest: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(manifest, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, manifest: Dict[str, Any]) -> LowCodeSourceAdapter:
+        # the hash is computed before the adapter is created, the manifest is updated in place while it's resolved
+        manifest_hash = self.get_manifest_hash(manifest)
+        with self._lock:
+            if manifest_hash in self._adapters:
+                self._adapters.move_to_end(manifest_hash)
+                return self._adapters[manifest_hash]
+        # invalid manifests raise here and aren't cached
+        adapter = LowCodeSourceAdapter(manifest=manifest)
+        with self._lock:
+            self._adapters[manifest_hash] = adapter
+            while len(self._adapters) > self._max_size:
+                self._adapters.popitem(last=False)
+        return adapter
+
+    def __len__(self) -> int:
+        return len(self._adapters)
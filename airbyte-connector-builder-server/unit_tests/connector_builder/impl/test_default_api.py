@@ -3,6 +3,7 @@
 #
 
 import asyncio
+import copy
 import json
 from unittest.mock import MagicMock, patch
 
@@ -15,6 +16,7 @@ from connector_builder.generated.models.http_response import HttpResponse
 from connector_builder.generated.models.stream_read import StreamRead
 from connector_builder.generated.models.stream_read_pages import StreamReadPages
 from connector_builder.generated.models.stream_read_request_body import StreamReadRequestBody
+from connector_builder.generated.models.stream_read_slices import StreamReadSlices
 from connector_builder.generated.models.streams_list_read import StreamsListRead
 from connector_builder.generated.models.streams_list_read_streams import StreamsListReadStreams
 from connector_builder.generated.models.streams_list_request_body import StreamsListRequestBody
@@ -464,3 +466,111 @@ def test_create_response_from_log_message(log_message, expected_response):
     actual_response = api._create_response_from_log_message(airbyte_log_message)
 
     assert actual_response == expected_response
+
+
+def test_read_stream_streams_pages():
+    request = {"url": "https://demonslayers.com/api/v1/hashiras?era=taisho"}
+    response = {"status_code": 200, "headers": {"field": "value"}, "body": '{"name": "field"}'}
+    mock_source_adapter = MagicMock()
+    mock_source_adapter.read_stream.return_value = [
+        request_log_message(request),
+        response_log_message(response),
+        record_message("hashiras", {"name": "Shinobu Kocho"}),
+        AirbyteMessage(type=Type.LOG, log=AirbyteLogMessage(level=Level.INFO, message="log message during the page")),
+        request_log_message(request),
+        response_log_message(response),
+        record_message("hashiras", {"name": "Mitsuri Kanroji"}),
+    ]
+    http_request = MagicMock(headers={"accept": "application/x-ndjson"})
+
+    async def read_lines():
+        response = await api.read_stream(
+            StreamReadRequestBody(manifest=MANIFEST, config=CONFIG, stream="hashiras"), request=http_request
+        )
+        return [json.loads(line) async for line in response.body_iterator]
+
+    with patch.object(DefaultApiImpl, "_create_low_code_adapter", return_value=mock_source_adapter):
+        api = DefaultApiImpl()
+        lines = asyncio.get_event_loop().run_until_complete(read_lines())
+
+    assert [StreamRead.parse_obj(line) for line in lines] == [
+        StreamRead(logs=[{"message": "log message during the page"}], slices=[]),
+        StreamRead(
+            logs=[],
+            slices=[
+                StreamReadSlices(
+                    pages=[
+                        StreamReadPages(
+                            request=HttpRequest(url="https://demonslayers.com/api/v1/hashiras", parameters={"era": ["taisho"]}),
+                            response=HttpResponse(status=200, headers={"field": "value"}, body={"name": "field"}),
+                            records=[{"name": "Shinobu Kocho"}],
+                        )
+                    ]
+                )
+            ],
+        ),
+        StreamRead(
+            logs=[],
+            slices=[
+                StreamReadSlices(
+                    pages=[
+                        StreamReadPages(
+                            request=HttpRequest(url="https://demonslayers.com/api/v1/hashiras", parameters={"era": ["taisho"]}),
+                            response=HttpResponse(status=200, headers={"field": "value"}, body={"name": "field"}),
+                            records=[{"name": "Mitsuri Kanroji"}],
+                        )
+                    ]
+                )
+            ],
+        ),
+    ]
+
+
+def test_read_stream_streams_error_after_first_page():
+    def messages():
+        yield request_log_message({"url": "https://demonslayers.com/api/v1/hashiras"})
+        yield response_log_message({"status_code": 200, "body": "{}"})
+        yield request_log_message({"url": "https://demonslayers.com/api/v1/hashiras"})
+        raise ValueError("connection reset")
+
+    mock_source_adapter = MagicMock()
+    mock_source_adapter.read_stream.return_value = messages()
+    http_request = MagicMock(headers={"accept": "application/x-ndjson"})
+
+    async def read_lines():
+        response = await api.read_stream(
+            StreamReadRequestBody(manifest=MANIFEST, config=CONFIG, stream="hashiras"), request=http_request
+        )
+        return [json.loads(line) async for line in response.body_iterator]
+
+    with patch.object(DefaultApiImpl, "_create_low_code_adapter", return_value=mock_source_adapter):
+        api = DefaultApiImpl()
+        lines = asyncio.get_event_loop().run_until_complete(read_lines())
+
+    assert len(lines) == 2
+    assert len(StreamRead.parse_obj(lines[0]).slices[0].pages) == 1
+    assert lines[1]["message"] == "Could not perform read with with error: connection reset"
+
+
+def test_read_stream_streamed_returns_error_if_read_fails_before_first_page():
+    mock_source_adapter = MagicMock()
+    mock_source_adapter.read_stream.return_value = []
+    http_request = MagicMock(headers={"accept": "application/x-ndjson"})
+
+    with patch.object(DefaultApiImpl, "_create_low_code_adapter", return_value=mock_source_adapter):
+        api = DefaultApiImpl()
+        with pytest.raises(HTTPException) as actual_exception:
+            asyncio.get_event_loop().run_until_complete(
+                api.read_stream(StreamReadRequestBody(manifest=MANIFEST, config=CONFIG, stream="hashiras"), request=http_request)
+            )
+
+    assert actual_exception.value.status_code == 400
+    assert actual_exception.value.detail == "Could not perform read with with error: Every message grouping should have at least one request and response"
+
+
+def test_create_low_code_adapter_is_cached():
+    api = DefaultApiImpl()
+
+    adapter = api._create_low_code_adapter(copy.deepcopy(MANIFEST))
+
+    assert api._create_low_code_adapter(copy.deepcopy(MANIFEST)) is adapter
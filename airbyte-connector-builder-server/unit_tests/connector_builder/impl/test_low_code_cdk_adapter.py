@@ -2,18 +2,20 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import copy
 from abc import ABC
 from typing import Any, List, Mapping, Optional, Union
 from unittest.mock import MagicMock
 
 import pytest
 import requests
+from jsonschema import ValidationError
 from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, AirbyteRecordMessage, Level, Type
 from airbyte_cdk.sources.declarative.declarative_stream import DeclarativeStream
 from airbyte_cdk.sources.declarative.parsers.undefined_reference_exception import UndefinedReferenceException
 from airbyte_cdk.sources.streams.http import HttpStream
 
-from connector_builder.impl.low_code_cdk_adapter import LowCodeSourceAdapter
+from connector_builder.impl.low_code_cdk_adapter import LowCodeSourceAdapter, LowCodeSourceAdapterCache
 
 
 class MockConcreteStream(HttpStream, ABC):
@@ -288,3 +290,37 @@ def test_read_streams_invalid_reference():
 
     with pytest.raises(UndefinedReferenceException):
         LowCodeSourceAdapter(invalid_reference_manifest)
+
+
+def test_adapter_cache_reuses_adapter_of_same_manifest():
+    cache = LowCodeSourceAdapterCache()
+
+    adapter = cache.get(copy.deepcopy(MANIFEST))
+
+    assert cache.get(copy.deepcopy(MANIFEST)) is adapter
+    assert cache.get(copy.deepcopy(MANIFEST_WITH_REFERENCES)) is not adapter
+    assert len(cache) == 2
+
+
+def test_adapter_cache_evicts_least_recently_used_adapter():
+    cache = LowCodeSourceAdapterCache(max_size=2)
+    adapter = cache.get(copy.deepcopy(MANIFEST))
+    cache.get(copy.deepcopy(MANIFEST_WITH_REFERENCES))
+    cache.get(copy.deepcopy(MANIFEST))
+
+    other_manifest = copy.deepcopy(MANIFEST)
+    other_manifest["definitions"]["requester"]["url_base"] = "https://demonslayers.com/api/v2/"
+    cache.get(other_manifest)
+
+    assert len(cache) == 2
+    assert cache.get(copy.deepcopy(MANIFEST)) is adapter
+    assert len(cache) == 2
+
+
+def test_adapter_cache_does_not_cache_invalid_manifest():
+    cache = LowCodeSourceAdapterCache()
+
+    with pytest.raises(ValidationError):
+        cache.get(copy.deepcopy(INVALID_MANIFEST))
+
+    assert len(cache) == 0
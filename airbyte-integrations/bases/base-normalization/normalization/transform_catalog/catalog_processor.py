@@ -6,7 +6,9 @@
 import json
 import os
 import re
-from typing import Any, Dict, List, Set
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, zip_longest
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode, SyncMode
@@ -26,22 +28,27 @@ class CatalogProcessor:
     targeted destination schema.
 
     This is relying on a StreamProcessor to handle the conversion of a stream to a table one at a time.
+    Once the table names of all streams are resolved, the top-level streams (with their nested streams) are independent,
+    so their models are generated in parallel worker processes.
     """
 
-    def __init__(self, output_directory: str, destination_type: DestinationType):
+    def __init__(self, output_directory: str, destination_type: DestinationType, max_workers: Optional[int] = None):
         """
         @param output_directory is the path to the directory where this processor should write the resulting SQL files (DBT models)
         @param destination_type is the destination type of warehouse
+        @param max_workers is the number of processes generating the models, defaults to the number of CPUs
         """
         self.output_directory: str = output_directory
         self.destination_type: DestinationType = destination_type
+        self.max_workers: int = max_workers or os.cpu_count() or 1
         self.name_transformer: DestinationNameTransformer = DestinationNameTransformer(destination_type)
         self.models_to_source: Dict[str, str] = {}
 
     def process(self, catalog_file: str, json_column_name: str, default_schema: str):
         """
-        This method first parse and build models to handle top-level streams.
-        In a second loop will go over the substreams that were nested in a breadth-first traversal manner.
+        This method first parse the top-level streams and resolves the table names of all (nested) streams.
+        Then it builds the models of each top-level stream and its substreams, nested in a breadth-first traversal manner.
+        The models are output in the same order as if they were built one stream at a time, top-level streams first.
 
         @param catalog_file input AirbyteCatalog file in JSON Schema describing the structure of the raw data
         @param json_column_name is the column name containing the JSON Blob with the raw data
@@ -51,7 +58,6 @@ class CatalogProcessor:
         schema_to_source_tables: Dict[str, Set[str]] = {}
         catalog = read_json(catalog_file)
         # print(json.dumps(catalog, separators=(",", ":")))
-        substreams = []
         stream_processors = self.build_stream_processor(
             catalog=catalog,
             json_column_name=json_column_name,
@@ -72,16 +78,23 @@ class CatalogProcessor:
             truncate = self.destination_type == DestinationType.MYSQL or self.destination_type == DestinationType.TIDB
             raw_table_name = self.name_transformer.normalize_table_name(f"_airbyte_raw_{stream_processor.stream_name}", truncate=truncate)
             add_table_to_sources(schema_to_source_tables, stream_processor.schema, raw_table_name)
-
-            nested_processors = stream_processor.process()
-            self.models_to_source.update(stream_processor.models_to_source)
-
-            if nested_processors and len(nested_processors) > 0:
-                substreams += nested_processors
-            for file in stream_processor.sql_outputs:
-                output_sql_file(os.path.join(self.output_directory, file), stream_processor.sql_outputs[file])
+        # levels of nested streams are output across all top-level streams, one level after the other
+        for level in zip_longest(*self.process_streams(stream_processors), fillvalue=[]):
+            for models_to_source, sql_outputs in chain.from_iterable(level):
+                self.models_to_source.update(models_to_source)
+                for file in sql_outputs:
+                    output_sql_file(os.path.join(self.output_directory, file), sql_outputs[file])
         self.write_yaml_sources_file(schema_to_source_tables)
-        self.process_substreams(substreams, tables_registry)
+
+    def process_streams(self, stream_processors: List[StreamProcessor]) -> List[List[List[Tuple[Dict[str, str], Dict[str, str]]]]]:
+        """
+        Builds the models of the top-level streams with their substreams, in parallel when there are multiple streams.
+        The table names are already resolved, so the workers only read their (pickled) copy of the tables registry.
+        """
+        if self.max_workers <= 1 or len(stream_processors) <= 1:
+            return [process_stream_tree(stream_processor) for stream_processor in stream_processors]
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(stream_processors))) as executor:
+            return list(executor.map(process_stream_tree, stream_processors))
 
     @staticmethod
     def build_stream_processor(
@@ -157,22 +170,6 @@ class CatalogProcessor:
             result.append(stream_processor)
         return result
 
-    def process_substreams(self, substreams: List[StreamProcessor], tables_registry: TableNameRegistry):
-        """
-        Handle nested stream/substream/children
-        """
-        while substreams:
-            children = substreams
-            substreams = []
-            for substream in children:
-                substream.tables_registry = tables_registry
-                nested_processors = substream.process()
-                self.models_to_source.update(substream.models_to_source)
-                if nested_processors:
-                    substreams += nested_processors
-                for file in substream.sql_outputs:
-                    output_sql_file(os.path.join(self.output_directory, file), substream.sql_outputs[file])
-
     def write_yaml_sources_file(self, schema_to_source_tables: Dict[str, Set[str]]):
         """
         Generate the sources.yaml file as described in https://docs.getdbt.com/docs/building-a-dbt-project/using-sources/
@@ -200,16 +197,32 @@ class CatalogProcessor:
             )
         source_config = {"version": 2, "sources": schemas}
         source_path = os.path.join(self.output_directory, "sources.yml")
-        output_dir = os.path.dirname(source_path)
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        with open(source_path, "w") as fh:
-            fh.write(yaml.dump(source_config, sort_keys=False))
+        write_if_changed(source_path, yaml.dump(source_config, sort_keys=False))
 
 
 # Static Functions
 
 
+def process_stream_tree(stream_processor: StreamProcessor) -> List[List[Tuple[Dict[str, str], Dict[str, str]]]]:
+    """
+    Handle a top-level stream and its nested stream/substream/children in a breadth-first traversal manner.
+    Returns the models_to_source and sql_outputs of every stream processor, grouped by level of nesting.
+    """
+    levels = []
+    substreams = [stream_processor]
+    while substreams:
+        children = substreams
+        substreams = []
+        level = []
+        for substream in children:
+            nested_processors = substream.process()
+            if nested_processors:
+                substreams += nested_processors
+            level.append((substream.models_to_source, substream.sql_outputs))
+        levels.append(level)
+    return levels
+
+
 def read_json(input_path: str) -> Any:
     """
     Reads and load a json file
@@ -281,11 +294,26 @@ def output_sql_file(file: str, sql: str):
     @param file is the path to filename to be written
     @param sql is the dbt sql content to be written in the generated model file
     """
-    output_dir = os.path.dirname(file)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    content = "".join(line + "\n" for line in sql.splitlines() if line.strip()) + "\n"
+    write_if_changed(file, content)
+
+
+def write_if_changed(file: str, content: str) -> bool:
+    """
+    Writes the content to the file, unless the file already has the same content.
+    Unchanged files keep their modification time, so dbt's partial parsing doesn't parse them again.
+    @param file is the path to filename to be written
+    @param content is the content of the file
+    @return True if the file was written
+    """
+    if os.path.exists(file):
+        with open(file, "r") as f:
+            if f.read() == content:
+                return False
+    else:
+        output_dir = os.path.dirname(file)
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
     with open(file, "w") as f:
-        for line in sql.splitlines():
-            if line.strip():
-                f.write(line + "\n")
-        f.write("\n")
+        f.write(content)
+    return True
@@ -4,6 +4,7 @@
 
 
 import unicodedata as ud
+from functools import lru_cache
 from re import match, sub
 
 from normalization.destination_type import DestinationType
@@ -287,6 +288,8 @@ class DestinationNameTransformer:
 # Static Functions
 
 
+# the same stream, field and schema names are normalized over and over (for each suffix, nesting level, collision check...)
+@lru_cache(maxsize=2**16)
 def transform_standard_naming(input_name: str) -> str:
     result = input_name.strip()
     result = strip_accents(result)
@@ -301,4 +304,7 @@ def transform_json_naming(input_name: str) -> str:
 
 
 def strip_accents(input_name: str) -> str:
+    if input_name.isascii():
+        # nothing to decompose, most names are plain ascii
+        return input_name
     return "".join(c for c in ud.normalize("NFD", input_name) if ud.category(c) != "Mn")
@@ -3,7 +3,8 @@
 #
 
 import hashlib
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from normalization import DestinationType
 from normalization.transform_catalog.destination_name_transformer import DestinationNameTransformer
@@ -56,6 +57,8 @@ class NormalizedTablesRegistry(Dict[str, List[NormalizedNameMetadata]]):
     def __init__(self, name_transformer: DestinationNameTransformer):
         super(NormalizedTablesRegistry, self).__init__()
         self.name_transformer = name_transformer
+        # the keys are looked up for every table being registered, schema names in particular are shared by many tables
+        self.table_keys: Dict[Tuple[str, str], str] = {}
 
     def add(
         self, intermediate_schema: str, schema: str, json_path: List[str], stream_name: str, table_name: str
@@ -67,10 +70,12 @@ class NormalizedTablesRegistry(Dict[str, List[NormalizedNameMetadata]]):
         return self
 
     def get_table_key(self, schema: str, table_name: str) -> str:
-        return (
-            f"{self.name_transformer.normalize_schema_name(schema, False, False)}."
-            f"{self.name_transformer.normalize_table_name(table_name, False, False)}"
-        )
+        if (schema, table_name) not in self.table_keys:
+            self.table_keys[(schema, table_name)] = (
+                f"{self.name_transformer.normalize_schema_name(schema, False, False)}."
+                f"{self.name_transformer.normalize_table_name(table_name, False, False)}"
+            )
+        return self.table_keys[(schema, table_name)]
 
     def get_value(self, schema: str, table_name: str) -> List[NormalizedNameMetadata]:
         return self[self.get_table_key(schema, table_name)]
@@ -78,6 +83,12 @@ class NormalizedTablesRegistry(Dict[str, List[NormalizedNameMetadata]]):
     def has_collisions(self, key: str) -> bool:
         return len(self[key]) > 1
 
+    def get_collisions(self) -> Dict[str, List[NormalizedNameMetadata]]:
+        """
+        Index of the tables in collisions, in a single pass over the normalized (and truncated) table names
+        """
+        return {key: values for key, values in self.items() if len(values) > 1}
+
 
 class NormalizedFilesRegistry(Dict[str, List[NormalizedNameMetadata]]):
     """
@@ -101,6 +112,12 @@ class NormalizedFilesRegistry(Dict[str, List[NormalizedNameMetadata]]):
     def has_collisions(self, table_name: str) -> bool:
         return len(self[table_name]) > 1
 
+    def get_collisions(self) -> Dict[str, List[NormalizedNameMetadata]]:
+        """
+        Index of the files in collisions, in a single pass over the file names
+        """
+        return {table_name: values for table_name, values in self.items() if len(values) > 1}
+
 
 class TableNameRegistry:
     """
@@ -133,6 +150,8 @@ class TableNameRegistry:
         self.simple_table_registry: NormalizedTablesRegistry = NormalizedTablesRegistry(self.name_transformer)
         # Registry is the collision free (resolved) mapping of schema json_path of the stream to the names that should be used
         self.registry: Dict[str, ResolvedNameMetadata] = {}
+        # normalized schema names, a catalog usually has only a few schemas for all its (nested) streams
+        self.normalized_schemas: Dict[str, str] = {}
 
     def register_table(self, intermediate_schema: str, schema: str, stream_name: str, json_path: List[str]):
         """
@@ -142,11 +161,16 @@ class TableNameRegistry:
         After going through all streams and sub-streams, we'll be able to find if any collisions are present within
         this catalog.
         """
-        intermediate_schema = self.name_transformer.normalize_schema_name(intermediate_schema, False, False)
-        schema = self.name_transformer.normalize_schema_name(schema, False, False)
+        intermediate_schema = self.get_normalized_schema_name(intermediate_schema)
+        schema = self.get_normalized_schema_name(schema)
         table_name = self.get_simple_table_name(json_path)
         self.simple_table_registry.add(intermediate_schema, schema, json_path, stream_name, table_name)
 
+    def get_normalized_schema_name(self, schema: str) -> str:
+        if schema not in self.normalized_schemas:
+            self.normalized_schemas[schema] = self.name_transformer.normalize_schema_name(schema, False, False)
+        return self.normalized_schemas[schema]
+
     def get_simple_table_name(self, json_path: List[str]) -> str:
         """
         Generates a simple table name, possibly in collisions within this catalog because of truncation
@@ -166,11 +190,12 @@ class TableNameRegistry:
         # deal with table name collisions within the same schema first.
         # file name should be equal to table name here
         table_count = 0
+        collisions = self.simple_table_registry.get_collisions()
 
-        for key in self.simple_table_registry:
-            for value in self.simple_table_registry[key]:
+        for key, values in self.simple_table_registry.items():
+            for value in values:
                 table_count += 1
-                if self.simple_table_registry.has_collisions(key):
+                if key in collisions:
                     # handle collisions with unique hashed names
                     table_name = self.get_hashed_table_name(value.schema, value.json_path, value.stream_name, value.table_name)
                     resolved_keys.append(ConflictedNameMetadata(value.schema, value.json_path, value.table_name, table_name))
@@ -199,10 +224,11 @@ class TableNameRegistry:
     def resolve_file_names(self):
         # deal with file name collisions across schemas and update the file name to use in the registry when necessary
         file_count = 0
-        for key in self.simple_file_registry:
-            for value in self.simple_file_registry[key]:
+        collisions = self.simple_file_registry.get_collisions()
+        for key, values in self.simple_file_registry.items():
+            for value in values:
                 file_count += 1
-                if self.simple_file_registry.has_collisions(key):
+                if key in collisions:
                     # handle collisions with unique hashed names including schema
                     self.registry[
                         self.get_registry_key(value.intermediate_schema, value.json_path, value.stream_name)
@@ -334,6 +360,7 @@ def hash_json_path(json_path: List[str]) -> str:
     return hash_name("&airbyte&".join(json_path))
 
 
+@lru_cache(maxsize=2**16)
 def hash_name(input: str) -> str:
     h = hashlib.sha1()
     h.update(input.encode("utf-8").lower())
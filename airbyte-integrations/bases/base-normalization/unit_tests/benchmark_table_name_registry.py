@@ -0,0 +1,54 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Benchmark of the table names registration and resolution of TableNameRegistry over a synthetic catalog of 10k tables:
+wide streams with nested objects, whose long names collide once they're truncated to the destination identifiers limit.
+
+    python -m unit_tests.benchmark_table_name_registry
+"""
+
+import contextlib
+import os
+import time
+
+from normalization.destination_type import DestinationType
+from normalization.transform_catalog.table_name_registry import TableNameRegistry
+
+STREAMS_COUNT = 1000
+NESTED_COUNT = 9
+SCHEMAS = ["schema_test", "schema_other"]
+
+
+def synthetic_catalog():
+    """Yields the (schema, stream_name, json_path) of each table, the middle of the long names is lost when they're truncated"""
+    for i in range(STREAMS_COUNT):
+        schema = SCHEMAS[i % len(SCHEMAS)]
+        stream_name = f"stream_of_a_source_with_long_names_{i % 100}_and_a_common_suffix_{i // 100}"
+        yield schema, stream_name, [stream_name]
+        for j in range(NESTED_COUNT):
+            child = f"nested_object_{j}_with_a_long_field_name"
+            yield schema, child, [stream_name, child]
+
+
+def main():
+    for destination_type in (DestinationType.POSTGRES, DestinationType.BIGQUERY):
+        tables = list(synthetic_catalog())
+        # the truncated names are printed, they're not part of the benchmark output
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            registry = TableNameRegistry(destination_type)
+            for schema, stream_name, json_path in tables:
+                registry.register_table(f"_airbyte_{schema}", schema, stream_name, json_path)
+            registered = time.perf_counter()
+            conflicts = registry.resolve_names()
+            resolved = time.perf_counter()
+        print(
+            f"{destination_type.value:>10}: {len(tables)} tables registered in {registered - started:.2f}s, "
+            f"resolved in {resolved - registered:.2f}s ({len(conflicts)} conflicts)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+
+import os
+
+import pytest
+from normalization.destination_type import DestinationType
+from normalization.transform_catalog.catalog_processor import CatalogProcessor, write_if_changed
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources")
+
+
+def read_models(output_directory: str):
+    models = {}
+    for root, _, files in os.walk(output_directory):
+        for file in files:
+            path = os.path.join(root, file)
+            with open(path, "r") as f:
+                models[os.path.relpath(path, output_directory)] = f.read()
+    return models
+
+
+@pytest.mark.parametrize("catalog_file", ["un-nesting_collisions_catalog", "nested_catalog"])
+def test_parallel_process(tmp_path, catalog_file: str):
+    catalog = os.path.join(RESOURCES_DIR, f"{catalog_file}.json")
+    sequential = CatalogProcessor(str(tmp_path / "sequential"), DestinationType.POSTGRES, max_workers=1)
+    sequential.process(catalog, "_airbyte_data", "schema_test")
+    parallel = CatalogProcessor(str(tmp_path / "parallel"), DestinationType.POSTGRES, max_workers=4)
+    parallel.process(catalog, "_airbyte_data", "schema_test")
+
+    assert list(parallel.models_to_source.items()) == list(sequential.models_to_source.items())
+    assert read_models(str(tmp_path / "parallel")) == read_models(str(tmp_path / "sequential"))
+
+
+def test_unchanged_models_are_not_rewritten(tmp_path):
+    catalog = os.path.join(RESOURCES_DIR, "nested_catalog.json")
+    CatalogProcessor(str(tmp_path), DestinationType.POSTGRES, max_workers=1).process(catalog, "_airbyte_data", "schema_test")
+    models = read_models(str(tmp_path))
+    for model in models:
+        os.utime(tmp_path / model, (0, 0))
+
+    CatalogProcessor(str(tmp_path), DestinationType.POSTGRES, max_workers=1).process(catalog, "_airbyte_data", "schema_test")
+
+    assert read_models(str(tmp_path)) == models
+    assert all(os.path.getmtime(tmp_path / model) == 0 for model in models)
+
+
+def test_write_if_changed(tmp_path):
+    file = str(tmp_path / "models" / "model.sql")
+
+    assert write_if_changed(file, "select 1\n")
+    assert not write_if_changed(file, "select 1\n")
+    assert write_if_changed(file, "select 2\n")
+    with open(file, "r") as f:
+        assert f.read() == "select 2\n"
@@ -184,3 +184,21 @@ def test_get_nested_hashed_table_name(json_path: List[str], expected_postgres: s
     bigquery_name_transformer = DestinationNameTransformer(DestinationType.BIGQUERY)
     actual_bigquery_name = get_nested_hashed_table_name(bigquery_name_transformer, "schema", json_path, child)
     assert actual_bigquery_name == expected_bigquery
+
+
+def test_get_collisions():
+    """
+    Checks the tables colliding once their names are truncated are indexed together, and only them
+    """
+    tables_registry = TableNameRegistry(DestinationType.POSTGRES)
+    long_names = [f"stream_with_a_long_name_{i}_which_gets_truncated_in_the_middle" for i in range(2)]
+    for stream_name in ["short_stream_name", *long_names]:
+        tables_registry.register_table("_airbyte_schema_test", "schema_test", stream_name, [stream_name])
+
+    collisions = tables_registry.simple_table_registry.get_collisions()
+
+    assert list(collisions) == ["schema_test.stream_with_a_long_n__uncated_in_the_middle"]
+    assert [value.stream_name for value in collisions["schema_test.stream_with_a_long_n__uncated_in_the_middle"]] == long_names
+    conflicts = tables_registry.resolve_names()
+    assert [conflict.json_path for conflict in conflicts] == [[stream_name] for stream_name in long_names]
+    assert len({conflict.table_name_resolved for conflict in conflicts}) == 2
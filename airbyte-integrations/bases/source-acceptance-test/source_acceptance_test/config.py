@@ -196,6 +196,10 @@ class Config(BaseConfig):
         default=TestStrictnessLevel.low,
         description="Corresponds to a strictness level of the test suite and will change which tests are mandatory for a successful run.",
     )
+    cache_connector_runs: bool = Field(
+        default=True, description="Replay the output of the connector runs with the same inputs instead of running the connector again."
+    )
+    max_concurrent_runs: int = Field(default=4, description="Maximum number of connector containers the tests run at a time.", ge=1)
 
     @staticmethod
     def is_legacy(config: dict) -> bool:
@@ -20,6 +20,7 @@ from source_acceptance_test.config import Config, EmptyStreamConfiguration, Expe
 from source_acceptance_test.tests import TestBasicRead
 from source_acceptance_test.utils import (
     ConnectorRunner,
+    RunCache,
     SecretDict,
     build_configured_catalog_from_custom_catalog,
     build_configured_catalog_from_discovered_catalog_and_empty_streams,
@@ -121,9 +122,15 @@ def connector_spec_fixture(connector_spec_path) -> ConnectorSpecification:
     return ConnectorSpecification.parse_obj(spec_obj)
 
 
+@pytest.fixture(name="run_cache", scope="session")
+def run_cache_fixture(acceptance_test_config) -> Optional[RunCache]:
+    """Cache of the connector run outputs, shared by all the tests of the session"""
+    return RunCache() if acceptance_test_config.cache_connector_runs else None
+
+
 @pytest.fixture(name="docker_runner")
-def docker_runner_fixture(image_tag, tmp_path) -> ConnectorRunner:
-    return ConnectorRunner(image_tag, volume=tmp_path)
+def docker_runner_fixture(image_tag, tmp_path, run_cache, acceptance_test_config) -> ConnectorRunner:
+    return ConnectorRunner(image_tag, volume=tmp_path, run_cache=run_cache, max_concurrent_runs=acceptance_test_config.max_concurrent_runs)
 
 
 @pytest.fixture(name="previous_connector_image_name")
@@ -133,13 +140,13 @@ def previous_connector_image_name_fixture(image_tag, inputs) -> str:
 
 
 @pytest.fixture(name="previous_connector_docker_runner")
-def previous_connector_docker_runner_fixture(previous_connector_image_name, tmp_path) -> ConnectorRunner:
+def previous_connector_docker_runner_fixture(previous_connector_image_name, tmp_path, run_cache) -> ConnectorRunner:
     """Fixture to create a connector runner with the previous connector docker image.
     Returns None if the latest image was not found, to skip downstream tests if the current connector is not yet published to the docker registry.
     Raise not found error if the previous connector image is not latest and expected to be published.
     """
     try:
-        return ConnectorRunner(previous_connector_image_name, volume=tmp_path / "previous_connector")
+        return ConnectorRunner(previous_connector_image_name, volume=tmp_path / "previous_connector", run_cache=run_cache)
     except (errors.NotFound, errors.ImageNotFound) as e:
         if previous_connector_image_name.endswith("latest"):
             logging.warning(
@@ -4,11 +4,10 @@
 
 import json
 import logging
-import re
 from collections import Counter, defaultdict
 from functools import reduce
 from logging import Logger
-from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Set, Tuple
+from typing import Any, List, Mapping, MutableMapping, Optional, Set, Tuple
 from xmlrpc.client import Boolean
 
 import dpath.util
@@ -26,7 +25,6 @@ from airbyte_cdk.models import (
     Type,
 )
 from docker.errors import ContainerError
-from jsonschema._utils import flatten
 from source_acceptance_test.base import BaseTest
 from source_acceptance_test.config import (
     BasicReadTestConfig,
@@ -37,7 +35,8 @@ from source_acceptance_test.config import (
     ExpectedRecordsConfig,
     SpecTestConfig,
 )
-from source_acceptance_test.utils import ConnectorRunner, SecretDict, filter_output, make_hashable, verify_records_schema
+from source_acceptance_test.utils import ConnectorRunner, SecretDict, filter_output, records_difference
+from source_acceptance_test.utils.asserts import StreamSchemaValidator
 from source_acceptance_test.utils.backward_compatibility import CatalogDiffChecker, SpecDiffChecker, validate_previous_configs
 from source_acceptance_test.utils.common import (
     build_configured_catalog_from_custom_catalog,
@@ -45,7 +44,13 @@ from source_acceptance_test.utils.common import (
     find_all_values_for_key_in_schema,
     find_keyword_schema,
 )
-from source_acceptance_test.utils.json_schema_helper import JsonSchemaHelper, get_expected_schema_structure, get_object_structure
+from source_acceptance_test.utils.json_schema_helper import (
+    JsonSchemaHelper,
+    SchemaPathsCoverage,
+    find_object_paths,
+    get_expected_schema_structure,
+    get_object_structure,
+)
 
 
 @pytest.fixture(name="connector_spec_dict")
@@ -472,42 +477,55 @@ def primary_keys_for_records(streams, records):
 @pytest.mark.default_timeout(5 * 60)
 class TestBasicRead(BaseTest):
     @staticmethod
-    def _validate_records_structure(records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
+    def _check_records(
+        records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog, validate_schema: bool, validate_data_points: bool
+    ) -> Tuple[Mapping[str, StreamSchemaValidator], Mapping[str, SchemaPathsCoverage]]:
         """
-        Check object structure similar to one expected by schema. Sometimes
-        just running schema validation is not enough case schema could have
+        Check the records in a single pass: validate them against the json_schema of their stream,
+        check their structure and collect the schema paths they have.
+
+        Sometimes just running schema validation is not enough case schema could have
         additionalProperties parameter set to true and no required fields
         therefore any arbitrary object would pass schema validation.
-        This method is here to catch those cases by extracting all the paths
-        from the object and compare it to paths expected from jsonschema. If
-        there no common pathes then raise an alert.
+        The structure check catches those cases: a record should have some of the paths
+        expected from jsonschema. The paths of the records are found along the trie of the expected paths,
+        the same trie the appeared paths are collected into.
 
         :param records: List of airbyte record messages gathered from connector instances.
         :param configured_catalog: SAT testcase parameters parsed from yaml file
+        :returns schema validators and expected schema paths coverage by stream name
         """
-        schemas: Dict[str, Set] = {}
+        validators, coverages = {}, {}
         for stream in configured_catalog.streams:
-            schemas[stream.stream.name] = set(get_expected_schema_structure(stream.stream.json_schema))
+            coverages[stream.stream.name] = SchemaPathsCoverage(stream.stream.json_schema)
+            if validate_schema:
+                validators[stream.stream.name] = StreamSchemaValidator(stream.stream.json_schema)
 
         for record in records:
-            schema_pathes = schemas.get(record.stream)
-            if not schema_pathes:
+            coverage = coverages.get(record.stream)
+            if not coverage:
+                if validate_schema:
+                    logging.error(f"Record from the {record.stream} stream that is not in the catalog.")
                 continue
-            record_fields = set(get_object_structure(record.data))
-            common_fields = set.intersection(record_fields, schema_pathes)
 
-            assert (
-                common_fields
-            ), f" Record {record} from {record.stream} stream with fields {record_fields} should have some fields mentioned by json schema: {schema_pathes}"
+            record_paths = []
+            if validate_data_points and not coverage.completed:
+                record_paths = list(find_object_paths(record.data, coverage.trie))
+                coverage.update(record_paths)
+
+            if validate_schema:
+                validators[record.stream].validate(record.data)
+                if coverage.trie and not record_paths:
+                    assert (
+                        next(find_object_paths(record.data, coverage.trie), None) is not None
+                    ), f" Record {record} from {record.stream} stream with fields {set(get_object_structure(record.data))} should have some fields mentioned by json schema: {coverage.schema_paths}"
+
+        return validators, coverages
 
     @staticmethod
-    def _validate_schema(records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
-        """
-        Check if data type and structure in records matches the one in json_schema of the stream in catalog
-        """
-        TestBasicRead._validate_records_structure(records, configured_catalog)
+    def _report_schema_errors(validators: Mapping[str, StreamSchemaValidator]):
         bar = "-" * 80
-        streams_errors = verify_records_schema(records, configured_catalog)
+        streams_errors = {stream_name: validator.errors for stream_name, validator in validators.items() if validator.errors}
         for stream_name, errors in streams_errors.items():
             errors = map(str, errors.values())
             str_errors = f"\n{bar}\n".join(errors)
@@ -516,6 +534,25 @@ class TestBasicRead(BaseTest):
         if streams_errors:
             pytest.fail(f"Please check your json_schema in selected streams {tuple(streams_errors.keys())}.")
 
+    @staticmethod
+    def _report_empty_fields(coverages: Mapping[str, SchemaPathsCoverage]):
+        stream_name_to_empty_fields_mapping = {
+            stream_name: sorted(coverage.missing_paths) for stream_name, coverage in coverages.items() if coverage.missing_paths
+        }
+
+        msg = "Following streams has records with fields, that are either null or not present in each output record:\n"
+        for stream_name, fields in stream_name_to_empty_fields_mapping.items():
+            msg += f"`{stream_name}` stream has `{fields}` empty fields\n"
+        assert not stream_name_to_empty_fields_mapping, msg
+
+    @staticmethod
+    def _validate_schema(records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
+        """
+        Check if data type and structure in records matches the one in json_schema of the stream in catalog
+        """
+        validators, _ = TestBasicRead._check_records(records, configured_catalog, validate_schema=True, validate_data_points=False)
+        TestBasicRead._report_schema_errors(validators)
+
     def _validate_empty_streams(self, records, configured_catalog, allowed_empty_streams):
         """
         Only certain streams allowed to be empty
@@ -530,44 +567,12 @@ class TestBasicRead(BaseTest):
         streams_without_records = streams_without_records - allowed_empty_stream_names
         assert not streams_without_records, f"All streams should return some records, streams without records: {streams_without_records}"
 
-    def _validate_field_appears_at_least_once_in_stream(self, records: List, schema: Dict):
-        """
-        Get all possible schema paths, then diff with existing record paths.
-        In case of `oneOf` or `anyOf` schema props, compare only choice which is present in records.
-        """
-        expected_paths = get_expected_schema_structure(schema, annotate_one_of=True)
-        expected_paths = set(flatten(tuple(expected_paths)))
-
-        for record in records:
-            record_paths = set(get_object_structure(record))
-            paths_to_remove = {path for path in expected_paths if re.sub(r"\([0-9]*\)", "", path) in record_paths}
-            for path in paths_to_remove:
-                path_parts = re.split(r"\([0-9]*\)", path)
-                if len(path_parts) > 1:
-                    expected_paths -= {path for path in expected_paths if path_parts[0] in path}
-            expected_paths -= paths_to_remove
-
-        return sorted(list(expected_paths))
-
     def _validate_field_appears_at_least_once(self, records: List, configured_catalog: ConfiguredAirbyteCatalog):
         """
         Validate if each field in a stream has appeared at least once in some record.
         """
-
-        stream_name_to_empty_fields_mapping = {}
-        for stream in configured_catalog.streams:
-            stream_records = [record.data for record in records if record.stream == stream.stream.name]
-
-            empty_field_paths = self._validate_field_appears_at_least_once_in_stream(
-                records=stream_records, schema=stream.stream.json_schema
-            )
-            if empty_field_paths:
-                stream_name_to_empty_fields_mapping[stream.stream.name] = empty_field_paths
-
-        msg = "Following streams has records with fields, that are either null or not present in each output record:\n"
-        for stream_name, fields in stream_name_to_empty_fields_mapping.items():
-            msg += f"`{stream_name}` stream has `{fields}` empty fields\n"
-        assert not stream_name_to_empty_fields_mapping, msg
+        _, coverages = self._check_records(records, configured_catalog, validate_schema=False, validate_data_points=True)
+        self._report_empty_fields(coverages)
 
     def _validate_expected_records(
         self,
@@ -658,8 +663,14 @@ class TestBasicRead(BaseTest):
 
         assert records, "At least one record should be read using provided catalog"
 
+        validators, coverages = self._check_records(
+            records=records,
+            configured_catalog=configured_catalog,
+            validate_schema=should_validate_schema,
+            validate_data_points=should_validate_data_points,
+        )
         if should_validate_schema:
-            self._validate_schema(records=records, configured_catalog=configured_catalog)
+            self._report_schema_errors(validators)
 
         self._validate_empty_streams(records=records, configured_catalog=configured_catalog, allowed_empty_streams=empty_streams)
         for pks, record in primary_keys_for_records(streams=configured_catalog.streams, records=records):
@@ -670,7 +681,7 @@ class TestBasicRead(BaseTest):
 
         # TODO: remove this condition after https://github.com/airbytehq/airbyte/issues/8312 is done
         if should_validate_data_points:
-            self._validate_field_appears_at_least_once(records=records, configured_catalog=configured_catalog)
+            self._report_empty_fields(coverages)
 
         if expected_records_by_stream:
             self._validate_expected_records(
@@ -741,9 +752,7 @@ class TestBasicRead(BaseTest):
                     r2 = TestBasicRead.remove_extra_fields(r2, r1)
                 assert r1 == r2, f"Stream {stream_name}: Mismatch of record order or values"
         else:
-            expected = set(map(make_hashable, expected))
-            actual = set(map(make_hashable, actual))
-            missing_expected = set(expected) - set(actual)
+            missing_expected = records_difference(expected, actual)
 
             if missing_expected:
                 msg = f"Stream {stream_name}: All expected records must be produced"
@@ -752,7 +761,7 @@ class TestBasicRead(BaseTest):
                 pytest.fail(msg)
 
             if not extra_records:
-                extra_actual = set(actual) - set(expected)
+                extra_actual = records_difference(actual, expected)
                 if extra_actual:
                     msg = f"Stream {stream_name}: There are more records than expected, but extra_records is off"
                     detailed_logger.info(msg)
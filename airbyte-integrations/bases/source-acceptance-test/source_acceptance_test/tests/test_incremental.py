@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import copy
 import json
 from datetime import datetime
 from pathlib import Path
@@ -232,14 +233,25 @@ class TestIncremental(BaseTest):
         min_batches_to_test = 10
         sample_rate = len(checkpoint_messages) // min_batches_to_test
         stream_name_to_per_stream_state = dict()
+        tested_states = []
         for idx, state_message in enumerate(checkpoint_messages):
             assert state_message.type == Type.STATE
             state_input, complete_state = self.get_next_state_input(state_message, stream_name_to_per_stream_state, is_per_stream)
 
             if len(checkpoint_messages) >= min_batches_to_test and idx % sample_rate != 0:
                 continue
-
-            output = docker_runner.call_read_with_state(connector_config, configured_catalog_for_incremental, state=state_input)
+            # the combined stream state keeps changing with the next batches
+            tested_states.append((copy.deepcopy(state_input), copy.deepcopy(complete_state)))
+
+        # the reads of the batches are independent, so they're run concurrently
+        outputs = docker_runner.run_concurrently(
+            docker_runner.call_read_with_state,
+            [
+                dict(config=connector_config, catalog=configured_catalog_for_incremental, state=state_input)
+                for state_input, _ in tested_states
+            ],
+        )
+        for output, (_, complete_state) in zip(outputs, tested_states):
             records = filter_output(output, type_=Type.RECORD)
 
             for record_value, state_value, stream_name in records_with_state(records, complete_state, stream_mapping, cursor_paths):
@@ -12,8 +12,8 @@ from .common import (
     load_config,
     load_yaml_or_json_path,
 )
-from .compare import diff_dicts, make_hashable
-from .connector_runner import ConnectorRunner
+from .compare import diff_dicts, make_hashable, records_difference
+from .connector_runner import ConnectorRunner, RunCache
 from .json_schema_helper import JsonSchemaHelper
 
 __all__ = [
@@ -25,8 +25,10 @@ __all__ = [
     "incremental_only_catalog",
     "SecretDict",
     "ConnectorRunner",
+    "RunCache",
     "diff_dicts",
     "make_hashable",
+    "records_difference",
     "verify_records_schema",
     "build_configured_catalog_from_custom_catalog",
     "build_configured_catalog_from_discovered_catalog_and_empty_streams",
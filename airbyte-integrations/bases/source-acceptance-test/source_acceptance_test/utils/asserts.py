@@ -4,8 +4,7 @@
 
 import logging
 import re
-from collections import defaultdict
-from typing import List, Mapping
+from typing import Any, Iterator, List, Mapping, MutableMapping, Tuple
 
 import pendulum
 from airbyte_cdk.models import AirbyteRecordMessage, ConfiguredAirbyteCatalog
@@ -39,6 +38,55 @@ class CustomFormatChecker(FormatChecker):
             return super().check(instance, format)
 
 
+def get_error_schema_paths(schema: Any, path: Tuple = ()) -> Iterator[Tuple]:
+    """
+    Schema paths the validation errors of the schema are reported with, the paths of the keywords which report
+    the errors of their subschemas with the paths of their own (e.g. `$ref` or `if`) never match the errors exactly.
+    """
+    if schema is False:
+        yield path
+    if not isinstance(schema, Mapping):
+        return
+    for keyword, value in schema.items():
+        if keyword in ("properties", "patternProperties"):
+            for name, subschema in value.items():
+                yield from get_error_schema_paths(subschema, path + (keyword, name))
+        elif keyword in ("items", "allOf") and isinstance(value, List):
+            for index, subschema in enumerate(value):
+                yield from get_error_schema_paths(subschema, path + (keyword, index))
+        elif keyword in ("items", "additionalProperties", "additionalItems"):
+            yield from get_error_schema_paths(value, path + (keyword,))
+        elif keyword in Draft7Validator.VALIDATORS:
+            yield path + (keyword,)
+
+
+class StreamSchemaValidator:
+    """
+    Validates the records of a stream against its schema, the first error of each schema path is kept.
+    The validation of the stream stops once every schema path the errors can have has an error captured,
+    the rest of the records can't bring any new errors.
+    """
+
+    def __init__(self, schema: Mapping[str, Any]):
+        self._validator = Draft7Validator(schema, format_checker=CustomFormatChecker())
+        self._error_schema_paths = set(get_error_schema_paths(schema))
+        self._captured_schema_paths = set()
+        self.errors: MutableMapping[str, ValidationError] = {}
+
+    @property
+    def completed(self) -> bool:
+        return self._error_schema_paths <= self._captured_schema_paths
+
+    def validate(self, data: Mapping[str, Any]):
+        if self.completed:
+            return
+        for error in self._validator.iter_errors(data):
+            schema_path = tuple(error.schema_path)
+            if schema_path not in self._captured_schema_paths:
+                self._captured_schema_paths.add(schema_path)
+                self.errors[str(error.schema_path)] = error
+
+
 def verify_records_schema(
     records: List[AirbyteRecordMessage], catalog: ConfiguredAirbyteCatalog
 ) -> Mapping[str, Mapping[str, ValidationError]]:
@@ -47,18 +95,13 @@ def verify_records_schema(
     """
     validators = {}
     for stream in catalog.streams:
-        validators[stream.stream.name] = Draft7Validator(stream.stream.json_schema, format_checker=CustomFormatChecker())
-
-    stream_errors = defaultdict(dict)
+        validators[stream.stream.name] = StreamSchemaValidator(stream.stream.json_schema)
 
     for record in records:
         validator = validators.get(record.stream)
         if not validator:
             logging.error(f"Record from the {record.stream} stream that is not in the catalog.")
             continue
+        validator.validate(record.data)
 
-        errors = list(validator.iter_errors(record.data))
-        for error in errors:
-            stream_errors[record.stream][str(error.schema_path)] = error
-
-    return stream_errors
+    return {stream_name: validator.errors for stream_name, validator in validators.items() if validator.errors}
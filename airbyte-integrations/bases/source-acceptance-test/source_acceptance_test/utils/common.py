@@ -25,6 +25,7 @@ from airbyte_cdk.models import (
     SyncMode,
 )
 from source_acceptance_test.config import Config, EmptyStreamConfiguration
+from source_acceptance_test.utils.connector_runner import ConnectorOutput
 
 
 def load_config(path: str) -> Config:
@@ -64,6 +65,9 @@ def incremental_only_catalog(configured_catalog: ConfiguredAirbyteCatalog) -> Co
 
 def filter_output(records: Iterable[AirbyteMessage], type_) -> List[AirbyteMessage]:
     """Filter messages to match specific type"""
+    if isinstance(records, ConnectorOutput):
+        # only the messages of the type are parsed
+        return list(records.filter(type_))
     return list(filter(lambda x: x.type == type_, records))
 
 
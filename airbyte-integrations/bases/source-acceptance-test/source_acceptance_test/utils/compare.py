@@ -2,8 +2,12 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import copy
 import functools
-from typing import List, Mapping, Optional
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Iterable, List, Mapping, Optional
 
 import dpath.exceptions
 import dpath.util
@@ -51,24 +55,56 @@ def diff_dicts(left, right, use_markup) -> Optional[List[str]]:
     return ["equals failed"] + [color_off + line for line in icdiff_lines]
 
 
+def canonical_encoding(obj: Any) -> str:
+    """
+    JSON encoding of the value which is the same for the values considered equal:
+    keys of the objects are sorted, the items of the lists are sorted by their encodings (the order of the items doesn't matter),
+    numbers are encoded the way they compare in Python, e.g. 1, 1.0 and True are the same
+    """
+    if isinstance(obj, Mapping):
+        return "{" + ",".join(f"{json.dumps(str(k))}:{canonical_encoding(v)}" for k, v in sorted(obj.items())) + "}"
+    if isinstance(obj, List):
+        return "[" + ",".join(sorted(canonical_encoding(v) for v in obj)) + "]"
+    if isinstance(obj, float) and obj.is_integer():
+        obj = int(obj)
+    elif isinstance(obj, bool):
+        obj = int(obj)
+    return json.dumps(obj, default=str)
+
+
+def canonical_digest(obj: Any) -> bytes:
+    return hashlib.blake2b(canonical_encoding(obj).encode(), digest_size=16).digest()
+
+
 @functools.total_ordering
 class HashMixin:
+    """
+    Compares the nested dicts/lists by the digest of their canonical encoding,
+    the digest is computed once, when the value is hashed or compared for the first time
+    """
+
+    _digest: Optional[bytes] = None
+
+    @staticmethod
+    def get_digest(obj) -> bytes:
+        if isinstance(obj, HashMixin):
+            if obj._digest is None:
+                obj._digest = canonical_digest(obj)
+            return obj._digest
+        return canonical_digest(obj)
+
     @staticmethod
     def get_hash(obj):
-        if isinstance(obj, Mapping):
-            return hash(str({k: (HashMixin.get_hash(v)) for k, v in sorted(obj.items())}))
-        if isinstance(obj, List):
-            return hash(str(sorted([HashMixin.get_hash(v) for v in obj])))
-        return hash(obj)
+        return hash(HashMixin.get_digest(obj))
 
     def __hash__(self):
         return HashMixin.get_hash(self)
 
     def __lt__(self, other):
-        return hash(self) < hash(other)
+        return HashMixin.get_digest(self) < HashMixin.get_digest(other)
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        return HashMixin.get_digest(self) == HashMixin.get_digest(other)
 
 
 class DictWithHashMixin(HashMixin, dict):
@@ -83,11 +119,13 @@ def make_hashable(obj, exclude_fields: List[str] = None) -> str:
     """
     Simplify comparison of nested dicts/lists
     :param obj value for comparison
-    :param exclude_fields if value is Mapping, some fields can be excluded
+    :param exclude_fields if value is Mapping, some fields can be excluded (from a copy of the value, the value itself isn't changed)
     """
     if isinstance(obj, Mapping):
         # If value is Mapping, some fields can be excluded
         exclude_fields = exclude_fields or []
+        if exclude_fields:
+            obj = copy.deepcopy(obj)
         for field in exclude_fields:
             try:
                 dpath.util.delete(obj, field)
@@ -97,3 +135,12 @@ def make_hashable(obj, exclude_fields: List[str] = None) -> str:
     if isinstance(obj, List):
         return ListWithHashMixin(obj)
     return obj
+
+
+def records_difference(left: Iterable[Any], right: Iterable[Any]) -> List[Any]:
+    """
+    Records of the left which aren't matched by the records of the right, the records are matched as multisets
+    by their digests: a record repeated in the left has to be repeated as many times in the right
+    """
+    left, right = Counter(map(make_hashable, left)), Counter(map(make_hashable, right))
+    return list((left - right).elements())
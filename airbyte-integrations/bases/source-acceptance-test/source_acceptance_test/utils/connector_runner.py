@@ -3,20 +3,134 @@
 #
 
 
+import hashlib
 import json
 import logging
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Mapping, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
 
 import docker
-from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog
+from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog, Type
 from docker.errors import ContainerError, NotFound
 from docker.models.containers import Container
 from pydantic import ValidationError
 
+TRACEBACK_START = b"Traceback (most recent call last)"
+
+
+class ConnectorOutput(Sequence[AirbyteMessage]):
+    """
+    Messages of a connector run. The output is spilled to the raw output file of the run as it's read,
+    only the offsets and the types of the messages are kept in memory. The messages are parsed into
+    the models when they're accessed, so the messages of the types a test doesn't look at are never parsed.
+    The messages which fail the validation are skipped, the same way by the iteration and by the indexing:
+    the length and the indexes are only known once all the messages are parsed, so that's done on the first use of them.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._offsets = array("q")
+        self._types: List[Type] = []
+        self._validated = True
+
+    def append(self, offset: int, message_type: Type):
+        self._offsets.append(offset)
+        self._types.append(message_type)
+        self._validated = False
+
+    def _validate(self):
+        """Drops the offsets of the messages which fail the validation"""
+        if self._validated:
+            return
+        offsets, types = array("q"), []
+        with open(self._path, "rb") as f:
+            for offset, message_type in zip(self._offsets, self._types):
+                f.seek(offset)
+                if self._parse(f.readline()) is not None:
+                    offsets.append(offset)
+                    types.append(message_type)
+        self._offsets, self._types = offsets, types
+        self._validated = True
+
+    @staticmethod
+    def _parse(line: bytes) -> Optional[AirbyteMessage]:
+        try:
+            return AirbyteMessage.parse_raw(line)
+        except ValidationError as exc:
+            logging.warning("Unable to parse connector's output %s, error: %s", line.decode("utf-8", errors="replace"), exc)
+            return None
+
+    def __len__(self) -> int:
+        self._validate()
+        return len(self._offsets)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[AirbyteMessage, List[AirbyteMessage]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        self._validate()
+        offset = self._offsets[index]
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            return AirbyteMessage.parse_raw(f.readline())
+
+    def __iter__(self) -> Iterator[AirbyteMessage]:
+        return self.filter()
+
+    def filter(self, *types: Type) -> Iterator[AirbyteMessage]:
+        """Parses the messages of the given types only, all of them if no types are given"""
+        with open(self._path, "rb") as f:
+            for offset, message_type in zip(self._offsets, self._types):
+                if types and message_type not in types:
+                    continue
+                f.seek(offset)
+                message = self._parse(f.readline())
+                if message is not None:
+                    yield message
+
+
+class RunCache:
+    """
+    Outputs of the connector runs by their inputs: image, command, config, catalog and state.
+    The output of a successful run is replayed from its raw output file when the same run is requested again.
+    """
+
+    def __init__(self):
+        self._outputs: Dict[str, ConnectorOutput] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image_id: str, cmd: str, config=None, state=None, catalog: Optional[ConfiguredAirbyteCatalog] = None, **kwargs) -> str:
+        """Digest of the run inputs, the config isn't kept as is since it holds the secrets"""
+        inputs = {
+            "image": image_id,
+            "cmd": cmd,
+            "config": dict(config) if config is not None else None,
+            "state": state,
+            "catalog": json.loads(catalog.json()) if catalog else None,
+            "kwargs": kwargs,
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[ConnectorOutput]:
+        with self._lock:
+            return self._outputs.get(key)
+
+    def put(self, key: str, output: ConnectorOutput):
+        with self._lock:
+            self._outputs[key] = output
+
 
 class ConnectorRunner:
-    def __init__(self, image_name: str, volume: Path):
+    def __init__(self, image_name: str, volume: Path, run_cache: Optional[RunCache] = None, max_concurrent_runs: int = 1):
+        """
+        :param image_name: docker image of the connector
+        :param volume: folder the inputs and outputs of the runs are kept in
+        :param run_cache: cache of the run outputs, shared by the runners of the same image, the runs aren't cached if it's not set
+        :param max_concurrent_runs: how many containers run_concurrently runs at a time
+        """
         self._client = docker.from_env()
         try:
             self._image = self._client.images.get(image_name)
@@ -25,7 +139,10 @@ class ConnectorRunner:
             self._image = self._client.images.pull(image_name)
             print("Pulling completed")
         self._runs = 0
+        self._runs_lock = threading.Lock()
         self._volume_base = volume
+        self._run_cache = run_cache
+        self._max_concurrent_runs = max_concurrent_runs
 
     @property
     def output_folder(self) -> Path:
@@ -35,67 +152,104 @@ class ConnectorRunner:
     def input_folder(self) -> Path:
         return self._volume_base / f"run_{self._runs}" / "input"
 
-    def _prepare_volumes(self, config: Optional[Mapping], state: Optional[Mapping], catalog: Optional[ConfiguredAirbyteCatalog]):
-        self.input_folder.mkdir(parents=True)
-        self.output_folder.mkdir(parents=True)
+    def _prepare_volumes(
+        self,
+        config: Optional[Mapping],
+        state: Optional[Mapping],
+        catalog: Optional[ConfiguredAirbyteCatalog],
+        input_folder: Path = None,
+        output_folder: Path = None,
+    ):
+        input_folder = input_folder or self.input_folder
+        output_folder = output_folder or self.output_folder
+        input_folder.mkdir(parents=True)
+        output_folder.mkdir(parents=True)
 
         # using "is not None" to allow falsey config objects like {} to still write
         if config is not None:
-            with open(str(self.input_folder / "tap_config.json"), "w") as outfile:
+            with open(str(input_folder / "tap_config.json"), "w") as outfile:
                 json.dump(dict(config), outfile)
 
         if state:
-            with open(str(self.input_folder / "state.json"), "w") as outfile:
+            with open(str(input_folder / "state.json"), "w") as outfile:
                 if isinstance(state, List):
                     json.dump(state, outfile)
                 else:
                     json.dump(dict(state), outfile)
 
         if catalog:
-            with open(str(self.input_folder / "catalog.json"), "w") as outfile:
+            with open(str(input_folder / "catalog.json"), "w") as outfile:
                 outfile.write(catalog.json())
 
         volumes = {
-            str(self.input_folder): {
+            str(input_folder): {
                 "bind": "/data",
                 # "mode": "ro",
             },
-            str(self.output_folder): {
+            str(output_folder): {
                 "bind": "/local",
                 "mode": "rw",
             },
         }
         return volumes
 
-    def call_spec(self, **kwargs) -> List[AirbyteMessage]:
+    def call_spec(self, **kwargs) -> ConnectorOutput:
         cmd = "spec"
-        output = list(self.run(cmd=cmd, **kwargs))
-        return output
+        return self.run(cmd=cmd, **kwargs)
 
-    def call_check(self, config, **kwargs) -> List[AirbyteMessage]:
+    def call_check(self, config, **kwargs) -> ConnectorOutput:
         cmd = "check --config /data/tap_config.json"
-        output = list(self.run(cmd=cmd, config=config, **kwargs))
-        return output
+        return self.run(cmd=cmd, config=config, **kwargs)
 
-    def call_discover(self, config, **kwargs) -> List[AirbyteMessage]:
+    def call_discover(self, config, **kwargs) -> ConnectorOutput:
         cmd = "discover --config /data/tap_config.json"
-        output = list(self.run(cmd=cmd, config=config, **kwargs))
-        return output
+        return self.run(cmd=cmd, config=config, **kwargs)
 
-    def call_read(self, config, catalog, **kwargs) -> List[AirbyteMessage]:
+    def call_read(self, config, catalog, **kwargs) -> ConnectorOutput:
         cmd = "read --config /data/tap_config.json --catalog /data/catalog.json"
-        output = list(self.run(cmd=cmd, config=config, catalog=catalog, **kwargs))
-        return output
+        return self.run(cmd=cmd, config=config, catalog=catalog, **kwargs)
 
-    def call_read_with_state(self, config, catalog, state, **kwargs) -> List[AirbyteMessage]:
+    def call_read_with_state(self, config, catalog, state, **kwargs) -> ConnectorOutput:
         cmd = "read --config /data/tap_config.json --catalog /data/catalog.json --state /data/state.json"
-        output = list(self.run(cmd=cmd, config=config, catalog=catalog, state=state, **kwargs))
-        return output
+        return self.run(cmd=cmd, config=config, catalog=catalog, state=state, **kwargs)
+
+    def run_concurrently(
+        self, call: Callable[..., ConnectorOutput], calls_kwargs: Iterable[Mapping[str, Any]]
+    ) -> Iterator[ConnectorOutput]:
+        """
+        Runs the independent calls on up to `max_concurrent_runs` containers at a time, yields their outputs in the order of the calls
+        :param call: one of the call_* methods
+        :param calls_kwargs: keyword arguments of every call
+        """
+        executor = ThreadPoolExecutor(max_workers=self._max_concurrent_runs, thread_name_prefix="connector_runner")
+        try:
+            futures = [executor.submit(call, **kwargs) for kwargs in calls_kwargs]
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(
+        self, cmd, config=None, state=None, catalog=None, raise_container_error: bool = True, use_cache: bool = True, **kwargs
+    ) -> ConnectorOutput:
+        """
+        Runs the connector container and reads its output.
+        The outputs of the successful runs are cached, when `use_cache` is set the output of the same run is replayed from the cache.
+        The runs which aren't expected to succeed (`raise_container_error` is off) are neither cached nor replayed.
+        """
+        cache_key = None
+        if self._run_cache is not None and raise_container_error:
+            cache_key = RunCache.key(self._image.id, cmd, config=config, state=state, catalog=catalog, **kwargs)
+            output = self._run_cache.get(cache_key) if use_cache else None
+            if output is not None:
+                logging.debug(f"Docker run {self._image}: \n{cmd}\n" f"replayed from: {output._path}")
+                return output
 
-    def run(self, cmd, config=None, state=None, catalog=None, raise_container_error: bool = True, **kwargs) -> Iterable[AirbyteMessage]:
-        self._runs += 1
-        volumes = self._prepare_volumes(config, state, catalog)
-        logging.debug(f"Docker run {self._image}: \n{cmd}\n" f"input: {self.input_folder}\noutput: {self.output_folder}")
+        with self._runs_lock:
+            self._runs += 1
+            input_folder, output_folder = self.input_folder, self.output_folder
+        volumes = self._prepare_volumes(config, state, catalog, input_folder=input_folder, output_folder=output_folder)
+        logging.debug(f"Docker run {self._image}: \n{cmd}\n" f"input: {input_folder}\noutput: {output_folder}")
 
         container = self._client.containers.run(
             image=self._image,
@@ -105,43 +259,71 @@ class ConnectorRunner:
             detach=True,
             **kwargs,
         )
-        with open(self.output_folder / "raw", "wb+") as f:
-            for line in self.read(container, command=cmd, with_ext=raise_container_error):
-                f.write(line.encode())
-                try:
-                    yield AirbyteMessage.parse_raw(line)
-                except ValidationError as exc:
-                    logging.warning("Unable to parse connector's output %s, error: %s", line, exc)
+        output = ConnectorOutput(output_folder / "raw")
+        with open(output._path, "wb+") as f:
+            for line in self.read_lines(container, command=cmd, with_ext=raise_container_error):
+                offset = f.tell()
+                f.write(line)
+                message_type = self.message_type(line)
+                if message_type is None:
+                    logging.warning("Unable to parse connector's output %s", line.decode("utf-8", errors="replace"))
+                else:
+                    output.append(offset, message_type)
+        if cache_key is not None:
+            self._run_cache.put(cache_key, output)
+        return output
+
+    @staticmethod
+    def message_type(line: bytes) -> Optional[Type]:
+        """Type of the message the line holds, the message itself is parsed into the model once it's needed"""
+        try:
+            message = json.loads(line)
+            return Type(message["type"])
+        except (ValueError, TypeError, KeyError):
+            return None
 
     @classmethod
     def read(cls, container: Container, command: str = None, with_ext: bool = True) -> Iterable[str]:
         """Reads connector's logs per line"""
-        buffer = b""
-        exception = ""
-        line = ""
-        for chunk in container.logs(stdout=True, stderr=True, stream=True, follow=True):
+        for line in cls.read_lines(container, command=command, with_ext=with_ext):
+            yield line.decode("utf-8")
 
+    @classmethod
+    def read_lines(cls, container: Container, command: str = None, with_ext: bool = True) -> Iterable[bytes]:
+        """
+        Reads connector's logs per line, as raw bytes.
+        The chunks are appended to a single buffer and the lines are cut out of it without copying the rest of it,
+        the search of the line end continues where it stopped in the previous chunk, so long lines are read in linear time.
+        """
+        buffer = bytearray()
+        exception: List[bytes] = []
+        line = b""
+        for chunk in container.logs(stdout=True, stderr=True, stream=True, follow=True):
+            search_from = len(buffer)
             buffer += chunk
-            while True:
+            start = 0
+            with memoryview(buffer) as view:
                 # every chunk can include several lines
-                found = buffer.find(b"\n")
-                if found <= -1:
-                    break
-
-                line = buffer[: found + 1].decode("utf-8")
-                if len(exception) > 0 or line.startswith("Traceback (most recent call last)"):
-                    exception += line
-                else:
-                    yield line
-                buffer = buffer[found + 1 :]
+                found = buffer.find(b"\n", search_from)
+                while found > -1:
+                    line = view[start : found + 1].tobytes()
+                    if exception or line.startswith(TRACEBACK_START):
+                        exception.append(line)
+                    else:
+                        yield line
+                    start = found + 1
+                    found = buffer.find(b"\n", start)
+            del buffer[:start]
 
         if buffer:
             # send the latest chunk if exists
-            line = buffer.decode("utf-8")
+            line = bytes(buffer)
             if exception:
-                exception += line
+                exception.append(line)
             else:
                 yield line
+        exception = b"".join(exception).decode("utf-8")
+        line = line.decode("utf-8")
         try:
             exit_status = container.wait()
             container.remove()
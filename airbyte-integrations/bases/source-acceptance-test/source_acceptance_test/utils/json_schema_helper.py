@@ -2,9 +2,9 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-
+import re
 from functools import reduce
-from typing import Any, Dict, List, Mapping, Optional, Set, Text, Union
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Text, Union
 
 import pendulum
 from jsonref import JsonRef
@@ -222,3 +222,83 @@ def get_expected_schema_structure(schema: dict, annotate_one_of: bool = False) -
 
     _scan_schema(schema)
     return paths
+
+
+ONE_OF_ANNOTATION = re.compile(r"\([0-9]*\)")
+
+
+def build_path_trie(paths: Iterable[str]) -> Dict[Optional[str], Any]:
+    """
+    Compose a trie of the paths of get_expected_schema_structure, one node per path segment, `oneOf` annotations are dropped
+    from the segments. The paths themselves are kept in the nodes they end in, under the None key.
+    :param paths: expected schema paths
+    :returns nested dicts of path segments
+    """
+    trie = {}
+    for path in paths:
+        node = trie
+        for segment in ONE_OF_ANNOTATION.sub("", path).split("/")[1:]:
+            node = node.setdefault(segment, {})
+        node.setdefault(None, []).append(path)
+    return trie
+
+
+def find_object_paths(obj: Any, trie: Dict[Optional[str], Any]) -> Iterator[str]:
+    """
+    Traverse through object structure along the path trie and yield the trie paths the object has, the same way
+    get_object_structure composes them: an array is assumed to have the same structure as its first element.
+    Only the parts of the object the trie has paths for are visited.
+    :param obj: data object to find the paths in
+    :param trie: trie of the expected paths, see build_path_trie
+    """
+    if isinstance(obj, dict):
+        for key, node in trie.items():
+            if key is not None and key in obj:
+                yield from node.get(None, ())
+                yield from find_object_paths(obj[key], node)
+    elif isinstance(obj, list) and len(obj) > 0 and "[]" in trie:
+        node = trie["[]"]
+        yield from node.get(None, ())
+        yield from find_object_paths(obj[0], node)
+
+
+class SchemaPathsCoverage:
+    """
+    Keeps track of the expected schema paths which haven't appeared in the records yet.
+    In case of `oneOf` or `anyOf` schema props, only the choice which is present in records is expected:
+    once a path of one choice appears, the paths of the other choices are dropped.
+    """
+
+    def __init__(self, schema: dict):
+        expected_paths = set(get_expected_schema_structure(schema, annotate_one_of=True))
+        self.expected_paths = expected_paths
+        self.trie = build_path_trie(expected_paths)
+        self.missing_paths = set(expected_paths)
+        # paths dropped once the annotated path appears, shared by the paths of the same property
+        self._choices: Dict[str, Set[str]] = {}
+        choices_by_property: Dict[str, Set[str]] = {}
+        for path in expected_paths:
+            property_path = ONE_OF_ANNOTATION.split(path)[0]
+            if property_path != path:
+                if property_path not in choices_by_property:
+                    choices_by_property[property_path] = {p for p in expected_paths if property_path in p}
+                self._choices[path] = choices_by_property[property_path]
+
+    @property
+    def completed(self) -> bool:
+        return not self.missing_paths
+
+    @property
+    def schema_paths(self) -> Set[str]:
+        """Expected paths without `oneOf` annotations, the ones get_expected_schema_structure composes by default"""
+        return {ONE_OF_ANNOTATION.sub("", path) for path in self.expected_paths}
+
+    def update(self, record_paths: Iterable[str]):
+        """
+        Drop the paths found in a record
+        :param record_paths: expected paths the record has, see find_object_paths
+        """
+        appeared_paths = [path for path in record_paths if path in self.missing_paths]
+        for path in appeared_paths:
+            self.missing_paths.difference_update(self._choices.get(path, ()))
+        self.missing_paths.difference_update(appeared_paths)
@@ -2,6 +2,8 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+from unittest.mock import patch
+
 import pytest
 from airbyte_cdk.models import (
     AirbyteRecordMessage,
@@ -11,7 +13,7 @@ from airbyte_cdk.models import (
     DestinationSyncMode,
     SyncMode,
 )
-from source_acceptance_test.utils.asserts import verify_records_schema
+from source_acceptance_test.utils.asserts import StreamSchemaValidator, get_error_schema_paths, verify_records_schema
 
 
 @pytest.fixture(name="record_schema")
@@ -135,3 +137,44 @@ def test_validate_records_format(record, configured_catalog, valid):
         assert not streams_with_errors
     else:
         assert streams_with_errors, f"Record {record} should produce errors against {configured_catalog.streams[0].stream.json_schema}"
+
+
+def test_get_error_schema_paths():
+    schema = {
+        "type": "object",
+        "additionalProperties": True,
+        "properties": {
+            "id": {"type": "integer"},
+            "tags": {"type": "array", "items": {"type": "string", "format": "date"}},
+            "options": {"anyOf": [{"type": "string"}, {"type": "integer"}]},
+            "meta": {"type": "object", "additionalProperties": False},
+        },
+    }
+
+    assert set(get_error_schema_paths(schema)) == {
+        ("type",),
+        ("properties", "id", "type"),
+        ("properties", "tags", "type"),
+        ("properties", "tags", "items", "type"),
+        ("properties", "tags", "items", "format"),
+        ("properties", "options", "anyOf"),
+        ("properties", "meta", "type"),
+        ("properties", "meta", "additionalProperties"),
+    }
+
+
+def test_stream_schema_validator_stops_once_all_errors_captured(record_schema):
+    validator = StreamSchemaValidator(record_schema)
+
+    validator.validate({"text_or_null": None, "number_or_null": None, "text": "text", "number": 1})
+    validator.validate({"text_or_null": 1, "number_or_null": "1", "text": None, "number": None})
+    assert not validator.completed
+    validator.validate([])
+    assert validator.completed
+
+    with patch.object(validator._validator, "iter_errors") as iter_errors:
+        validator.validate({"text_or_null": 2, "number_or_null": "2", "text": None, "number": None})
+
+    iter_errors.assert_not_called()
+    assert len(validator.errors) == 5
+    assert validator.errors["deque(['properties', 'text_or_null', 'type'])"].instance == 1
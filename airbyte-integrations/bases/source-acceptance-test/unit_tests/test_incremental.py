@@ -580,6 +580,7 @@ def test_per_stream_read_with_multiple_states(records, state_records, threshold_
     docker_runner_mock = MagicMock()
     docker_runner_mock.call_read.return_value = call_read_output_messages
     docker_runner_mock.call_read_with_state.side_effect = call_read_with_state_output_messages
+    docker_runner_mock.run_concurrently.side_effect = lambda call, calls_kwargs: (call(**kwargs) for kwargs in calls_kwargs)
 
     t = _TestIncremental()
     with expected_error:
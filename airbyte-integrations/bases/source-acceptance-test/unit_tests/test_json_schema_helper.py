@@ -18,7 +18,14 @@ from airbyte_cdk.models import (
 )
 from pydantic import BaseModel
 from source_acceptance_test.tests.test_incremental import records_with_state
-from source_acceptance_test.utils.json_schema_helper import JsonSchemaHelper, get_expected_schema_structure, get_object_structure
+from source_acceptance_test.utils.json_schema_helper import (
+    JsonSchemaHelper,
+    SchemaPathsCoverage,
+    build_path_trie,
+    find_object_paths,
+    get_expected_schema_structure,
+    get_object_structure,
+)
 
 
 @pytest.fixture(name="simple_state")
@@ -217,7 +224,7 @@ def test_get_expected_schema_structure(schema, pathes):
         (["option1"], 2, {"a_key": "a_value"}),
         (["option2"], 1, ["value1", "value2"]),
         (["nonexistent_key"], 0, None),
-        (["option1", "option2"], 3, ["value1", "value2"])
+        (["option1", "option2"], 3, ["value1", "value2"]),
     ],
 )
 def test_find_and_get_nodes(keys: List[Text], num_paths: int, last_value: Any):
@@ -257,3 +264,44 @@ def test_find_and_get_nodes(keys: List[Text], num_paths: int, last_value: Any):
         for path in variant_paths:
             values_at_nodes.append(schema_helper.get_node(path))
         assert last_value in values_at_nodes
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {},
+        {"f1": None, "f3": {"f4": "v4", "f5": []}},
+        {"f2": "v2", "f3": {"f5": [{"f6": "v6", "f7": ["a"]}, {"f8": "v8"}]}, "unknown": {"f1": "v1"}},
+        {"f3": [{"f4": "v4"}], "f9": {"f10": {"f11": 1}}},
+    ],
+)
+def test_find_object_paths(obj):
+    paths = ["/f1", "/f2", "/f3/f4", "/f3/f5", "/f3/f5/[]/f6", "/f3/f5/[]/f7/[]", "/f3(0)/f8", "/f9"]
+
+    found_paths = list(find_object_paths(obj, build_path_trie(paths)))
+
+    assert len(found_paths) == len(set(found_paths))
+    assert set(found_paths) == {path for path in paths if path.replace("(0)", "") in get_object_structure(obj)}
+
+
+def test_schema_paths_coverage():
+    schema = {
+        "type": "object",
+        "properties": {
+            "f1": {"type": "string"},
+            "f2": {
+                "oneOf": [
+                    {"type": "object", "properties": {"f3": {"type": "string"}}},
+                    {"type": "object", "properties": {"f4": {"type": "string"}}},
+                ]
+            },
+        },
+    }
+    coverage = SchemaPathsCoverage(schema)
+    assert coverage.missing_paths == {"/f1", "/f2(0)/f3", "/f2(1)/f4"}
+    assert coverage.schema_paths == {"/f1", "/f2/f3", "/f2/f4"}
+
+    coverage.update(find_object_paths({"f2": {"f4": "v4"}}, coverage.trie))
+    assert coverage.missing_paths == {"/f1"}
+    coverage.update(find_object_paths({"f1": "v1"}, coverage.trie))
+    assert coverage.completed
@@ -6,21 +6,22 @@ import json
 import random
 import string
 import tempfile
+import threading
 import time
 from functools import partial
 from pathlib import Path
 from typing import Iterable
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import docker
 import pytest
 import yaml
-from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
+from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode, Type
 from docker.errors import ContainerError, NotFound
 from source_acceptance_test.config import EmptyStreamConfiguration
-from source_acceptance_test.utils import common
-from source_acceptance_test.utils.compare import make_hashable
-from source_acceptance_test.utils.connector_runner import ConnectorRunner
+from source_acceptance_test.utils import common, compare
+from source_acceptance_test.utils.compare import make_hashable, records_difference
+from source_acceptance_test.utils.connector_runner import ConnectorOutput, ConnectorRunner, RunCache
 
 
 def not_sorted_data():
@@ -181,6 +182,46 @@ def test_exclude_fields():
         assert "organization_id" not in item
 
 
+def test_exclude_fields_keeps_input():
+    record = {"id": 1, "organization": {"id": 2, "name": "org"}}
+
+    hashable = make_hashable(record, exclude_fields=["organization/id"])
+
+    assert hashable == {"id": 1, "organization": {"name": "org"}}
+    assert record == {"id": 1, "organization": {"id": 2, "name": "org"}}
+
+
+def test_digest_is_computed_once():
+    records = [make_hashable({"id": n % 10, "tags": [str(n), "a"]}) for n in range(100)]
+
+    with patch.object(compare, "canonical_digest", wraps=compare.canonical_digest) as canonical_digest:
+        sorted(records)
+        set(records)
+
+    assert canonical_digest.call_count == 100
+
+
+@pytest.mark.parametrize(
+    "obj1,obj2,is_same",
+    [
+        ({"a": 1, "b": [1.0, True]}, {"b": [1, 1], "a": 1.0}, True),
+        ({"a": "1"}, {"a": 1}, False),
+        ({"a": None}, {"a": "None"}, False),
+        ({"a": [[1, 2], [3]]}, {"a": [[3], [2, 1]]}, True),
+    ],
+)
+def test_canonical_encoding(obj1, obj2, is_same):
+    assert (make_hashable(obj1) == make_hashable(obj2)) is is_same
+
+
+def test_records_difference_is_multiset():
+    left = [{"id": 1}, {"id": 1}, {"id": 2}, {"id": 3}]
+    right = [{"id": 3}, {"id": 1}, {"id": 4}]
+
+    assert records_difference(left, right) == [{"id": 1}, {"id": 2}]
+    assert records_difference(right, left) == [{"id": 4}]
+
+
 class MockContainer:
     def __init__(self, status: dict, iter_logs: Iterable):
         self.wait = Mock(return_value=status)
@@ -262,6 +303,100 @@ def test_failed_reading(traceback, container_error, last_line, expected_error):
     assert expected_error == exc.value.stderr
 
 
+def test_long_lines_reading():
+    long_line = b"x" * 100_000 + b"\n"
+    chunks = [long_line[i : i + 1000] for i in range(0, len(long_line), 1000)] + [b"first\nsecond\nthi", b"rd"]
+
+    lines = list(ConnectorRunner.read_lines(container=MockContainer(status={"StatusCode": 0}, iter_logs=chunks)))
+
+    assert lines == [long_line, b"first\n", b"second\n", b"third"]
+
+
+def mock_connector_runner(tmp_path, **kwargs) -> ConnectorRunner:
+    with patch.object(docker, "from_env"):
+        runner = ConnectorRunner("airbyte/source-test:dev", volume=tmp_path, **kwargs)
+    runner._image.id = "sha256:1234"
+    return runner
+
+
+def state_echo_container(image, command, volumes, **kwargs):
+    """Stand-in of the connector image, outputs the state it's run with"""
+    input_folder = next(folder for folder, volume in volumes.items() if volume["bind"] == "/data")
+    state = json.loads((Path(input_folder) / "state.json").read_text())
+    return MockContainer(status={"StatusCode": 0}, iter_logs=[json.dumps({"type": "STATE", "state": {"data": state}}).encode()])
+
+
+def test_run_cache(tmp_path):
+    runner = mock_connector_runner(tmp_path, run_cache=RunCache())
+    runner._client.containers.run.side_effect = state_echo_container
+
+    first_output = runner.call_read_with_state(config={"api_key": "secret"}, catalog=None, state={"id": 1})
+    replayed_output = runner.call_read_with_state(config={"api_key": "secret"}, catalog=None, state={"id": 1})
+    assert replayed_output is first_output
+    assert runner._client.containers.run.call_count == 1
+
+    # different inputs or the runs which are asked to run again aren't replayed
+    assert runner.call_read_with_state(config={"api_key": "secret"}, catalog=None, state={"id": 2})[0].state.data == {"id": 2}
+    runner.call_read_with_state(config={"api_key": "other"}, catalog=None, state={"id": 1})
+    rerun_output = runner.call_read_with_state(config={"api_key": "secret"}, catalog=None, state={"id": 1}, use_cache=False)
+    assert runner._client.containers.run.call_count == 4
+    assert rerun_output is not first_output
+    assert runner.call_read_with_state(config={"api_key": "secret"}, catalog=None, state={"id": 1}) is rerun_output
+
+    # the runs expected to fail aren't cached
+    runner.call_read_with_state(config={"api_key": "secret"}, catalog=None, state={"id": 1}, raise_container_error=False)
+    assert runner._client.containers.run.call_count == 5
+
+
+def test_run_concurrently(tmp_path):
+    runner = mock_connector_runner(tmp_path, max_concurrent_runs=3)
+    running, max_running, lock = 0, 0, threading.Lock()
+
+    def run_container(**kwargs):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return state_echo_container(**kwargs)
+
+    runner._client.containers.run.side_effect = run_container
+
+    outputs = runner.run_concurrently(runner.call_read_with_state, [dict(config={}, catalog=None, state={"id": n}) for n in range(7)])
+
+    assert [output[0].state.data for output in outputs] == [{"id": n} for n in range(7)]
+    assert max_running == 3
+    assert len({folder for call in runner._client.containers.run.call_args_list for folder in call.kwargs["volumes"]}) == 14
+
+
+def test_run_output(tmp_path):
+    record = {"type": "RECORD", "record": {"stream": "users", "data": {"id": 1}, "emitted_at": 1}}
+    state = {"type": "STATE", "state": {"data": {"users": {"id": 1}}}}
+    logs = [
+        json.dumps(record).encode() + b"\n",
+        b"some log line\n",
+        json.dumps(state).encode() + b"\n",
+        json.dumps({"type": "RECORD", "record": {"stream": "users"}}).encode(),
+    ]
+    runner = mock_connector_runner(tmp_path)
+    runner._client.containers.run.return_value = MockContainer(status={"StatusCode": 0}, iter_logs=logs)
+
+    output = runner.call_read(config={}, catalog=None)
+
+    assert isinstance(output, ConnectorOutput)
+    assert (runner.output_folder / "raw").read_bytes() == b"".join(logs)
+    # the log line isn't a message, the invalid record is skipped by the iteration and the indexing alike
+    assert [message.type for message in output] == [Type.RECORD, Type.STATE]
+    assert len(output) == 2
+    assert output[1].state.data == {"users": {"id": 1}}
+    assert output[-1] == output[1]
+    assert list(output) == output[:]
+    assert [message.record.data for message in common.filter_output(output, Type.RECORD)] == [{"id": 1}]
+    assert common.filter_output(output, Type.STATE) == output[1:2]
+
+
 @pytest.mark.parametrize(
     "command,wait_timeout,expected_count",
     (
@@ -2,15 +2,17 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-import json
 import re
+import tempfile
 from abc import ABC, abstractmethod
+from collections import deque
 from copy import deepcopy
 from dataclasses import dataclass
 from enum import Enum
-from gzip import decompress
+from functools import partial
 from http import HTTPStatus
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from itertools import islice
+from typing import IO, Any, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
 from urllib.parse import urljoin
 
 import backoff
@@ -22,7 +24,7 @@ from pendulum import Date
 from pydantic import BaseModel
 from source_amazon_ads.schemas import CatalogModel, MetricsReport, Profile
 from source_amazon_ads.streams.common import BasicAmazonAdsStream
-from source_amazon_ads.utils import get_typed_env, iterate_one_by_one
+from source_amazon_ads.utils import get_typed_env, iterate_gzip_text, iterate_json_array, iterate_one_by_one
 
 
 class RecordType(str, Enum):
@@ -55,7 +57,9 @@ class ReportInfo:
     profile_id: int
     record_type: str
     status: Status
-    metric_objects: List[dict]
+    location: Optional[str] = None
+    # gzipped report downloaded to a temporary file, records are decoded from it as they are read
+    report_file: Optional[IO[bytes]] = None
 
 
 class RetryableException(Exception):
@@ -98,6 +102,8 @@ class ReportStream(BasicAmazonAdsStream, ABC):
     # Format used to specify metric generation date over Amazon Ads API.
     REPORT_DATE_FORMAT = "YYYYMMDD"
     cursor_field = "reportDate"
+    # Size of chunks the gzipped report is downloaded and decoded in.
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
     ERRORS = [
         (400, "KDP authors do not have access to Sponsored Brands functionality"),
@@ -122,6 +128,12 @@ class ReportStream(BasicAmazonAdsStream, ABC):
         self.report_wait_timeout: int = get_typed_env("REPORT_WAIT_TIMEOUT", 180)
         # Maximum retries Airbyte will attempt for fetching report data. Default is 5.
         self.report_generation_maximum_retries: int = get_typed_env("REPORT_GENERATION_MAX_RETRIES", 5)
+        # Maximum number of slices (profile/date pairs) reports are started for ahead of the one being read. Default is 10.
+        # It also bounds the number of reports started ahead whose status is checked on every poll of the current slice.
+        self.max_slices_in_flight: int = get_typed_env("REPORT_MAX_SLICES_IN_FLIGHT", 10)
+        # Slices of the current sync waiting for their reports to be started and reports started ahead, by profile id and date
+        self._pending_slices: Deque[Tuple[Profile, str]] = deque()
+        self._started_reports: Dict[Tuple[int, str], List[ReportInfo]] = {}
 
     @property
     def model(self) -> CatalogModel:
@@ -140,7 +152,8 @@ class ReportStream(BasicAmazonAdsStream, ABC):
         generation works in async way: First we need to initiate creating report
         for specific profile/record type/date and then constantly check for report
         generation status - when it will have "SUCCESS" status then download the
-        report and parse result.
+        report and parse result. Reports of the following slices are started
+        ahead and polled together with the reports of the current one.
         """
 
         if not stream_slice:
@@ -152,11 +165,12 @@ class ReportStream(BasicAmazonAdsStream, ABC):
             return
         profile = stream_slice["profile"]
         report_date = stream_slice[self.cursor_field]
+        self._start_reports_ahead(profile, report_date)
         report_infos = self._init_and_try_read_records(profile, report_date)
         self._update_state(profile, report_date)
 
         for report_info in report_infos:
-            for metric_object in report_info.metric_objects:
+            for metric_object in self._read_report(report_info):
                 yield self._model(
                     profileId=report_info.profile_id,
                     recordType=report_info.record_type,
@@ -181,9 +195,29 @@ class ReportStream(BasicAmazonAdsStream, ABC):
 
         return wrapped
 
+    def _start_reports_ahead(self, profile: Profile, report_date: str):
+        """
+        Starts reports of the slices following the given one, so that Amazon generates them while the current one is read.
+        Slices are those computed by the last stream_slices call, nothing is started ahead if it was not called.
+        """
+        while self._pending_slices and len(self._started_reports) < self.max_slices_in_flight:
+            next_profile, next_report_date = self._pending_slices.popleft()
+            key = (next_profile.profileId, next_report_date)
+            if key == (profile.profileId, report_date) or key in self._started_reports:
+                continue
+            try:
+                self._started_reports[key] = self._init_reports(next_profile, next_report_date)
+            except ReportInitFailure as error:
+                # the slice will try to start its reports once more when it is read
+                self.logger.warning(
+                    f"Failed to start reports ahead for {next_profile.profileId} profile for {next_report_date} date: {error}"
+                )
+
     @backoff_max_tries
     def _init_and_try_read_records(self, profile: Profile, report_date):
-        report_infos = self._init_reports(profile, report_date)
+        report_infos = self._started_reports.pop((profile.profileId, report_date), None)
+        if report_infos is None:
+            report_infos = self._init_reports(profile, report_date)
         self.logger.info(f"Waiting for {len(report_infos)} report(s) to be generated")
         self._try_read_records(report_infos)
         return report_infos
@@ -195,21 +229,40 @@ class ReportStream(BasicAmazonAdsStream, ABC):
         for report_info in incomplete_report_infos:
             report_status, download_url = self._check_status(report_info)
             report_info.status = report_status
+            report_info.location = download_url
 
             if report_status == Status.FAILURE:
                 message = f"Report for {report_info.profile_id} with {report_info.record_type} type generation failed"
                 raise ReportGenerationFailure(message)
-            elif report_status == Status.SUCCESS:
+
+        # reports started ahead may have been generated already, while an earlier slice was waited for
+        for report_info in report_infos:
+            if report_info.status == Status.SUCCESS and report_info.report_file is None:
                 try:
-                    report_info.metric_objects = self._download_report(report_info, download_url)
+                    report_info.report_file = self._download_report(report_info, report_info.location)
                 except requests.HTTPError as error:
                     raise ReportGenerationFailure(error)
 
         pending_report_status = [(r.profile_id, r.report_id, r.status) for r in self._incomplete_report_infos(report_infos)]
         if len(pending_report_status) > 0:
+            self._check_started_reports()
             message = f"Report generation in progress: {repr(pending_report_status)}"
             raise ReportGenerationInProgress(message)
 
+    def _check_started_reports(self):
+        """
+        Updates statuses of the reports started ahead while waiting for the current ones, at most `max_slices_in_flight`
+        of them per poll, the reports of the slices to be read next first. Failed reports are restarted when their slice is read.
+        """
+        in_progress = (
+            report_info
+            for report_infos in self._started_reports.values()
+            for report_info in report_infos
+            if report_info.status == Status.IN_PROGRESS
+        )
+        for report_info in islice(in_progress, self.max_slices_in_flight):
+            report_info.status, report_info.location = self._check_status(report_info)
+
     def _incomplete_report_infos(self, report_infos):
         return [r for r in report_infos if r.status != Status.SUCCESS]
 
@@ -269,12 +322,12 @@ class ReportStream(BasicAmazonAdsStream, ABC):
         ),
         max_tries=10,
     )
-    def _send_http_request(self, url: str, profile_id: int, json: dict = None):
+    def _send_http_request(self, url: str, profile_id: int, json: dict = None, stream: bool = False):
         headers = self._get_auth_headers(profile_id)
         if json:
             response = self._session.post(url, headers=headers, json=json)
         else:
-            response = self._session.get(url, headers=headers)
+            response = self._session.get(url, headers=headers, stream=stream)
         if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
             raise TooManyRequests()
         return response
@@ -308,6 +361,10 @@ class ReportStream(BasicAmazonAdsStream, ABC):
         stream_state = stream_state or {}
         no_data = True
 
+        # reports are started ahead for the slices known at this point, the slices themselves are still evaluated lazily
+        generators = [self.stream_profile_slices(profile, stream_state) for profile in self._profiles]
+        self._pending_slices = deque((_slice["profile"], _slice[self.cursor_field]) for _slice in iterate_one_by_one(*generators))
+
         generators = [self.stream_profile_slices(profile, stream_state) for profile in self._profiles]
         for _slice in iterate_one_by_one(*generators):
             no_data = False
@@ -386,7 +443,6 @@ class ReportStream(BasicAmazonAdsStream, ABC):
                     record_type=record_type,
                     profile_id=profile.profileId,
                     status=Status.IN_PROGRESS,
-                    metric_objects=[],
                 )
             )
             self.logger.info("Initiated successfully")
@@ -395,17 +451,31 @@ class ReportStream(BasicAmazonAdsStream, ABC):
 
     @backoff.on_exception(
         backoff.expo,
-        requests.HTTPError,
+        (requests.HTTPError, requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError),
         max_tries=5,
     )
-    def _download_report(self, report_info: ReportInfo, url: str) -> List[dict]:
+    def _download_report(self, report_info: ReportInfo, url: str) -> IO[bytes]:
+        """
+        Download report result to a temporary file as is (gzipped), the whole download is retried if it breaks off midway
+        """
+        report_file = tempfile.TemporaryFile()
+        try:
+            with self._send_http_request(url, report_info.profile_id, stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                    report_file.write(chunk)
+        except BaseException:
+            report_file.close()
+            raise
+        report_file.seek(0)
+        return report_file
+
+    def _read_report(self, report_info: ReportInfo) -> Iterable[dict]:
         """
-        Download and parse report result
+        Parse downloaded report result, the gzipped JSON array is decoded in chunks and records are yielded one by one
         """
-        response = self._send_http_request(url, report_info.profile_id)
-        response.raise_for_status()
-        raw_string = decompress(response.content).decode("utf")
-        return json.loads(raw_string)
+        with report_info.report_file as report_file:
+            yield from iterate_json_array(iterate_gzip_text(iter(partial(report_file.read, self.DOWNLOAD_CHUNK_SIZE), b"")))
 
     def get_error_display_message(self, exception: BaseException) -> Optional[str]:
         if isinstance(exception, ReportGenerationInProgress):
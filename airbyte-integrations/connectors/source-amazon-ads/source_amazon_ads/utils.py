@@ -2,12 +2,18 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import codecs
+import json
 import logging
 import os
-from typing import Union
+import re
+import zlib
+from typing import Any, Iterable, Iterator, Union
 
 logger = logging.getLogger("airbyte")
 
+WHITESPACE = re.compile(r"\s*")
+
 
 def iterate_one_by_one(*iterables):
     iterables = list(iterables)
@@ -30,3 +36,53 @@ def get_typed_env(name: str, default: Union[str, int]) -> Union[str, int]:
     except ValueError:
         logger.warning(f"Cannot convert environment variable {name}={value!r} to type {convert}")
         return default
+
+
+def iterate_gzip_text(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Decompresses gzip data and decodes it to text chunk by chunk, without holding the whole content in memory"""
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        text = decoder.decode(decompressor.decompress(chunk))
+        if text:
+            yield text
+    yield decoder.decode(decompressor.flush(), final=True)
+
+
+def iterate_json_array(texts: Iterable[str]) -> Iterator[Any]:
+    """Parses a JSON array split in arbitrary text chunks, yields its items as soon as they are decoded"""
+    decoder = json.JSONDecoder()
+    buffer, position, expected = "", 0, "["
+    for text in texts:
+        buffer = buffer[position:] + text
+        position = 0
+        while True:
+            position = WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if expected == "[":
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {buffer[position:position + 20]!r}")
+                position += 1
+                expected = "first item"
+            elif char == "]" and expected in ("first item", ","):
+                return
+            elif expected == ",":
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {buffer[position:position + 20]!r}")
+                position += 1
+                expected = "item"
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # the item continues in the next chunk
+                    break
+                if end == len(buffer):
+                    # a number at the end of the chunk may continue in the next one
+                    break
+                yield item
+                position = end
+                expected = ","
+    raise ValueError("Unexpected end of JSON array")
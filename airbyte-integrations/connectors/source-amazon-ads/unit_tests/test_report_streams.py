@@ -15,7 +15,7 @@ from airbyte_cdk.models import SyncMode
 from freezegun import freeze_time
 from pendulum import Date
 from pytest import raises
-from requests.exceptions import ConnectionError
+from requests.exceptions import ChunkedEncodingError, ConnectionError
 from source_amazon_ads.schemas.profile import AccountInfo, Profile
 from source_amazon_ads.source import CONFIG_DATE_FORMAT
 from source_amazon_ads.streams import (
@@ -27,7 +27,13 @@ from source_amazon_ads.streams import (
     SponsoredProductCampaigns,
     SponsoredProductsReportStream,
 )
-from source_amazon_ads.streams.report_streams.report_streams import ReportGenerationFailure, ReportGenerationInProgress, TooManyRequests
+from source_amazon_ads.streams.report_streams.report_streams import (
+    ReportGenerationFailure,
+    ReportGenerationInProgress,
+    ReportInfo,
+    Status,
+    TooManyRequests,
+)
 
 from .utils import read_incremental
 
@@ -561,6 +567,72 @@ def test_read_incremental_with_records_start_date(config):
         assert {r["reportDate"] for r in records} == {"20210103", "20210104", "20210105", "20210106"}
 
 
+@responses.activate
+def test_read_incremental_starts_reports_ahead(config):
+    setup_responses(init_response=REPORT_INIT_RESPONSE, metric_response=METRIC_RESPONSE)
+
+    class StatusCallback:
+        count: int = 0
+
+        def __call__(self, request):
+            self.count += 1
+            # reports are ready once every slice polled a couple of times
+            status = "SUCCESS" if self.count > 10 else "IN_PROGRESS"
+            return (200, {}, REPORT_STATUS_RESPONSE.replace("SUCCESS", status))
+
+    responses.add_callback(responses.GET, re.compile(r"https://advertising-api.amazon.com/v2/reports/[^/]+$"), callback=StatusCallback())
+    config["start_date"] = Date(2020, 12, 30)
+    profiles = make_profiles()
+    stream = SponsoredDisplayReportStream(config, profiles, authenticator=mock.MagicMock())
+
+    with freeze_time("2021-01-02 12:00:00"), mock.patch("time.sleep"):
+        slices = list(stream.stream_slices(SyncMode.incremental, cursor_field=stream.cursor_field, stream_state={}))
+        records = list(read_incremental(stream, {}))
+
+    assert len(slices) == 4
+    report_types = len(stream.metrics_map)
+    init_calls = [call for call in responses.calls if call.request.method == "POST"]
+    # every report is started exactly once, all of them before the first one is read
+    assert len(init_calls) == len(slices) * report_types
+    assert responses.calls[len(init_calls) - 1].request.method == "POST"
+    assert len(records) == METRICS_COUNT * report_types * len(slices)
+
+
+@responses.activate
+def test_display_report_stream_download_retried(mocker, config):
+    mocker.patch("time.sleep")
+    setup_responses(init_response=REPORT_INIT_RESPONSE, status_response=REPORT_STATUS_RESPONSE)
+    download_url = re.compile(r"https://advertising-api-test.amazon.com/v1/reports/[^/]+/download")
+    # the first download of every report breaks off
+    responses.add(responses.GET, download_url, body=ChunkedEncodingError("Connection broken"))
+    responses.add(responses.GET, download_url, body=METRIC_RESPONSE)
+
+    profiles = make_profiles()
+    stream = SponsoredDisplayReportStream(config, profiles, authenticator=mock.MagicMock())
+    stream_slice = {"profile": profiles[0], "reportDate": "20210725"}
+    metrics = list(stream.read_records(SyncMode.incremental, stream_slice=stream_slice))
+
+    assert len(metrics) == METRICS_COUNT * len(stream.metrics_map)
+    downloads = [call for call in responses.calls if call.request.url.endswith("/download")]
+    assert len(downloads) == len(stream.metrics_map) + 1
+
+
+def test_check_started_reports_bounded(config):
+    stream = SponsoredDisplayReportStream(config, make_profiles(), authenticator=mock.MagicMock())
+    stream.max_slices_in_flight = 3
+    stream._check_status = mock.MagicMock(return_value=(Status.IN_PROGRESS, None))
+    for report_date in ["20210725", "20210726"]:
+        stream._started_reports[(1, report_date)] = [
+            ReportInfo(report_id=f"{report_date}-{i}", profile_id=1, record_type="campaigns", status=Status.IN_PROGRESS) for i in range(2)
+        ]
+
+    stream._check_started_reports()
+
+    # the reports of the slice read next are checked first
+    checked = [call.args[0].report_id for call in stream._check_status.call_args_list]
+    assert checked == ["20210725-0", "20210725-1", "20210726-0"]
+
+
 @pytest.mark.parametrize(
     "state_filter, stream_class",
     [
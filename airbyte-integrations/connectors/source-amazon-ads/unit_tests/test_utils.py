@@ -2,7 +2,11 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-from source_amazon_ads.utils import get_typed_env
+import gzip
+import json
+
+import pytest
+from source_amazon_ads.utils import get_typed_env, iterate_gzip_text, iterate_json_array
 
 
 def test_get_typed_env(monkeypatch):
@@ -15,3 +19,29 @@ def test_get_typed_env(monkeypatch):
     assert get_typed_env("REPORT_WAIT_TIMEOUT", "180") == "60"
     monkeypatch.setenv("REPORT_WAIT_TIMEOUT", "string")
     assert get_typed_env("REPORT_WAIT_TIMEOUT", 180) == 180
+
+
+def test_iterate_gzip_json_array():
+    items = [{"campaignId": i, "campaignName": f"name-\u00e9-{i}"} for i in range(1000)] + [12345, "string", None]
+    content = gzip.compress(json.dumps(items, indent=2).encode("utf-8"))
+    chunks = [content[i : i + 7] for i in range(0, len(content), 7)]
+    assert list(iterate_json_array(iterate_gzip_text(chunks))) == items
+
+
+@pytest.mark.parametrize(
+    ("texts", "expected"),
+    [
+        (["[]"], []),
+        ([" [", " ", "]\n"], []),
+        (["[1", "2", ",3", "4]"], [12, 34]),
+        (['[{"a": [1, ', '2]}, "x"', "]"], [{"a": [1, 2]}, "x"]),
+    ],
+)
+def test_iterate_json_array(texts, expected):
+    assert list(iterate_json_array(texts)) == expected
+
+
+@pytest.mark.parametrize("texts", [["{}"], ["[1,"], ["[1 2]"]])
+def test_iterate_json_array_invalid(texts):
+    with pytest.raises(ValueError):
+        list(iterate_json_array(texts))
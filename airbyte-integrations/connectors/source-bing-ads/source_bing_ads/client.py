@@ -95,6 +95,10 @@ class Client:
         token_updated_expires_in: int = self.oauth.access_token_expires_in_seconds - token_total_lifetime.seconds
         return False if token_updated_expires_in > self.refresh_token_safe_delta else True
 
+    def refresh_token_if_expiring(self) -> None:
+        if self.is_token_expiring():
+            self.oauth = self._get_access_token()
+
     def should_retry(self, error: WebFault) -> bool:
         if isinstance(error, URLError) and isinstance(error.reason, socket.timeout):
             return False
@@ -137,8 +141,7 @@ class Client:
         """
         Executes appropriate Service Operation on Bing Ads API
         """
-        if self.is_token_expiring():
-            self.oauth = self._get_access_token()
+        self.refresh_token_if_expiring()
 
         if is_report_service:
             service = self._get_reporting_service(customer_id=customer_id, account_id=account_id)
@@ -0,0 +1,137 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from bingads.v13.reporting import ReportingDownloadException, ReportingDownloadOperation, ReportingException
+from source_bing_ads.client import Client
+from suds import sudsobject
+
+
+class ReportScheduler:
+    """
+    Generates the reports of all accounts of a stream at once, instead of one account after another:
+    report requests are submitted up front (up to `max_pending_reports` at a time), the pending reports are polled together,
+    and the completed ones are downloaded on a bounded pool of worker threads while the earlier reports are read.
+    Reports are handed out as downloaded files, the streams read them row by row and remove them once they're read.
+    Bing queues the generation of the submitted reports, so the timeout of a report only counts once its slice is requested,
+    and a report which failed or timed out only fails the slice of its own account.
+    """
+
+    max_pending_reports: int = 100
+    max_workers: int = 4
+
+    def __init__(self, client: Client, timeout: int, report_file_format: str = "Csv"):
+        """
+        :param client: Bing Ads client the reports are submitted with
+        :param timeout: time in milliseconds a report is allowed to take since it's submitted and its slice is requested,
+            until it's downloaded
+        :param report_file_format: format of the report files
+        """
+        self._client = client
+        self._timeout = timeout
+        self._report_file_format = report_file_format
+        # report requests which aren't submitted yet, key -> (customer_id, account_id, report request factory)
+        self._scheduled: Dict[str, Any] = OrderedDict()
+        # submitted reports which aren't completed yet, key -> (operation, submitted at)
+        self._pending: Dict[str, Any] = OrderedDict()
+        # when the slices of the reports were first requested, the timeout of a report counts from then at the earliest
+        self._requested_at: Dict[str, float] = {}
+        # downloads of the completed reports, or the errors of the reports which failed, key -> future
+        self._downloads: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._directory = tempfile.TemporaryDirectory()
+
+    def schedule(self, key: str, customer_id: str, account_id: str, report_request: Callable[[], sudsobject.Object]):
+        """Schedules the report to be generated, the report request is built once it's submitted"""
+        self._scheduled[key] = (customer_id, account_id, report_request)
+
+    def is_scheduled(self, key: str) -> bool:
+        return key in self._scheduled or key in self._pending or key in self._downloads
+
+    def _submit(self):
+        while self._scheduled and len(self._pending) < self.max_pending_reports:
+            key, (customer_id, account_id, report_request) = self._scheduled.popitem(last=False)
+            operation = self._client.request(
+                service_name=None,
+                customer_id=customer_id,
+                account_id=account_id,
+                operation_name="submit_download",
+                is_report_service=True,
+                params={"report_request": report_request()},
+            )
+            self._pending[key] = (operation, time.monotonic())
+
+    def _started_at(self, key: str, submitted_at: float) -> Optional[float]:
+        """Time the timeout of the report counts from, None while its slice isn't requested"""
+        requested_at = self._requested_at.get(key)
+        return None if requested_at is None else max(submitted_at, requested_at)
+
+    def _fail(self, key: str, error: Exception):
+        """Keeps the error of the report, it's raised once the slice of the report is requested"""
+        del self._pending[key]
+        future = Future()
+        future.set_exception(error)
+        self._downloads[key] = future
+
+    def _poll(self):
+        self._client.refresh_token_if_expiring()
+        for key, (operation, submitted_at) in list(self._pending.items()):
+            status = operation.get_status()
+            if status.status == "Pending":
+                started_at = self._started_at(key, submitted_at)
+                if started_at is not None and (time.monotonic() - started_at) * 1000 > self._timeout:
+                    self._fail(key, ReportingDownloadException(f"Report {key} isn't generated in {self._timeout} milliseconds."))
+                continue
+            if status.status != "Success":
+                self._fail(key, ReportingException(f"Report {key} generation failed.", status.status))
+                continue
+            del self._pending[key]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bing_ads_reports")
+            self._downloads[key] = self._executor.submit(self._download, key, operation, submitted_at)
+
+    def _download(self, key: str, operation: ReportingDownloadOperation, submitted_at: float) -> Optional[str]:
+        started_at = self._started_at(key, submitted_at) or time.monotonic()
+        remaining_timeout = max(self._timeout - (time.monotonic() - started_at) * 1000, self._client.report_poll_interval)
+        return operation.download_result_file(
+            result_file_directory=self._directory.name,
+            result_file_name=f"{key}.{self._report_file_format.lower()}",
+            decompress=True,
+            overwrite=True,
+            timeout_in_milliseconds=remaining_timeout,
+        )
+
+    def get_report_file(self, key: str) -> Optional[str]:
+        """
+        Waits for the report to be downloaded, while the other reports are submitted and polled.
+        Returns the path of the report file, None for the reports without data.
+        Raises the error of the report if it failed.
+        """
+        self._requested_at.setdefault(key, time.monotonic())
+        while key not in self._downloads:
+            self._submit()
+            self._poll()
+            if key not in self._downloads:
+                time.sleep(self._client.report_poll_interval / 1000)
+        # the next reports are submitted, so that they are generated while this one is read
+        self._submit()
+        self._requested_at.pop(key, None)
+        return self._downloads.pop(key).result()
+
+    def close(self):
+        self._scheduled.clear()
+        self._pending.clear()
+        self._requested_at.clear()
+        for future in self._downloads.values():
+            future.cancel()
+        self._downloads.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._directory.cleanup()
@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import os
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
@@ -15,6 +16,7 @@ from bingads.service_client import ServiceClient
 from bingads.v13.internal.reporting.row_report import _RowReport
 from bingads.v13.internal.reporting.row_report_iterator import _RowReportRecord
 from bingads.v13.reporting import ReportingDownloadParameters
+from source_bing_ads.report_scheduler import ReportScheduler
 from suds import sudsobject
 
 AVERAGE_FIELD_TYPES = {
@@ -148,6 +150,8 @@ class ReportsMixin(ABC):
     # timeout for reporting download operations in milliseconds
     timeout: int = 300000
     report_file_format: str = "Csv"
+    # generates the reports of all accounts at once, see ReportScheduler
+    report_scheduler: Optional[ReportScheduler] = None
 
     primary_key: List[str] = ["TimePeriod", "Network", "DeviceType"]
 
@@ -331,9 +335,49 @@ class ReportsMixin(ABC):
 
     def stream_slices(
         self,
+        stream_state: Mapping[str, Any] = None,
         **kwargs: Mapping[str, Any],
     ) -> Iterable[Optional[Mapping[str, Any]]]:
-        for account in source_bing_ads.source.Accounts(self.client, self.config).read_records(SyncMode.full_refresh):
-            yield {"account_id": account["Id"], "customer_id": account["ParentCustomerId"]}
-
-        yield from []
+        stream_slices = [
+            {"account_id": account["Id"], "customer_id": account["ParentCustomerId"]}
+            for account in source_bing_ads.source.Accounts(self.client, self.config).read_records(SyncMode.full_refresh)
+        ]
+
+        # the reports of all accounts are scheduled up front, so that those are generated while the first ones are read
+        self.report_scheduler = ReportScheduler(self.client, timeout=self.timeout, report_file_format=self.report_file_format)
+        for stream_slice in stream_slices:
+            account_id = str(stream_slice["account_id"])
+            self.report_scheduler.schedule(
+                account_id,
+                customer_id=str(stream_slice["customer_id"]),
+                account_id=account_id,
+                report_request=lambda account_id=account_id: self.request_params(stream_state=stream_state, account_id=account_id)[
+                    "report_request"
+                ],
+            )
+        try:
+            yield from stream_slices
+        finally:
+            self.report_scheduler.close()
+            self.report_scheduler = None
+
+    def read_records(
+        self,
+        sync_mode: SyncMode,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+        **kwargs: Mapping[str, Any],
+    ) -> Iterable[Mapping[str, Any]]:
+        account_id = str(stream_slice.get("account_id")) if stream_slice else None
+        if not self.report_scheduler or not self.report_scheduler.is_scheduled(account_id):
+            yield from super().read_records(sync_mode, stream_slice=stream_slice, stream_state=stream_state, **kwargs)
+            return
+
+        report_file_path = self.report_scheduler.get_report_file(account_id)
+        if report_file_path:
+            report = _RowReport(report_file_path, format=self.report_file_format)
+            try:
+                yield from self.parse_response(report)
+            finally:
+                report.close()
+                os.remove(report_file_path)
@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import os
+from unittest import mock
+
+import pytest
+from bingads.v13.reporting import ReportingDownloadException, ReportingException
+from bingads.v13.reporting.reporting_operation_status import ReportingOperationStatus
+from source_bing_ads.client import Client
+from source_bing_ads.report_scheduler import ReportScheduler
+from source_bing_ads.reports import ReportsMixin
+from source_bing_ads.source import SourceBingAds
+
+REPORT_HEADER = """"Report Name: AccountPerformanceReport"
+"Report Time: 1/1/2022"
+"Time Zone: (GMT) Greenwich Mean Time : Dublin, Edinburgh, Lisbon, London"
+"Last Completed Available Day: 2/2/2022 5:00:00 AM (GMT)"
+"Last Completed Available Hour: 2/2/2022 5:00:00 AM (GMT)"
+"Report Aggregation: Monthly"
+"Report Filter: "
+"Potential Incomplete Data: false"
+"Rows: 1"
+
+"AccountId","TimePeriod","Clicks"
+"""
+
+
+class FakeOperation:
+    def __init__(self, account_id: str, statuses):
+        self.account_id = account_id
+        self.statuses = list(statuses)
+
+    def get_status(self):
+        return ReportingOperationStatus(status=self.statuses.pop(0), report_download_url="https://bingads.report")
+
+    def download_result_file(self, result_file_directory, result_file_name, **kwargs):
+        path = os.path.join(result_file_directory, result_file_name)
+        with open(path, "w") as report_file:
+            report_file.write(REPORT_HEADER + f'"{self.account_id}","2022-01-01","{self.account_id}0"\n')
+        return path
+
+
+def fake_client(statuses):
+    client = mock.Mock(spec=Client, report_poll_interval=0)
+    client.request.side_effect = lambda account_id, **kwargs: FakeOperation(account_id, statuses[account_id])
+    return client
+
+
+class TestReport(ReportsMixin, SourceBingAds):
+    report_name, report_schema_name = "AccountPerformanceReport", "account_performance_report"
+    report_columns = ["AccountId", "TimePeriod", "Clicks"]
+    report_aggregation = "Monthly"
+    cursor_field = "TimePeriod"
+
+    def __init__(self, client) -> None:
+        self.client = client
+        self.config = {}
+
+    def request_params(self, account_id: str = None, **kwargs):
+        return {"report_request": f"{account_id} report request"}
+
+
+def test_scheduler_submits_reports_ahead_and_keeps_order():
+    client = fake_client({"1": ["Pending", "Pending", "Success"], "2": ["Success"], "3": ["Success"]})
+    scheduler = ReportScheduler(client, timeout=300000)
+    scheduler.max_pending_reports = 2
+    for account_id in ("1", "2", "3"):
+        scheduler.schedule(account_id, customer_id="100", account_id=account_id, report_request=lambda: "report request")
+
+    first_report_file = scheduler.get_report_file("1")
+    # the second report was generated and the third one submitted while the first one was pending
+    assert client.request.call_count == 3
+    assert open(first_report_file).read().endswith('"1","2022-01-01","10"\n')
+    assert open(scheduler.get_report_file("2")).read().endswith('"2","2022-01-01","20"\n')
+    assert open(scheduler.get_report_file("3")).read().endswith('"3","2022-01-01","30"\n')
+    scheduler.close()
+
+
+def test_scheduler_raises_failed_report():
+    client = fake_client({"1": ["Error"]})
+    scheduler = ReportScheduler(client, timeout=300000)
+    scheduler.schedule("1", customer_id="100", account_id="1", report_request=lambda: "report request")
+
+    with pytest.raises(ReportingException):
+        scheduler.get_report_file("1")
+    scheduler.close()
+
+
+def test_scheduler_raises_failed_report_for_its_own_slice_only():
+    client = fake_client({"1": ["Pending", "Success"], "2": ["Error"]})
+    scheduler = ReportScheduler(client, timeout=300000)
+    for account_id in ("1", "2"):
+        scheduler.schedule(account_id, customer_id="100", account_id=account_id, report_request=lambda: "report request")
+
+    assert open(scheduler.get_report_file("1")).read().endswith('"1","2022-01-01","10"\n')
+    with pytest.raises(ReportingException):
+        scheduler.get_report_file("2")
+    scheduler.close()
+
+
+def test_scheduler_timeout_counts_from_slice_request():
+    client = fake_client({"1": ["Success"], "2": ["Pending"] * 4, "3": ["Pending"] * 4})
+    scheduler = ReportScheduler(client, timeout=1000)
+    for account_id in ("1", "2", "3"):
+        scheduler.schedule(account_id, customer_id="100", account_id=account_id, report_request=lambda: "report request")
+    clock = [0.0]
+
+    with mock.patch("source_bing_ads.report_scheduler.time.monotonic", side_effect=lambda: clock[0]):
+        scheduler.get_report_file("1")
+        # the reports queued while the earlier ones were read don't time out before their slices are requested
+        clock[0] = 10.0
+        client.report_poll_interval = 1000
+        with mock.patch(
+            "source_bing_ads.report_scheduler.time.sleep", side_effect=lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        ):
+            with pytest.raises(ReportingDownloadException, match="Report 2 isn't generated"):
+                scheduler.get_report_file("2")
+    # the report of the account was polled past the timeout since the slice was requested, not since it was submitted
+    assert clock[0] == 12.0
+    scheduler.close()
+
+
+def test_report_stream_reads_scheduled_reports():
+    client = fake_client({"1": ["Pending", "Success"], "2": ["Success"]})
+    stream = TestReport(client)
+    accounts = [{"Id": 1, "ParentCustomerId": 100}, {"Id": 2, "ParentCustomerId": 100}]
+
+    records = []
+    with mock.patch("source_bing_ads.source.Accounts.read_records", return_value=iter(accounts)):
+        for stream_slice in stream.stream_slices(stream_state={}):
+            records.extend(stream.read_records(sync_mode=None, stream_slice=stream_slice, stream_state={}))
+
+    assert records == [
+        {"AccountId": 1, "TimePeriod": "2022-01-01", "Clicks": 10},
+        {"AccountId": 2, "TimePeriod": "2022-01-01", "Clicks": 20},
+    ]
+    assert [call.kwargs["params"] for call in client.request.call_args_list] == [
+        {"report_request": "1 report request"},
+        {"report_request": "2 report request"},
+    ]
+    assert stream.report_scheduler is None
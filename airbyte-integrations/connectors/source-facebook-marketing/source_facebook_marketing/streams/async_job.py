@@ -130,6 +130,11 @@ class ParentAsyncJob(AsyncJob):
         super().__init__(**kwargs)
         self._jobs = jobs
 
+    @property
+    def jobs(self) -> List["InsightAsyncJob"]:
+        """Jobs of the group"""
+        return self._jobs
+
     def start(self):
         """Start each job in the group."""
         for job in self._jobs:
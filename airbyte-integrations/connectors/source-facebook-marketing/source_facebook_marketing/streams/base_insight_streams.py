@@ -15,6 +15,7 @@ from cached_property import cached_property
 from facebook_business.exceptions import FacebookBadObjectError
 from source_facebook_marketing.streams.async_job import AsyncJob, InsightAsyncJob
 from source_facebook_marketing.streams.async_job_manager import InsightAsyncJobManager
+from source_facebook_marketing.streams.result_prefetcher import InsightResultPrefetcher
 
 from .base_streams import FBMarketingIncrementalStream
 
@@ -80,6 +81,7 @@ class AdsInsights(FBMarketingIncrementalStream):
         self._cursor_value: Optional[pendulum.Date] = None  # latest period that was read
         self._next_cursor_value = self._get_start_date()
         self._completed_slices = set()
+        self._result_prefetcher = InsightResultPrefetcher()
 
     @property
     def name(self) -> str:
@@ -115,8 +117,7 @@ class AdsInsights(FBMarketingIncrementalStream):
         """Waits for current job to finish (slice) and yield its result"""
         job = stream_slice["insight_job"]
         try:
-            for obj in job.get_result():
-                yield obj.export_all_data()
+            yield from self._result_prefetcher.get_result(job)
         except FacebookBadObjectError as e:
             raise AirbyteTracedException(
                 message=f"API error occurs on Facebook side during job: {job}, wrong (empty) response received with errors: {e} "
@@ -218,7 +219,7 @@ class AdsInsights(FBMarketingIncrementalStream):
             self.state = stream_state
 
         manager = InsightAsyncJobManager(api=self._api, jobs=self._generate_async_jobs(params=self.request_params()))
-        for job in manager.completed_jobs():
+        for job in self._result_prefetcher.completed_jobs(manager.completed_jobs()):
             yield {"insight_job": job}
 
     def _get_start_date(self) -> pendulum.Date:
@@ -0,0 +1,190 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Full, Queue
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .async_job import AsyncJob, ParentAsyncJob
+
+logger = logging.getLogger("airbyte")
+
+
+class ResultBufferFull(Exception):
+    """The results buffer went over its budget while a result was being downloaded"""
+
+
+class JobResultBuffer:
+    """Records of a completed job, downloaded to a temporary file"""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(mode="w+b")
+        self.size = 0
+
+    def write(self, record: Mapping[str, Any]) -> int:
+        """Appends the record, returns the number of bytes written"""
+        line = json.dumps(record).encode() + b"\n"
+        self._file.write(line)
+        self.size += len(line)
+        return len(line)
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line)
+
+    def close(self):
+        self._file.close()
+
+
+class InsightResultPrefetcher:
+    """
+    Downloads results of completed insight jobs on a pool of worker threads, while the job manager keeps polling
+    and starting jobs in a background thread, so that paging through large results doesn't hold up the other jobs.
+    Jobs are handed out in the order the manager completes them, results are buffered on disk until they're read.
+    Children of a ParentAsyncJob are downloaded in parallel and read in their original order.
+    Bytes are counted as they're downloaded, once the buffered results exceed max_bytes the downloads in progress are dropped
+    and no more results are prefetched, those are read directly from the API instead.
+    """
+
+    MAX_WORKERS = 4
+    MAX_BUFFERED_BYTES = 1024**3
+    # completed jobs the manager may run ahead of the reader before it pauses
+    MAX_QUEUED_JOBS = 100
+
+    _END = object()
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_bytes: int = MAX_BUFFERED_BYTES, max_queued_jobs: int = MAX_QUEUED_JOBS):
+        self._max_workers = max_workers
+        self._max_bytes = max_bytes
+        self._max_queued_jobs = max_queued_jobs
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._results: Dict[AsyncJob, List[Tuple[AsyncJob, Future]]] = {}
+        self._buffered_bytes = 0
+        self._lock = threading.Lock()
+
+    def completed_jobs(self, jobs: Iterator[AsyncJob]) -> Iterator[AsyncJob]:
+        """Iterates over jobs in a background thread, starting to download results of each job as soon as it's completed
+
+        :param jobs: completed jobs, e.g. from InsightAsyncJobManager.completed_jobs
+        :yield: completed jobs in the same order
+        """
+        queue = Queue(maxsize=self._max_queued_jobs)
+        stop = threading.Event()
+        thread = threading.Thread(target=self._produce, args=(jobs, queue, stop), name="insight_jobs", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = queue.get()
+                if item is self._END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # the manager thread exits at its next completed job, it isn't waited for as it may be sleeping on the throttle
+            stop.set()
+            self.close()
+
+    def _produce(self, jobs: Iterator[AsyncJob], queue: Queue, stop: threading.Event):
+        try:
+            for job in jobs:
+                if isinstance(job, AsyncJob):
+                    self._prefetch(job, stop)
+                if not self._put(queue, job, stop):
+                    return
+            item = self._END
+        except BaseException as e:
+            item = e
+        self._put(queue, item, stop)
+
+    @staticmethod
+    def _put(queue: Queue, item: Any, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _prefetch(self, job: AsyncJob, stop: threading.Event):
+        with self._lock:
+            if stop.is_set():
+                return
+            if self._buffered_bytes >= self._max_bytes:
+                logger.info(f"{job}: results buffer is full ({self._buffered_bytes} bytes), the result will be read directly.")
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="insight_results")
+            children = job.jobs if isinstance(job, ParentAsyncJob) else [job]
+            self._results[job] = [(child, self._executor.submit(self._download, child)) for child in children]
+
+    def _reserve(self, size: int):
+        """Counts the bytes written to a buffer, raises ResultBufferFull once the buffers hold more than max_bytes"""
+        with self._lock:
+            self._buffered_bytes += size
+            if self._buffered_bytes > self._max_bytes:
+                raise ResultBufferFull(f"results buffer is full ({self._buffered_bytes} bytes)")
+
+    def _download(self, job: AsyncJob) -> JobResultBuffer:
+        buffer = JobResultBuffer()
+        try:
+            # the downloads queued before the buffer filled up don't start at all
+            self._reserve(0)
+            for obj in job.get_result():
+                self._reserve(buffer.write(obj.export_all_data()))
+        except BaseException:
+            with self._lock:
+                self._buffered_bytes -= buffer.size
+            buffer.close()
+            raise
+        return buffer
+
+    def _release(self, future: Future):
+        if future.cancel() or future.exception():
+            return
+        buffer = future.result()
+        with self._lock:
+            self._buffered_bytes -= buffer.size
+        buffer.close()
+
+    def get_result(self, job: AsyncJob) -> Iterator[Mapping[str, Any]]:
+        """Records of the completed job, from the prefetched buffers if there are any, otherwise straight from the API"""
+        with self._lock:
+            results = self._results.pop(job, None)
+        if results is None:
+            for obj in job.get_result():
+                yield obj.export_all_data()
+            return
+
+        try:
+            for child, future in results:
+                try:
+                    buffer = future.result()
+                except ResultBufferFull as e:
+                    logger.info(f"{child}: {e}, the result will be read directly.")
+                    for obj in child.get_result():
+                        yield obj.export_all_data()
+                    continue
+                yield from buffer
+        finally:
+            for _, future in results:
+                future.add_done_callback(self._release)
+
+    def close(self):
+        """Drops the results which weren't read"""
+        with self._lock:
+            results, self._results = self._results, {}
+            executor, self._executor = self._executor, None
+        for job_results in results.values():
+            for _, future in job_results:
+                future.cancel()
+                future.add_done_callback(self._release)
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,91 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import threading
+from concurrent.futures import wait
+
+import pytest
+from source_facebook_marketing.streams.async_job import InsightAsyncJob, ParentAsyncJob
+from source_facebook_marketing.streams.result_prefetcher import InsightResultPrefetcher
+
+
+def make_job(mocker, records):
+    job = mocker.Mock(spec=InsightAsyncJob)
+    job.get_result.return_value = [mocker.Mock(**{"export_all_data.return_value": record}) for record in records]
+    return job
+
+
+class TestInsightResultPrefetcher:
+    def test_completed_jobs_keeps_order_and_prefetches(self, mocker):
+        jobs = [make_job(mocker, [{"id": 1}, {"id": 2}]), make_job(mocker, [{"id": 3}])]
+        prefetcher = InsightResultPrefetcher()
+
+        records = []
+        for job in prefetcher.completed_jobs(iter(jobs)):
+            records.extend(prefetcher.get_result(job))
+
+        assert records == [{"id": 1}, {"id": 2}, {"id": 3}]
+        assert prefetcher._buffered_bytes == 0
+        assert not prefetcher._results
+
+    def test_parent_job_children_read_in_order(self, mocker):
+        children = [make_job(mocker, [{"id": i}]) for i in range(5)]
+        parent = mocker.Mock(spec=ParentAsyncJob, jobs=children)
+        prefetcher = InsightResultPrefetcher(max_workers=3)
+
+        records = []
+        for job in prefetcher.completed_jobs(iter([parent])):
+            assert job == parent
+            records.extend(prefetcher.get_result(job))
+
+        assert records == [{"id": i} for i in range(5)]
+        parent.get_result.assert_not_called()
+
+    def test_get_result_reads_directly_when_buffer_full(self, mocker):
+        jobs = [make_job(mocker, [{"id": 1}]), make_job(mocker, [{"id": 2}])]
+        prefetcher = InsightResultPrefetcher(max_workers=1, max_bytes=1)
+
+        records = []
+        for job in prefetcher.completed_jobs(iter(jobs)):
+            records.extend(prefetcher.get_result(job))
+
+        assert records == [{"id": 1}, {"id": 2}]
+
+    def test_buffered_bytes_bounded(self, mocker):
+        records = [{"id": i, "value": "x" * 20} for i in range(50)]
+        line_size = len(json.dumps(records[0]).encode()) + 1
+        jobs = [make_job(mocker, records) for _ in range(5)]
+        prefetcher = InsightResultPrefetcher(max_workers=2, max_bytes=10 * line_size)
+        peak, reserve = 0, prefetcher._reserve
+
+        def tracked_reserve(size):
+            nonlocal peak
+            try:
+                reserve(size)
+            finally:
+                peak = max(peak, prefetcher._buffered_bytes)
+
+        mocker.patch.object(prefetcher, "_reserve", side_effect=tracked_reserve)
+        for job in jobs:
+            prefetcher._prefetch(job, threading.Event())
+        wait([future for results in prefetcher._results.values() for _, future in results])
+
+        # the bytes are counted as they're written, a worker goes over the budget by one record at most before it stops
+        assert peak <= 10 * line_size + 2 * line_size
+        assert prefetcher._buffered_bytes <= 10 * line_size
+        # the results which didn't fit are read directly
+        for job in jobs:
+            assert list(prefetcher.get_result(job)) == records
+        assert prefetcher._buffered_bytes == 0
+
+    def test_completed_jobs_raises_manager_error(self, mocker):
+        def jobs():
+            yield make_job(mocker, [{"id": 1}])
+            raise RuntimeError("job failed")
+
+        prefetcher = InsightResultPrefetcher()
+        with pytest.raises(RuntimeError, match="job failed"):
+            for job in prefetcher.completed_jobs(jobs()):
+                list(prefetcher.get_result(job))
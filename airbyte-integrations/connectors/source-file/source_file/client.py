@@ -4,8 +4,10 @@
 
 
 import json
+import shutil
 import tempfile
 import traceback
+from itertools import islice
 from os import environ
 from typing import Iterable
 from urllib.parse import urlparse
@@ -16,6 +18,8 @@ import botocore
 import google
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import smart_open
 from airbyte_cdk.entrypoint import logger
 from airbyte_cdk.models import AirbyteStream, SyncMode
@@ -230,8 +234,13 @@ class Client:
     """Class that manages reading and parsing data from streams"""
 
     CSV_CHUNK_SIZE = 10_000
+    # discovery infers the schema from this many first rows (or json lines) of a file rather than from the whole file
+    DISCOVERY_SAMPLE_SIZE = 100_000
+    COPY_CHUNK_SIZE = 1024**2
     reader_class = URLFile
     binary_formats = {"excel", "excel_binary", "feather", "parquet", "orc", "pickle"}
+    # these formats are read batch by batch with pyarrow rather than loaded into a single dataframe
+    batch_formats = {"feather", "parquet", "orc"}
 
     def __init__(self, dataset_name: str, url: str, provider: dict, format: str = None, reader_options: dict = None):
         self._dataset_name = dataset_name
@@ -252,7 +261,7 @@ class Client:
         # Use Genson Library to take JSON objects and generate schemas that describe them,
         builder = SchemaBuilder()
         if self._reader_format == "jsonl":
-            for o in self.read():
+            for o in islice(self._iter_jsonl(fp), self.DISCOVERY_SAMPLE_SIZE):
                 builder.add_object(o)
         else:
             builder.add_object(json.load(fp))
@@ -265,23 +274,54 @@ class Client:
         result["$schema"] = "http://json-schema.org/draft-07/schema#"
         return result
 
-    def load_nested_json(self, fp) -> list:
+    @staticmethod
+    def _iter_jsonl(fp) -> Iterable[dict]:
+        for line in fp:
+            yield json.loads(line)
+
+    def load_nested_json(self, fp) -> Iterable[dict]:
         if self._reader_format == "jsonl":
-            result = []
-            line = fp.readline()
-            while line:
-                result.append(json.loads(line))
-                line = fp.readline()
-        else:
-            result = json.load(fp)
-            if not isinstance(result, list):
-                result = [result]
+            # json lines are parsed one by one as they are read, rather than materialized as a list
+            return self._iter_jsonl(fp)
+        result = json.load(fp)
+        if not isinstance(result, list):
+            result = [result]
         return result
 
     def load_yaml(self, fp):
         if self._reader_format == "yaml":
             return pd.DataFrame(safe_load(fp))
 
+    def load_batches(self, fp, columns: list = None) -> Iterable[pd.DataFrame]:
+        """load a parquet, orc or feather file as a sequence of dataframes of up to CSV_CHUNK_SIZE rows,
+        so that only one batch of the file is held in memory at a time.
+
+        :param fp: seekable file-like object to read from
+        :param columns: only read these columns, read all if None
+        :return: a generator of dataframes
+        """
+        if self._reader_format == "parquet":
+            batches = pq.ParquetFile(fp).iter_batches(batch_size=self.CSV_CHUNK_SIZE, columns=columns)
+        elif self._reader_format == "orc":
+            # pyarrow isn't built with ORC support on every platform, hence not imported on top
+            from pyarrow import orc
+
+            orc_file = orc.ORCFile(fp)
+            batches = (orc_file.read_stripe(i, columns=columns) for i in range(orc_file.nstripes))
+        else:
+            try:
+                feather_file = pa.ipc.open_file(fp)
+            except pa.ArrowInvalid:
+                # feather V1 files can't be read in batches
+                fp.seek(0)
+                yield pd.read_feather(fp, columns=columns)
+                return
+            batches = (feather_file.get_batch(i) for i in range(feather_file.num_record_batches))
+            if columns:
+                batches = (batch.select(columns) for batch in batches)
+        for batch in batches:
+            yield batch.to_pandas()
+
     def load_dataframes(self, fp, skip_data=False) -> Iterable:
         """load and return the appropriate pandas dataframe.
 
@@ -320,6 +360,8 @@ class Client:
                     reader_options["nrows"] = 0
                     reader_options["index_col"] = 0
                 yield from reader(fp, **reader_options)
+            elif self._reader_format in self.batch_formats and set(reader_options) <= {"columns"}:
+                yield from self.load_batches(fp, **reader_options)
             elif self._reader_options == "excel_binary":
                 reader_options["engine"] = "pyxlsb"
                 yield from reader(fp, **reader_options)
@@ -369,8 +411,7 @@ class Client:
                     yield from df[columns].to_dict(orient="records")
                 else:
                     fields = set(fields) if fields else None
-                    if self.binary_source:
-                        fp = self._cache_stream(fp)
+                    fp = self._cache_stream_if_needed(fp)
                     for df in self.load_dataframes(fp):
                         columns = fields.intersection(set(df.columns)) if fields else df.columns
                         df.replace({np.nan: None}, inplace=True)
@@ -380,26 +421,37 @@ class Client:
                 raise ConnectionResetError
 
     def _cache_stream(self, fp):
-        """cache stream to file"""
+        """cache stream to file, chunk by chunk so that the file is never held in memory as a whole"""
         fp_tmp = tempfile.TemporaryFile(mode="w+b")
-        fp_tmp.write(fp.read())
+        shutil.copyfileobj(fp, fp_tmp, self.COPY_CHUNK_SIZE)
         fp_tmp.seek(0)
         fp.close()
         return fp_tmp
 
+    def _cache_stream_if_needed(self, fp):
+        """binary formats need random access to the file, remote files are cached locally for these"""
+        if not self.binary_source:
+            return fp
+        if self._provider.get("storage", "").upper() == "LOCAL" and fp.seekable():
+            return fp
+        return self._cache_stream(fp)
+
     def _stream_properties(self, fp):
         if self._reader_format == "yaml":
             df_list = [self.load_yaml(fp)]
         else:
-            if self.binary_source:
-                fp = self._cache_stream(fp)
+            fp = self._cache_stream_if_needed(fp)
             df_list = self.load_dataframes(fp, skip_data=False)
         fields = {}
+        sampled_rows = 0
         for df in df_list:
             for col in df.columns:
                 # if data type of the same column differs in dataframes, we choose the broadest one
                 prev_frame_column_type = fields.get(col)
                 fields[col] = self.dtype_to_json_type(prev_frame_column_type, df[col].dtype)
+            sampled_rows += len(df)
+            if sampled_rows >= self.DISCOVERY_SAMPLE_SIZE:
+                break
         return {field: {"type": [fields[field], "null"]} for field in fields}
 
     @property
@@ -5,6 +5,7 @@
 
 from unittest.mock import patch
 
+import pandas as pd
 import pytest
 from pandas import read_csv, read_excel
 from source_file.client import Client, ConfigurationError, URLFile
@@ -147,3 +148,19 @@ def test_read(test_read_config):
         except ConnectionResetError:
             print("Exception has been raised correctly!")
         mock_method.assert_called()
+
+
+def test_load_batches(tmp_path):
+    df = pd.DataFrame({"id": range(25), "name": [f"name_{i}" for i in range(25)]})
+    df.to_parquet(tmp_path / "test.parquet")
+    client = Client(dataset_name="test_dataset", url=str(tmp_path / "test.parquet"), provider={"storage": "LOCAL"}, format="parquet")
+    client.CSV_CHUNK_SIZE = 10
+
+    with open(tmp_path / "test.parquet", "rb") as fp:
+        batches = list(client.load_dataframes(fp))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert pd.concat(batches, ignore_index=True).equals(df)
+
+    with open(tmp_path / "test.parquet", "rb") as fp:
+        batches = list(client.load_batches(fp, columns=["name"]))
+    assert list(batches[0].columns) == ["name"]
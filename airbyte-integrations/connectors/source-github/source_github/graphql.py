@@ -4,8 +4,11 @@
 
 import heapq
 import itertools
-from typing import Optional
+import logging
+import time
+from typing import Any, List, Mapping, Optional
 
+import pendulum
 import sgqlc.operation
 from sgqlc.operation import Selector
 
@@ -14,6 +17,8 @@ from . import github_schema
 _schema = github_schema
 _schema_root = _schema.github_schema
 
+logger = logging.getLogger("airbyte")
+
 
 def select_user_fields(user):
     user.__fields__(
@@ -27,12 +32,17 @@ def select_user_fields(user):
 
 
 def get_query_pull_requests(owner, name, first, after, direction):
+    op = sgqlc.operation.Operation(_schema_root.query_type)
+    select_pull_requests(op, owner, name, first, after, direction)
+    return str(op)
+
+
+def select_pull_requests(op, owner, name, first, after, direction, alias=None):
     kwargs = {"first": first, "order_by": {"field": "UPDATED_AT", "direction": direction}}
     if after:
         kwargs["after"] = after
 
-    op = sgqlc.operation.Operation(_schema_root.query_type)
-    repository = op.repository(owner=owner, name=name)
+    repository = op.repository(owner=owner, name=name, **_alias_kwargs(alias))
     repository.name()
     repository.owner.login()
     pull_requests = repository.pull_requests(**kwargs)
@@ -58,12 +68,16 @@ def get_query_pull_requests(owner, name, first, after, direction):
     user = pull_requests.nodes.merged_by(__alias__="merged_by").__as__(_schema_root.User)
     select_user_fields(user)
     pull_requests.page_info.__fields__(has_next_page=True, end_cursor=True)
-    return str(op)
 
 
 def get_query_reviews(owner, name, first, after, number=None):
     op = sgqlc.operation.Operation(_schema_root.query_type)
-    repository = op.repository(owner=owner, name=name)
+    select_reviews(op, owner, name, first, after, number)
+    return str(op)
+
+
+def select_reviews(op, owner, name, first, after, number=None, alias=None):
+    repository = op.repository(owner=owner, name=name, **_alias_kwargs(alias))
     repository.name()
     repository.owner.login()
     if number:
@@ -96,7 +110,80 @@ def get_query_reviews(owner, name, first, after, number=None):
     reviews.nodes.commit.oid()
     user = reviews.nodes.author(__alias__="user").__as__(_schema_root.User)
     select_user_fields(user)
-    return str(op)
+
+
+def _alias_kwargs(alias: Optional[str]) -> Mapping[str, Any]:
+    return {"__alias__": alias} if alias else {}
+
+
+class QueryBatch:
+    """
+    Several repository queries sent as one GraphQL operation, each of them selected under its own alias.
+    A batch of a single query isn't aliased, so its response looks exactly like the one of the plain query.
+    The rateLimit field is selected as well, its cost drives QueryCostScheduler.
+    """
+
+    def __init__(self, size: int):
+        self.op = sgqlc.operation.Operation(_schema_root.query_type)
+        self.op.rate_limit.__fields__(cost=True, remaining=True, reset_at=True)
+        self.size = size
+        self.aliases: List[Optional[str]] = []
+
+    def add(self, select, *args, **kwargs) -> str:
+        """Adds the selection made by select(op, *args, alias=..., **kwargs), returns the key of its result in the response data"""
+        alias = f"repository{len(self.aliases)}" if self.size > 1 else None
+        select(self.op, *args, alias=alias, **kwargs)
+        self.aliases.append(alias)
+        return alias or "repository"
+
+    def __len__(self) -> int:
+        return len(self.aliases)
+
+    def __str__(self) -> str:
+        return str(self.op)
+
+
+class QueryCostScheduler:
+    """
+    Sizes batches of GraphQL queries by GitHub resource limitations and the points left for the current rate limit window:
+    https://docs.github.com/en/graphql/overview/resource-limitations
+    A batch never requests more than NODE_LIMIT nodes nor costs more than the points remaining, judging by the cost of the
+    previous batches. Once the points are spent, it waits for the rate limit window to reset instead of hitting the limit.
+    """
+
+    NODE_LIMIT = 500_000
+    # batches taking too long time out on GitHub side
+    MAX_BATCH_SIZE = 10
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE):
+        self.max_batch_size = max_batch_size
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[pendulum.DateTime] = None
+        self.cost_per_query: float = 1.0
+
+    def batch_size(self, nodes_per_query: int) -> int:
+        size = min(self.max_batch_size, self.NODE_LIMIT // max(nodes_per_query, 1))
+        if self.remaining is not None:
+            size = min(size, int(self.remaining // self.cost_per_query))
+        return max(size, 1)
+
+    def wait(self):
+        """Sleeps until the rate limit is reset if the points left don't cover a single query"""
+        if self.remaining is None or self.reset_at is None or self.remaining >= self.cost_per_query:
+            return
+        delay = (self.reset_at - pendulum.now("UTC")).total_seconds()
+        if delay > 0:
+            logger.info(f"GraphQL rate limit points spent, {self.remaining} left, waiting {delay} seconds for the reset")
+            time.sleep(delay)
+        self.remaining = None
+
+    def update(self, rate_limit: Optional[Mapping[str, Any]], queries: int):
+        """Records rateLimit of the response to a batch of queries"""
+        if not rate_limit:
+            return
+        self.cost_per_query = max(rate_limit["cost"] / max(queries, 1), 1.0 / self.max_batch_size)
+        self.remaining = rate_limit["remaining"]
+        self.reset_at = pendulum.parse(rate_limit["resetAt"])
 
 
 class QueryReactions:
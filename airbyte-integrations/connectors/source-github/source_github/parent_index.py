@@ -0,0 +1,113 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import os
+import sqlite3
+import tempfile
+import uuid
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .streams import GithubStream
+
+
+class ParentIndex:
+    """
+    Sync-scoped index of the parent streams records that dependent streams derive their slices from
+    (`PullRequestCommits` from `PullRequests`, the reactions streams from `Comments`, `CommitComments` and `Issues`).
+    Whenever a parent stream reads a slice to the end, the fields the dependent streams use are recorded to a temporary
+    sqlite database. Later reads of the same query in the sync are served from the index instead of crawling the parent again,
+    whichever order the query is sorted in. Slices which weren't read completely (errors, early stop of desc sorted streams)
+    are dropped. The database is created on first use and removed by close(), once the read is over.
+    """
+
+    FIELDS = ("id", "number", "repository")
+    # request parameters which only change the order or paging of records, not which records are read
+    ORDER_PARAMS = ("page", "per_page", "sort", "direction")
+    BATCH_SIZE = 1000
+
+    def __init__(self):
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._directory = tempfile.TemporaryDirectory()
+            self._db = sqlite3.connect(os.path.join(self._directory.name, "parent_index.sqlite"))
+            self._db.execute("CREATE TABLE records (attempt TEXT, record TEXT)")
+            self._db.execute("CREATE INDEX records_attempt ON records (attempt)")
+            self._db.execute("CREATE TABLE slices (key TEXT PRIMARY KEY, attempt TEXT)")
+        return self._db
+
+    def slice_key(self, stream: "GithubStream", stream_slice: Mapping[str, Any], stream_state: Mapping[str, Any] = None) -> str:
+        params = stream.request_params(stream_state=stream_state, stream_slice=stream_slice)
+        params = {name: value for name, value in params.items() if name not in self.ORDER_PARAMS}
+        path = stream.path(stream_slice=stream_slice, stream_state=stream_state)
+        return json.dumps([stream.name, path, params], sort_keys=True, default=str)
+
+    def _project(self, stream: "GithubStream", record: Mapping[str, Any]) -> Mapping[str, Any]:
+        fields = self.FIELDS + ((stream.cursor_field,) if isinstance(stream.cursor_field, str) else ())
+        return {field: record[field] for field in fields if field in record}
+
+    def record(
+        self,
+        stream: "GithubStream",
+        stream_slice: Mapping[str, Any],
+        stream_state: Mapping[str, Any],
+        records: Iterable[Mapping[str, Any]],
+    ) -> Iterator[Mapping[str, Any]]:
+        """Passes records of the slice through, recording them to the index once the slice is read to the end"""
+        key = self.slice_key(stream, stream_slice, stream_state)
+        attempt = uuid.uuid4().hex
+        batch = []
+        completed = False
+        try:
+            for record in records:
+                batch.append((attempt, json.dumps(self._project(stream, record))))
+                if len(batch) >= self.BATCH_SIZE:
+                    self._connection.executemany("INSERT INTO records VALUES (?, ?)", batch)
+                    batch = []
+                yield record
+            self._connection.executemany("INSERT INTO records VALUES (?, ?)", batch)
+            replaced = self._connection.execute("SELECT attempt FROM slices WHERE key = ?", (key,)).fetchone()
+            self._connection.execute("INSERT OR REPLACE INTO slices VALUES (?, ?)", (key, attempt))
+            if replaced:
+                self._connection.execute("DELETE FROM records WHERE attempt = ?", replaced)
+            completed = True
+        finally:
+            if not completed:
+                self._connection.execute("DELETE FROM records WHERE attempt = ?", (attempt,))
+            self._connection.commit()
+
+    def get(
+        self, stream: "GithubStream", stream_slice: Mapping[str, Any], stream_state: Mapping[str, Any] = None
+    ) -> Optional[Iterator[Mapping[str, Any]]]:
+        """Recorded records of the slice, None if the slice wasn't read completely in this sync yet"""
+        row = self._connection.execute(
+            "SELECT attempt FROM slices WHERE key = ?", (self.slice_key(stream, stream_slice, stream_state),)
+        ).fetchone()
+        if row:
+            return self._read(row[0])
+
+    def _read(self, attempt: str) -> Iterator[Mapping[str, Any]]:
+        # rows are fetched in batches, no cursor is kept open while the dependent stream reads its own records
+        rowid = 0
+        while True:
+            rows = self._connection.execute(
+                "SELECT rowid, record FROM records WHERE attempt = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+                (attempt, rowid, self.BATCH_SIZE),
+            ).fetchall()
+            if not rows:
+                return
+            for rowid, record in rows:
+                yield json.loads(record)
+
+    def close(self):
+        if self._db is None:
+            return
+        self._db.close()
+        self._directory.cleanup()
+        self._db = self._directory = None
@@ -3,14 +3,16 @@
 #
 
 
-from typing import Any, Dict, List, Mapping, Tuple
+import logging
+from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Tuple, Union
 
 from airbyte_cdk import AirbyteLogger
-from airbyte_cdk.models import SyncMode
+from airbyte_cdk.models import AirbyteMessage, AirbyteStateMessage, ConfiguredAirbyteCatalog, SyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http.auth import MultipleTokenAuthenticator
 
+from .parent_index import ParentIndex
 from .streams import (
     Assignees,
     Branches,
@@ -173,6 +175,21 @@ class SourceGithub(AbstractSource):
 
             return False, message
 
+    def read(
+        self,
+        logger: logging.Logger,
+        config: Mapping[str, Any],
+        catalog: ConfiguredAirbyteCatalog,
+        state: Union[List[AirbyteStateMessage], MutableMapping[str, Any]] = None,
+    ) -> Iterator[AirbyteMessage]:
+        try:
+            yield from super().read(logger, config, catalog, state)
+        finally:
+            # the parent index only lives as long as the read, its temporary database is removed when the read ends
+            for stream_instance in getattr(self, "_stream_to_instance_map", {}).values():
+                if getattr(stream_instance, "parent_index", None):
+                    stream_instance.parent_index.close()
+
     def streams(self, config: Mapping[str, Any]) -> List[Stream]:
         authenticator = self._get_authenticator(config)
         organizations, repositories = self._get_org_repositories(config=config, authenticator=authenticator)
@@ -184,7 +201,9 @@ class SourceGithub(AbstractSource):
         repository_args_with_start_date = {**repository_args, "start_date": config["start_date"]}
 
         default_branches, branches_to_pull = self._get_branches_data(config.get("branch", ""), repository_args)
-        pull_requests_stream = PullRequests(**repository_args_with_start_date)
+        # parent streams record the records of slices they read completely, so that dependent streams don't crawl them again
+        parent_index_args = {"parent_index": ParentIndex()}
+        pull_requests_stream = PullRequests(**repository_args_with_start_date, **parent_index_args)
         projects_stream = Projects(**repository_args_with_start_date)
         project_columns_stream = ProjectColumns(projects_stream, **repository_args_with_start_date)
         teams_stream = Teams(**organization_args)
@@ -195,18 +214,18 @@ class SourceGithub(AbstractSource):
             Assignees(**repository_args),
             Branches(**repository_args),
             Collaborators(**repository_args),
-            Comments(**repository_args_with_start_date),
-            CommitCommentReactions(**repository_args_with_start_date),
-            CommitComments(**repository_args_with_start_date),
+            Comments(**repository_args_with_start_date, **parent_index_args),
+            CommitCommentReactions(**repository_args_with_start_date, **parent_index_args),
+            CommitComments(**repository_args_with_start_date, **parent_index_args),
             Commits(**repository_args_with_start_date, branches_to_pull=branches_to_pull, default_branches=default_branches),
             Deployments(**repository_args_with_start_date),
             Events(**repository_args_with_start_date),
-            IssueCommentReactions(**repository_args_with_start_date),
+            IssueCommentReactions(**repository_args_with_start_date, **parent_index_args),
             IssueEvents(**repository_args_with_start_date),
             IssueLabels(**repository_args),
             IssueMilestones(**repository_args_with_start_date),
-            IssueReactions(**repository_args_with_start_date),
-            Issues(**repository_args_with_start_date),
+            IssueReactions(**repository_args_with_start_date, **parent_index_args),
+            Issues(**repository_args_with_start_date, **parent_index_args),
             Organizations(**organization_args),
             ProjectCards(project_columns_stream, **repository_args_with_start_date),
             project_columns_stream,
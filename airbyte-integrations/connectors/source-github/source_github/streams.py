@@ -4,7 +4,8 @@
 
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple
 from urllib import parse
 
 import pendulum
@@ -14,7 +15,17 @@ from airbyte_cdk.sources.streams.http import HttpStream
 from airbyte_cdk.sources.streams.http.exceptions import DefaultBackoffException
 from requests.exceptions import HTTPError
 
-from .graphql import CursorStorage, QueryReactions, get_query_pull_requests, get_query_reviews
+from .graphql import (
+    CursorStorage,
+    QueryBatch,
+    QueryCostScheduler,
+    QueryReactions,
+    get_query_pull_requests,
+    get_query_reviews,
+    select_pull_requests,
+    select_reviews,
+)
+from .parent_index import ParentIndex
 from .utils import getter
 
 DEFAULT_PAGE_SIZE = 100
@@ -30,9 +41,12 @@ class GithubStream(HttpStream, ABC):
 
     stream_base_params = {}
 
-    def __init__(self, repositories: List[str], page_size_for_large_streams: int, **kwargs):
+    parent_index: Optional[ParentIndex] = None
+
+    def __init__(self, repositories: List[str], page_size_for_large_streams: int, parent_index: ParentIndex = None, **kwargs):
         super().__init__(**kwargs)
         self.repositories = repositories
+        self.parent_index = parent_index
 
         # GitHub pagination could be from 1 to 100.
         self.page_size = page_size_for_large_streams if self.large_stream else DEFAULT_PAGE_SIZE
@@ -130,7 +144,10 @@ class GithubStream(HttpStream, ABC):
         repository = stream_slice.get("repository", "")
         # Reading records while handling the errors
         try:
-            yield from super().read_records(stream_slice=stream_slice, **kwargs)
+            records = super().read_records(stream_slice=stream_slice, **kwargs)
+            if self.parent_index:
+                records = self.parent_index.record(self, stream_slice, kwargs.get("stream_state"), records)
+            yield from records
         except HTTPError as e:
             # This whole try/except situation in `read_records()` isn't good but right now in `self._send_request()`
             # function we have `response.raise_for_status()` so we don't have much choice on how to handle errors.
@@ -178,6 +195,16 @@ class GithubStream(HttpStream, ABC):
 
             self.logger.warn(error_msg)
 
+    def read_parent_records(self, stream_slice: Mapping[str, Any], stream_state: Mapping[str, Any] = None) -> Iterable[Mapping[str, Any]]:
+        """
+        Reads a slice of this stream for the dependent streams. Slices which were already read completely in the sync
+        are served from the parent index, with only the fields the dependent streams use.
+        """
+        records = self.parent_index and self.parent_index.get(self, stream_slice, stream_state)
+        if records is None:
+            records = self.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice, stream_state=stream_state)
+        return records
+
     def request_params(
         self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
     ) -> MutableMapping[str, Any]:
@@ -296,6 +323,13 @@ class SemiIncrementalMixin:
             elif self.is_sorted == "desc" and cursor_value < start_point:
                 break
 
+    def read_parent_records(self, stream_slice: Mapping[str, Any], stream_state: Mapping[str, Any] = None) -> Iterable[Mapping[str, Any]]:
+        # records served from the parent index weren't filtered by the starting point yet
+        start_point = self.get_starting_point(stream_state=stream_state, stream_slice=stream_slice)
+        for record in super().read_parent_records(stream_slice=stream_slice, stream_state=stream_state):
+            if self.convert_cursor_value(record[self.cursor_field]) > start_point:
+                yield record
+
     def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
         self._starting_point_cache.clear()
         yield from super().stream_slices(**kwargs)
@@ -721,7 +755,169 @@ class ReviewComments(IncrementalMixin, GithubStream):
         return f"repos/{stream_slice['repository']}/pulls/comments"
 
 
-class PullRequestStats(SemiIncrementalMixin, GithubStream):
+class GraphQLBatchMixin:
+    """
+    Reads the repositories of several slices with one GraphQL query, each repository selected under its own alias, instead of
+    sending a query per repository page. While the repository of the current slice is read, the next repositories in
+    stream_slices order are read ahead in the same batches, their records are buffered until their slice is read.
+    Read ahead is bounded: up to max_pages_ahead pages of a repository, and none while max_buffered_records records are buffered.
+    Batches are sized by QueryCostScheduler according to the node limit and the rate limit points left.
+    """
+
+    max_pages_ahead = 2
+    max_buffered_records = 10_000
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.query_scheduler = QueryCostScheduler()
+        self._repositories_ahead: Deque[str] = deque()
+        # next page tokens of repositories read ahead but not finished, None for the first page
+        self._pending_pages: Dict[str, Optional[Mapping[str, Any]]] = {}
+        self._pages_ahead: Dict[str, int] = {}
+        self._buffered_records: Dict[str, List[Mapping[str, Any]]] = {}
+        self._buffered_records_count = 0
+
+    @abstractmethod
+    def select_repository(self, op, owner: str, name: str, next_page_token: Optional[Mapping[str, Any]], alias: Optional[str]):
+        """Selects the page of the repository on the GraphQL operation"""
+
+    @abstractmethod
+    def query_nodes(self, next_page_token: Optional[Mapping[str, Any]]) -> int:
+        """Max number of nodes a page query of a repository may return"""
+
+    @abstractmethod
+    def parse_repository(self, repository: Mapping[str, Any]) -> Iterable[Mapping]:
+        """Records of a repository page"""
+
+    @abstractmethod
+    def repository_next_page_token(self, repository: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+        """Token of the next page of a repository"""
+
+    def reset_repository(self, repository: str):
+        """Drops the paging state kept for the repository, it is read from its first page again"""
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        self.raise_error_from_response(response_json=response.json())
+        repository = response.json()["data"]["repository"]
+        if repository:
+            yield from self.parse_repository(repository)
+
+    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
+        repository = response.json()["data"]["repository"]
+        if repository:
+            return self.repository_next_page_token(repository)
+
+    def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        self._repositories_ahead = deque(self.repositories)
+        self._pending_pages.clear()
+        self._pages_ahead.clear()
+        self._buffered_records.clear()
+        self._buffered_records_count = 0
+        yield from super().stream_slices(**kwargs)
+
+    def _read_pages(
+        self,
+        records_generator_fn: Callable[[requests.PreparedRequest, requests.Response, Mapping[str, Any], Mapping[str, Any]], Iterable],
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Iterable[Mapping]:
+        repository = stream_slice["repository"]
+        if repository in self._repositories_ahead:
+            self._repositories_ahead.remove(repository)
+        finished = repository in self._buffered_records and repository not in self._pending_pages
+        next_page_token = self._pending_pages.pop(repository, None)
+        self._pages_ahead.pop(repository, None)
+        buffered_records = self._buffered_records.pop(repository, [])
+        self._buffered_records_count -= len(buffered_records)
+        yield from buffered_records
+        if finished:
+            return
+
+        while True:
+            self._read_ahead()
+            queries = [(repository, next_page_token), *self._queries_ahead()]
+            queries = queries[: self.query_scheduler.batch_size(max(self.query_nodes(token) for _, token in queries))]
+            batch = QueryBatch(size=len(queries))
+            keys = [batch.add(self.select_repository, *name.split("/"), token) for name, token in queries]
+
+            self.query_scheduler.wait()
+            response_json = self._send_batch(batch, stream_slice=stream_slice, stream_state=stream_state).json()
+            failed = self._handle_errors(response_json, repository, repositories={key: name for (name, _), key in zip(queries, keys)})
+            self.query_scheduler.update(response_json["data"].get("rateLimit"), queries=len(batch))
+
+            for (name, _), key in zip(queries, keys):
+                if name in failed:
+                    continue
+                data = response_json["data"][key]
+                records = list(self.parse_repository(data)) if data else []
+                token = self.repository_next_page_token(data) if data else None
+                if name == repository:
+                    yield from records
+                    next_page_token = token
+                    continue
+                self._buffered_records.setdefault(name, []).extend(records)
+                self._buffered_records_count += len(records)
+                self._pages_ahead[name] = self._pages_ahead.get(name, 0) + 1
+                if token:
+                    self._pending_pages[name] = token
+                else:
+                    self._pending_pages.pop(name, None)
+
+            if not next_page_token:
+                return
+
+    def _queries_ahead(self) -> List[Tuple[str, Optional[Mapping[str, Any]]]]:
+        """Next pages of the repositories read ahead, as long as the buffer and the pages read ahead of each repository allow"""
+        if self._buffered_records_count >= self.max_buffered_records:
+            return []
+        return [(name, token) for name, token in self._pending_pages.items() if self._pages_ahead.get(name, 0) < self.max_pages_ahead]
+
+    def _handle_errors(self, response_json: Mapping[str, Any], repository: str, repositories: Mapping[str, str]) -> Set[str]:
+        """
+        Attributes GraphQL errors to the repositories by the alias in their path. Errors of the repository being read, or of no
+        repository in particular, are raised. A repository read ahead with errors is dropped from read ahead and is read again
+        once its own slice is read, its errors are raised then. Returns the repositories read ahead which were dropped.
+        """
+        errors_by_repository: Dict[str, List[Mapping[str, Any]]] = {}
+        for error in response_json.get("errors", []):
+            path = error.get("path") or [None]
+            errors_by_repository.setdefault(repositories.get(path[0], repository), []).append(error)
+        if repository in errors_by_repository:
+            self.raise_error_from_response(response_json={"errors": errors_by_repository.pop(repository)})
+
+        for name, errors in errors_by_repository.items():
+            self.logger.warning(f"Syncing `{self.name}` stream, repository `{name}` read ahead failed, it is read with its slice: {errors}")
+            self._pending_pages.pop(name, None)
+            self._pages_ahead.pop(name, None)
+            self._buffered_records_count -= len(self._buffered_records.pop(name, []))
+            self.reset_repository(name)
+        return set(errors_by_repository)
+
+    def _read_ahead(self):
+        """Starts the next repositories while less than a batch of them is read ahead"""
+        read_ahead = set(self._pending_pages) | set(self._buffered_records)
+        while (
+            self._repositories_ahead
+            and len(read_ahead) < self.query_scheduler.max_batch_size - 1
+            and self._buffered_records_count < self.max_buffered_records
+        ):
+            repository = self._repositories_ahead.popleft()
+            self._pending_pages[repository] = None
+            read_ahead.add(repository)
+
+    def _send_batch(self, batch: QueryBatch, stream_slice: Mapping[str, Any], stream_state: Mapping[str, Any]) -> requests.Response:
+        request_headers = self.request_headers(stream_state=stream_state, stream_slice=stream_slice)
+        request = self._create_prepared_request(
+            path=self.path(stream_state=stream_state, stream_slice=stream_slice),
+            headers=dict(request_headers, **self.authenticator.get_auth_header()),
+            params=self.request_params(stream_state=stream_state, stream_slice=stream_slice),
+            json={"query": str(batch)},
+        )
+        request_kwargs = self.request_kwargs(stream_state=stream_state, stream_slice=stream_slice)
+        return self._send_request(request, request_kwargs)
+
+
+class PullRequestStats(SemiIncrementalMixin, GraphQLBatchMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/graphql/reference/objects#pullrequest
     """
@@ -741,26 +937,29 @@ class PullRequestStats(SemiIncrementalMixin, GithubStream):
     def _get_name(self, repository):
         return repository["owner"]["login"] + "/" + repository["name"]
 
-    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
-        self.raise_error_from_response(response_json=response.json())
-        repository = response.json()["data"]["repository"]
-        if repository:
-            nodes = repository["pullRequests"]["nodes"]
-            for record in nodes:
-                record["review_comments"] = sum([node["comments"]["totalCount"] for node in record["review_comments"]["nodes"]])
-                record["comments"] = record["comments"]["totalCount"]
-                record["commits"] = record["commits"]["totalCount"]
-                record["repository"] = self._get_name(repository)
-                if record["merged_by"]:
-                    record["merged_by"]["type"] = record["merged_by"].pop("__typename")
-                yield record
+    def parse_repository(self, repository: Mapping[str, Any]) -> Iterable[Mapping]:
+        nodes = repository["pullRequests"]["nodes"]
+        for record in nodes:
+            record["review_comments"] = sum([node["comments"]["totalCount"] for node in record["review_comments"]["nodes"]])
+            record["comments"] = record["comments"]["totalCount"]
+            record["commits"] = record["commits"]["totalCount"]
+            record["repository"] = self._get_name(repository)
+            if record["merged_by"]:
+                record["merged_by"]["type"] = record["merged_by"].pop("__typename")
+            yield record
 
-    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
-        repository = response.json()["data"]["repository"]
-        if repository:
-            pageInfo = repository["pullRequests"]["pageInfo"]
-            if pageInfo["hasNextPage"]:
-                return {"after": pageInfo["endCursor"]}
+    def repository_next_page_token(self, repository: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+        pageInfo = repository["pullRequests"]["pageInfo"]
+        if pageInfo["hasNextPage"]:
+            return {"after": pageInfo["endCursor"]}
+
+    def select_repository(self, op, owner: str, name: str, next_page_token: Optional[Mapping[str, Any]], alias: Optional[str]):
+        after = next_page_token["after"] if next_page_token else None
+        select_pull_requests(op, owner, name, first=self.page_size, after=after, direction=self.is_sorted.upper(), alias=alias)
+
+    def query_nodes(self, next_page_token: Optional[Mapping[str, Any]]) -> int:
+        # pull requests and up to 100 reviews of each
+        return self.page_size * (1 + 100)
 
     def request_params(
         self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
@@ -788,7 +987,7 @@ class PullRequestStats(SemiIncrementalMixin, GithubStream):
         return {**base_headers, **headers}
 
 
-class Reviews(SemiIncrementalMixin, GithubStream):
+class Reviews(SemiIncrementalMixin, GraphQLBatchMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/graphql/reference/objects#pullrequestreview
     """
@@ -835,38 +1034,47 @@ class Reviews(SemiIncrementalMixin, GithubStream):
     def _get_name(self, repository):
         return repository["owner"]["login"] + "/" + repository["name"]
 
-    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
-        self.raise_error_from_response(response_json=response.json())
-        repository = response.json()["data"]["repository"]
-        if repository:
-            repository_name = self._get_name(repository)
-            if "pullRequests" in repository:
-                for pull_request in repository["pullRequests"]["nodes"]:
-                    yield from self._get_records(pull_request, repository_name)
-            elif "pullRequest" in repository:
-                yield from self._get_records(repository["pullRequest"], repository_name)
-
-    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
-        repository = response.json()["data"]["repository"]
-        if repository:
-            repository_name = self._get_name(repository)
-            reviews_cursors = self.reviews_cursors.setdefault(repository_name, {})
-            if "pullRequests" in repository:
-                if repository["pullRequests"]["pageInfo"]["hasNextPage"]:
-                    self.pull_requests_cursor[repository_name] = repository["pullRequests"]["pageInfo"]["endCursor"]
-                for pull_request in repository["pullRequests"]["nodes"]:
-                    if pull_request["reviews"]["pageInfo"]["hasNextPage"]:
-                        pull_request_number = pull_request["number"]
-                        reviews_cursors[pull_request_number] = pull_request["reviews"]["pageInfo"]["endCursor"]
-            elif "pullRequest" in repository:
-                if repository["pullRequest"]["reviews"]["pageInfo"]["hasNextPage"]:
-                    pull_request_number = repository["pullRequest"]["number"]
-                    reviews_cursors[pull_request_number] = repository["pullRequest"]["reviews"]["pageInfo"]["endCursor"]
-            if reviews_cursors:
-                number, after = reviews_cursors.popitem()
-                return {"after": after, "number": number}
-            if repository_name in self.pull_requests_cursor:
-                return {"after": self.pull_requests_cursor.pop(repository_name)}
+    def parse_repository(self, repository: Mapping[str, Any]) -> Iterable[Mapping]:
+        repository_name = self._get_name(repository)
+        if "pullRequests" in repository:
+            for pull_request in repository["pullRequests"]["nodes"]:
+                yield from self._get_records(pull_request, repository_name)
+        elif "pullRequest" in repository:
+            yield from self._get_records(repository["pullRequest"], repository_name)
+
+    def repository_next_page_token(self, repository: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+        repository_name = self._get_name(repository)
+        reviews_cursors = self.reviews_cursors.setdefault(repository_name, {})
+        if "pullRequests" in repository:
+            if repository["pullRequests"]["pageInfo"]["hasNextPage"]:
+                self.pull_requests_cursor[repository_name] = repository["pullRequests"]["pageInfo"]["endCursor"]
+            for pull_request in repository["pullRequests"]["nodes"]:
+                if pull_request["reviews"]["pageInfo"]["hasNextPage"]:
+                    pull_request_number = pull_request["number"]
+                    reviews_cursors[pull_request_number] = pull_request["reviews"]["pageInfo"]["endCursor"]
+        elif "pullRequest" in repository:
+            if repository["pullRequest"]["reviews"]["pageInfo"]["hasNextPage"]:
+                pull_request_number = repository["pullRequest"]["number"]
+                reviews_cursors[pull_request_number] = repository["pullRequest"]["reviews"]["pageInfo"]["endCursor"]
+        if reviews_cursors:
+            number, after = reviews_cursors.popitem()
+            return {"after": after, "number": number}
+        if repository_name in self.pull_requests_cursor:
+            return {"after": self.pull_requests_cursor.pop(repository_name)}
+
+    def reset_repository(self, repository: str):
+        self.reviews_cursors.pop(repository, None)
+        self.pull_requests_cursor.pop(repository, None)
+
+    def select_repository(self, op, owner: str, name: str, next_page_token: Optional[Mapping[str, Any]], alias: Optional[str]):
+        next_page_token = next_page_token or {"after": None}
+        select_reviews(op, owner, name, first=self.page_size, alias=alias, **next_page_token)
+
+    def query_nodes(self, next_page_token: Optional[Mapping[str, Any]]) -> int:
+        if next_page_token and next_page_token.get("number"):
+            # reviews of a single pull request
+            return self.page_size
+        return self.page_size * (1 + self.page_size)
 
     def request_body_json(
         self,
@@ -902,9 +1110,7 @@ class PullRequestCommits(GithubStream):
             sync_mode=SyncMode.full_refresh, cursor_field=cursor_field, stream_state=stream_state
         )
         for stream_slice in parent_stream_slices:
-            parent_records = self.parent.read_records(
-                sync_mode=SyncMode.full_refresh, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state
-            )
+            parent_records = self.parent.read_parent_records(stream_slice=stream_slice, stream_state=stream_state)
             for record in parent_records:
                 yield {"repository": record["repository"], "pull_number": record["number"]}
 
@@ -923,10 +1129,11 @@ class ReactionStream(GithubStream, ABC):
     copy_parent_key = "comment_id"
     cursor_field = "created_at"
 
-    def __init__(self, start_date: str = "", **kwargs):
+    def __init__(self, start_date: str = "", parent_index: ParentIndex = None, **kwargs):
         super().__init__(**kwargs)
         kwargs["start_date"] = start_date
-        self._parent_stream = self.parent_entity(**kwargs)
+        # only the parent stream reads are indexed, reactions aren't a parent of any stream
+        self._parent_stream = self.parent_entity(parent_index=parent_index, **kwargs)
         self._start_date = start_date
 
     @property
@@ -942,7 +1149,7 @@ class ReactionStream(GithubStream, ABC):
 
     def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
         for stream_slice in super().stream_slices(**kwargs):
-            for parent_record in self._parent_stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice):
+            for parent_record in self._parent_stream.read_parent_records(stream_slice=stream_slice):
                 yield {self.copy_parent_key: parent_record[self.parent_key], "repository": stream_slice["repository"]}
 
     def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]):
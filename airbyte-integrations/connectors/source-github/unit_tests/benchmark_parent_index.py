@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Benchmark of the parent index over an org fixture shaped like the GitHub API responses (parent_index_org.json).
+Syncs the parent streams and their dependent streams in the order of `SourceGithub.streams`, with and without the index,
+and reports the requests sent to the API, the parent pages parsed (pages served by the requests cache included) and the time taken.
+
+    python -m unit_tests.benchmark_parent_index
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+from urllib import parse
+
+import responses
+from airbyte_cdk.models import SyncMode
+from source_github.parent_index import ParentIndex
+from source_github.streams import (
+    Comments,
+    CommitCommentReactions,
+    CommitComments,
+    GithubStream,
+    IssueCommentReactions,
+    IssueReactions,
+    Issues,
+    PullRequestCommits,
+    PullRequests,
+)
+
+FIXTURE = Path(__file__).parent / "parent_index_org.json"
+START_DATE = "2021-01-01T00:00:00Z"
+PARENT_PATHS = ("pulls", "issues/comments", "comments", "issues")
+
+
+def add_responses(mock: responses.RequestsMock, org, api_calls: Counter):
+    def paginated(repository, path):
+        def callback(request):
+            query = dict(parse.parse_qsl(parse.urlparse(request.url).query))
+            page, per_page = int(query.get("page", 1)), int(query["per_page"])
+            records = org[repository][path]
+            if query.get("direction") == "desc":
+                records = records[::-1]
+            api_calls[path] += 1
+            headers = {}
+            if page * per_page < len(records):
+                headers["Link"] = f'<{request.url.split("?")[0]}?per_page={per_page}&page={page + 1}>; rel="next"'
+            return 200, headers, json.dumps(records[(page - 1) * per_page : page * per_page])
+
+        return callback
+
+    for repository in org:
+        for path in PARENT_PATHS:
+            url = f"https://api.github.com/repos/{repository}/{path}"
+            mock.add_callback("GET", re.compile(re.escape(url) + r"(\?.*)?$"), callback=paginated(repository, path))
+    for path in ("pulls/\\d+/commits", "comments/\\d+/reactions", "issues/comments/\\d+/reactions", "issues/\\d+/reactions"):
+        mock.add("GET", re.compile(rf"https://api.github.com/repos/[^/]+/[^/]+/{path}(\?.*)?$"), json=[])
+
+
+def build_streams(org, parent_index: ParentIndex = None):
+    repository_args = {"repositories": list(org), "page_size_for_large_streams": 100}
+    repository_args_with_start_date = {**repository_args, "start_date": START_DATE}
+    parent_index_args = {"parent_index": parent_index} if parent_index else {}
+    pull_requests_stream = PullRequests(**repository_args_with_start_date, **parent_index_args)
+    return [
+        Comments(**repository_args_with_start_date, **parent_index_args),
+        CommitCommentReactions(**repository_args_with_start_date, **parent_index_args),
+        CommitComments(**repository_args_with_start_date, **parent_index_args),
+        IssueCommentReactions(**repository_args_with_start_date, **parent_index_args),
+        IssueReactions(**repository_args_with_start_date, **parent_index_args),
+        Issues(**repository_args_with_start_date, **parent_index_args),
+        PullRequestCommits(parent=pull_requests_stream, **repository_args),
+        pull_requests_stream,
+    ]
+
+
+def sync(streams):
+    for stream in streams:
+        for stream_slice in stream.stream_slices(sync_mode=SyncMode.incremental, stream_state={}):
+            for _ in stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice, stream_state={}):
+                pass
+
+
+def run(org, with_index: bool):
+    api_calls, parsed_pages = Counter(), Counter()
+    parse_response = GithubStream.parse_response
+
+    def counting_parse_response(stream, response, **kwargs):
+        parsed_pages[stream.name] += 1
+        return parse_response(stream, response, **kwargs)
+
+    parent_index = ParentIndex() if with_index else None
+    working_directory = os.getcwd()
+    # every run starts with empty requests caches, those are created in the working directory
+    with tempfile.TemporaryDirectory() as cache_directory, responses.RequestsMock() as mock, patch.object(
+        GithubStream, "parse_response", counting_parse_response
+    ):
+        os.chdir(cache_directory)
+        add_responses(mock, org, api_calls)
+        started = time.perf_counter()
+        sync(build_streams(org, parent_index))
+        elapsed = time.perf_counter() - started
+        os.chdir(working_directory)
+    if parent_index:
+        parent_index.close()
+    parents = {"pull_requests", "comments", "commit_comments", "issues"}
+    return sum(api_calls.values()), sum(count for name, count in parsed_pages.items() if name in parents), elapsed
+
+
+def main():
+    org = json.loads(FIXTURE.read_text())
+    for with_index in (False, True):
+        api_calls, parent_pages, elapsed = run(org, with_index)
+        label = "with parent index" if with_index else "without parent index"
+        print(f"{label:>22}: {api_calls} parent API requests, {parent_pages} parent pages parsed, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
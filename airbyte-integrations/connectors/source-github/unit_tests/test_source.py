@@ -2,7 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 import responses
@@ -127,3 +127,16 @@ def test_get_org_repositories():
 
     assert set(repositories) == {"airbytehq/integration-test", "docker/docker-py", "docker/compose"}
     assert set(organisations) == {"airbytehq", "docker"}
+
+
+def test_read_closes_parent_index():
+    source = SourceGithub()
+    parent_index = MagicMock()
+
+    def read(*args, **kwargs):
+        source._stream_to_instance_map = {"pull_requests": MagicMock(parent_index=parent_index), "users": MagicMock(parent_index=None)}
+        yield from []
+
+    with patch("airbyte_cdk.sources.abstract_source.AbstractSource.read", side_effect=read):
+        assert list(source.read(MagicMock(), {}, MagicMock())) == []
+    parent_index.close.assert_called_once()
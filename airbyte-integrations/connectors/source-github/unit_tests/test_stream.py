@@ -7,12 +7,15 @@ from http import HTTPStatus
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pendulum
 import pytest
 import requests
 import responses
 from airbyte_cdk.sources.streams.http.exceptions import BaseBackoffException
 from responses import matchers
 from source_github import streams
+from source_github.graphql import QueryCostScheduler
+from source_github.parent_index import ParentIndex
 from source_github.streams import (
     Branches,
     Collaborators,
@@ -1262,3 +1265,198 @@ def test_stream_pull_request_comment_reactions_read():
     ]
 
     assert stream_state == {"airbytehq/airbyte": {"created_at": "2022-01-02T00:00:01Z"}}
+
+
+def pull_request_stats_page(owner, name, numbers, end_cursor=None):
+    return {
+        "owner": {"login": owner},
+        "name": name,
+        "pullRequests": {
+            "nodes": [
+                {
+                    "id": number,
+                    "number": number,
+                    "updated_at": "2022-01-01T00:00:00Z",
+                    "review_comments": {"nodes": [{"comments": {"totalCount": 1}}]},
+                    "comments": {"totalCount": 2},
+                    "commits": {"totalCount": 3},
+                    "merged_by": None,
+                }
+                for number in numbers
+            ],
+            "pageInfo": {"hasNextPage": bool(end_cursor), "endCursor": end_cursor},
+        },
+    }
+
+
+@responses.activate
+def test_stream_pull_request_stats_batches_repositories():
+    stream = PullRequestStats(repositories=["org/repo1", "org/repo2", "org/repo3"], page_size_for_large_streams=30)
+    rate_limit = {"cost": 3, "remaining": 4000, "resetAt": "2022-01-01T01:00:00Z"}
+    response_objects = [
+        {
+            "data": {
+                "rateLimit": rate_limit,
+                "repository0": pull_request_stats_page("org", "repo1", [1, 2], end_cursor="cursor"),
+                "repository1": pull_request_stats_page("org", "repo2", [3]),
+                "repository2": pull_request_stats_page("org", "repo3", [4], end_cursor="cursor"),
+            }
+        },
+        {
+            "data": {
+                "rateLimit": rate_limit,
+                "repository0": pull_request_stats_page("org", "repo1", [5]),
+                "repository1": pull_request_stats_page("org", "repo3", [6]),
+            }
+        },
+    ]
+    queries = []
+
+    def request_callback(request):
+        queries.append(json.loads(request.body)["query"])
+        return (HTTPStatus.OK, {}, json.dumps(response_objects.pop(0)))
+
+    responses.add_callback(responses.POST, "https://api.github.com/graphql", callback=request_callback, content_type="application/json")
+
+    records = read_incremental(stream, {})
+
+    assert [(r["repository"], r["id"]) for r in records] == [
+        ("org/repo1", 1),
+        ("org/repo1", 2),
+        ("org/repo1", 5),
+        ("org/repo2", 3),
+        ("org/repo3", 4),
+        ("org/repo3", 6),
+    ]
+    assert len(responses.calls) == 2
+    assert 'repository0: repository(owner: "org", name: "repo1")' in queries[0]
+    assert 'repository2: repository(owner: "org", name: "repo3")' in queries[0]
+    assert 'after: "cursor"' in queries[1]
+    assert stream.query_scheduler.remaining == 4000
+    assert stream.query_scheduler.cost_per_query == 1.5
+
+
+@patch("time.sleep")
+def test_query_cost_scheduler(sleep_mock):
+    scheduler = QueryCostScheduler(max_batch_size=10)
+    assert scheduler.batch_size(nodes_per_query=100) == 10
+    # GitHub doesn't allow more than 500,000 nodes per query
+    assert scheduler.batch_size(nodes_per_query=100 * 101 * 10) == 4
+
+    scheduler.update({"cost": 10, "remaining": 25, "resetAt": "2022-01-01T01:00:00Z"}, queries=5)
+    assert scheduler.batch_size(nodes_per_query=100) == 10
+    scheduler.update({"cost": 10, "remaining": 6, "resetAt": "2022-01-01T01:00:00Z"}, queries=5)
+    assert scheduler.batch_size(nodes_per_query=100) == 3
+
+    with patch("pendulum.now", return_value=pendulum.parse("2022-01-01T00:59:00Z")):
+        scheduler.wait()
+        sleep_mock.assert_not_called()
+        scheduler.update({"cost": 10, "remaining": 1, "resetAt": "2022-01-01T01:00:00Z"}, queries=5)
+        scheduler.wait()
+    sleep_mock.assert_called_once_with(60.0)
+
+
+@responses.activate
+def test_stream_pull_request_commits_reads_parent_from_index():
+    repository_args = {"repositories": ["organization/indexed-repository"], "page_size_for_large_streams": 100}
+    repository_args_with_start_date = {**repository_args, "start_date": "2022-02-02T10:10:02Z"}
+    parent = PullRequests(**repository_args_with_start_date, parent_index=ParentIndex())
+    stream = PullRequestCommits(parent, **repository_args)
+
+    responses.add(
+        "GET",
+        "https://api.github.com/repos/organization/indexed-repository/pulls",
+        json=[
+            {"id": 1, "updated_at": "2022-02-02T10:10:02Z", "number": 1},
+            {"id": 2, "updated_at": "2022-02-02T10:10:04Z", "number": 2},
+        ],
+    )
+    responses.add("GET", "https://api.github.com/repos/organization/indexed-repository/pulls/2/commits", json=[{"sha": 1}])
+
+    assert [record["id"] for record in read_full_refresh(parent)] == [2]
+
+    with patch.object(PullRequests, "read_records", side_effect=AssertionError("the parent is crawled again")):
+        records = list(read_full_refresh(stream))
+    assert records == [{"sha": 1, "repository": "organization/indexed-repository", "pull_number": 2}]
+
+
+def test_parent_index_drops_incomplete_slices():
+    repository_args = {"repositories": ["organization/repository"], "page_size_for_large_streams": 100, "start_date": ""}
+    parent_index = ParentIndex()
+    stream = Comments(**repository_args)
+    stream_slice = {"repository": "organization/repository"}
+    records = [{"id": 1, "updated_at": "2022-02-02T10:10:02Z", "body": "comment"}, {"id": 2, "updated_at": "2022-02-02T10:10:04Z"}]
+
+    partial_read = parent_index.record(stream, stream_slice, None, iter(records))
+    next(partial_read)
+    partial_read.close()
+    assert parent_index.get(stream, stream_slice) is None
+
+    assert list(parent_index.record(stream, stream_slice, None, iter(records))) == records
+    assert list(parent_index.get(stream, stream_slice)) == [
+        {"id": 1, "updated_at": "2022-02-02T10:10:02Z"},
+        {"id": 2, "updated_at": "2022-02-02T10:10:04Z"},
+    ]
+    # the starting point is part of the query, records since another date aren't served
+    stream_state = {"organization/repository": {"updated_at": "2022-02-02T10:10:03Z"}}
+    assert parent_index.get(Comments(**repository_args), stream_slice, stream_state) is None
+    parent_index.close()
+
+
+@responses.activate
+def test_stream_pull_request_stats_read_ahead_bounded():
+    stream = PullRequestStats(repositories=["org/repo1", "org/repo2"], page_size_for_large_streams=30)
+    stream.max_pages_ahead = 1
+    response_objects = [
+        {
+            "data": {
+                "repository0": pull_request_stats_page("org", "repo1", [1], end_cursor="cursor1"),
+                "repository1": pull_request_stats_page("org", "repo2", [2], end_cursor="cursor2"),
+            }
+        },
+        # repo2 already has a page read ahead, only repo1 is queried
+        {"data": {"repository": pull_request_stats_page("org", "repo1", [3])}},
+        {"data": {"repository": pull_request_stats_page("org", "repo2", [4])}},
+    ]
+    queries = []
+
+    def request_callback(request):
+        queries.append(json.loads(request.body)["query"])
+        return (HTTPStatus.OK, {}, json.dumps(response_objects.pop(0)))
+
+    responses.add_callback(responses.POST, "https://api.github.com/graphql", callback=request_callback, content_type="application/json")
+
+    records = read_incremental(stream, {})
+
+    assert [(r["repository"], r["id"]) for r in records] == [("org/repo1", 1), ("org/repo1", 3), ("org/repo2", 2), ("org/repo2", 4)]
+    assert 'name: "repo2"' not in queries[1]
+    assert 'after: "cursor2"' in queries[2]
+    assert stream._buffered_records_count == 0
+
+
+@responses.activate
+def test_stream_pull_request_stats_read_ahead_errors():
+    stream = PullRequestStats(repositories=["org/repo1", "org/repo2"], page_size_for_large_streams=30)
+    response_objects = [
+        {
+            "data": {"repository0": pull_request_stats_page("org", "repo1", [1]), "repository1": None},
+            "errors": [{"type": "NOT_FOUND", "path": ["repository1"], "message": "Could not resolve to a Repository"}],
+        },
+        {
+            "data": {"repository": None},
+            "errors": [{"type": "NOT_FOUND", "path": ["repository"], "message": "Could not resolve to a Repository"}],
+        },
+    ]
+
+    def request_callback(request):
+        return (HTTPStatus.OK, {}, json.dumps(response_objects.pop(0)))
+
+    responses.add_callback(responses.POST, "https://api.github.com/graphql", callback=request_callback, content_type="application/json")
+
+    stream_slices = list(stream.stream_slices(sync_mode="incremental", stream_state={}))
+    # the error of the repository read ahead doesn't fail the slice being read
+    assert [r["id"] for r in stream.read_records(sync_mode="incremental", stream_slice=stream_slices[0], stream_state={})] == [1]
+    # it is raised once the slice of its repository is read
+    with pytest.raises(Exception, match="Could not resolve to a Repository"):
+        list(stream.read_records(sync_mode="incremental", stream_slice=stream_slices[1], stream_state={}))
+    assert len(responses.calls) == 2
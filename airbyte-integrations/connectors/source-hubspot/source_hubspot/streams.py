@@ -3,12 +3,16 @@
 #
 
 import json
+import re
 import sys
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from functools import cached_property, lru_cache
 from http import HTTPStatus
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
 
 import backoff
 import pendulum as pendulum
@@ -54,6 +58,9 @@ CUSTOM_FIELD_TYPE_TO_VALUE = {
 
 CUSTOM_FIELD_VALUE_TO_TYPE = {v: k for k, v in CUSTOM_FIELD_TYPE_TO_VALUE.items()}
 
+# date/date-time strings as HubSpot sends them, parsed without pendulum
+FIXED_DATETIME_FORMAT = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}:\d{2}(?:\.\d{3}|\.\d{6})?(?:Z|[+-]\d{2}:\d{2})?)?")
+
 
 def retry_connection_handler(**kwargs):
     """Retry helper, log each attempt"""
@@ -103,11 +110,38 @@ def retry_after_handler(fixed_retry_after=None, **kwargs):
     )
 
 
+class RateLimiter:
+    """
+    Spaces out requests sharing one HubSpot rate limit budget, safe to use from several threads.
+    Requests over the budget wait for their turn, a 429 response pauses every request sharing the limiter.
+    """
+
+    def __init__(self, max_calls: int, period: float):
+        self._interval = period / max_calls
+        self._next_call = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + self._interval
+        if call_at > now:
+            time.sleep(call_at - now)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._next_call = max(self._next_call, time.monotonic() + seconds)
+
+
 class API:
     """HubSpot API interface, authorize, retrieve and post, supports backoff logic"""
 
     BASE_URL = "https://api.hubapi.com"
     USER_AGENT = "Airbyte"
+    # the lowest burst limit of HubSpot apps: 100 requests per 10 seconds, see https://developers.hubspot.com/docs/api/usage-details
+    RATE_LIMIT_CALLS = 100
+    RATE_LIMIT_PERIOD = 10
 
     def is_oauth2(self) -> bool:
         credentials_title = self.credentials.get("credentials_title")
@@ -135,6 +169,8 @@ class API:
     def __init__(self, credentials: Mapping[str, Any]):
         self._session = requests.Session()
         self.credentials = credentials
+        # shared by the requests streams send concurrently
+        self.rate_limiter = RateLimiter(max_calls=self.RATE_LIMIT_CALLS, period=self.RATE_LIMIT_PERIOD)
         credentials_title = credentials.get("credentials_title")
 
         if self.is_oauth2() or self.is_private_app():
@@ -484,28 +520,112 @@ class Stream(HttpStream, ABC):
 
         return casted_value
 
+    @staticmethod
+    def _parse_fixed_format_datetime(field_value: Any) -> Optional[datetime]:
+        """
+        Parses ISO 8601 strings and millisecond timestamps the way `_cast_datetime` does, returns None for any other value.
+        """
+        try:
+            if type(field_value) is str:
+                if FIXED_DATETIME_FORMAT.fullmatch(field_value):
+                    if field_value.endswith("Z"):
+                        field_value = field_value[:-1] + "+00:00"
+                    dt = datetime.fromisoformat(field_value)
+                    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+                if len(field_value) == 13 and field_value.isascii() and field_value.isdigit():
+                    field_value = int(field_value)
+            if type(field_value) is int:
+                return datetime.fromtimestamp(field_value / 1000, timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            pass
+        return None
+
+    @classmethod
+    def _get_field_caster(cls, field_name: str, field_props: Mapping[str, Any]) -> Callable[[Any], Any]:
+        """
+        Build the function casting values of a property, it returns the same values as `_cast_value` does.
+        Values that already have the declared type are passed through, date/date-time values in fixed formats are converted
+        without pendulum, anything else goes through `_cast_value`.
+        :param field_name property name
+        :param field_props json schema of the property
+        :return function taking the received value and returning the casted one
+        """
+        declared_field_types = field_props.get("type", [])
+        if not isinstance(declared_field_types, Iterable):
+            declared_field_types = [declared_field_types]
+        declared_format = field_props.get("format")
+        nullable = "null" in declared_field_types
+
+        def cast_value(field_value: Any) -> Any:
+            return cls._cast_value(
+                declared_field_types=declared_field_types, field_name=field_name, field_value=field_value, declared_format=declared_format
+            )
+
+        if declared_format in ["date", "date-time"]:
+            if "string" not in declared_field_types:
+                return cast_value
+            to_string = (lambda dt: dt.date().isoformat()) if declared_format == "date" else (lambda dt: dt.isoformat())
+
+            def cast_datetime(field_value: Any) -> Any:
+                if nullable and (field_value is None or field_value == ""):
+                    return None
+                dt = cls._parse_fixed_format_datetime(field_value)
+                return cast_value(field_value) if dt is None else to_string(dt)
+
+            return cast_datetime
+
+        declared_types = {CUSTOM_FIELD_VALUE_TO_TYPE[name] for name in declared_field_types if name in CUSTOM_FIELD_VALUE_TO_TYPE}
+        if nullable:
+            declared_types.add(type(None))
+        target_type_name = next((name for name in declared_field_types if name != "null"), None)
+        target_type = CUSTOM_FIELD_VALUE_TO_TYPE.get(target_type_name)
+        if target_type_name == "number" and field_name.endswith("_id"):
+            target_type = int
+
+        def cast_value_if_needed(field_value: Any) -> Any:
+            if type(field_value) in declared_types:
+                return field_value
+            if type(field_value) is str and target_type in (int, float, bool):
+                # values which can't be converted go through `_cast_value` to be logged the same way
+                value = field_value.replace(",", "") if target_type_name == "number" else field_value
+                if value == "":
+                    return None
+                try:
+                    return target_type(value)
+                except ValueError:
+                    pass
+            return cast_value(field_value)
+
+        return cast_value_if_needed
+
+    @classmethod
+    def _get_field_casters(cls, properties: Mapping[str, Any]) -> Mapping[str, Callable[[Any], Any]]:
+        return {field_name: cls._get_field_caster(field_name, field_props) for field_name, field_props in properties.items()}
+
+    @property
+    @lru_cache()
+    def _field_casters(self) -> Mapping[str, Callable[[Any], Any]]:
+        """Casters of the stream properties, built once per stream"""
+        return self._get_field_casters(self.properties)
+
     def _cast_record_fields_if_needed(self, record: Mapping, properties: Mapping[str, Any] = None) -> Mapping:
 
         if not self.entity or not record.get("properties"):
             return record
 
-        properties = properties or self.properties
+        field_casters = self._get_field_casters(properties) if properties else self._field_casters
 
-        for field_name, field_value in record["properties"].items():
-            if field_name not in properties:
+        record_properties = record["properties"]
+        for field_name, field_value in record_properties.items():
+            field_caster = field_casters.get(field_name)
+            if field_caster is None:
                 self.logger.info(
                     "Property discarded: not maching with properties schema: record id:{}, property_value: {}".format(
                         record.get("id"), field_name
                     )
                 )
                 continue
-            declared_field_types = properties[field_name].get("type", [])
-            if not isinstance(declared_field_types, Iterable):
-                declared_field_types = [declared_field_types]
-            format = properties[field_name].get("format")
-            record["properties"][field_name] = self._cast_value(
-                declared_field_types=declared_field_types, field_name=field_name, field_value=field_value, declared_format=format
-            )
+            record_properties[field_name] = field_caster(field_value)
 
         return record
 
@@ -709,6 +829,16 @@ class AssociationsStream(Stream):
     def stream_slices(self, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None) -> Iterable[str]:
         return self.parent_stream.associations
 
+    def _send(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        self._api.rate_limiter.acquire()
+        return super()._send(request, request_kwargs)
+
+    def backoff_time(self, response: requests.Response) -> Optional[float]:
+        backoff_time = super().backoff_time(response)
+        if backoff_time:
+            self._api.rate_limiter.pause(backoff_time)
+        return backoff_time
+
     def request_body_json(
         self,
         stream_state: Mapping[str, Any],
@@ -849,6 +979,8 @@ class CRMSearchStream(IncrementalStream, ABC):
     updated_at_field = "updatedAt"
     last_modified_field: str = None
     associations: List[str] = None
+    # threads reading association types and prefetching the next search page
+    max_workers = 8
 
     @property
     def url(self):
@@ -872,7 +1004,12 @@ class CRMSearchStream(IncrementalStream, ABC):
         # Given Hubspot does not return any Retry-After header (https://developers.hubspot.com/docs/api/crm/search)
         # from the search endpoint, it waits one second after trying again.
         # As per their docs: `These search endpoints are rate limited to four requests per second per authentication token`.
-        return self._api.post(url=url, data=data, params=params)
+        self._api.rate_limiter.acquire()
+        try:
+            return self._api.post(url=url, data=data, params=params)
+        except HubspotRateLimited:
+            self._api.rate_limiter.pause(1)
+            raise
 
     def _process_search(
         self,
@@ -901,18 +1038,26 @@ class CRMSearchStream(IncrementalStream, ABC):
 
         return list(stream_records.values()), raw_response
 
-    def _read_associations(self, records: Iterable) -> Iterable[Mapping[str, Any]]:
-        records_by_pk = {record[self.primary_key]: record for record in records}
-        identifiers = list(map(lambda x: x[self.primary_key], records))
-        associations_stream = AssociationsStream(
-            api=self._api, start_date=self._start_date, credentials=self._credentials, parent_stream=self, identifiers=identifiers
-        )
-        slices = associations_stream.stream_slices(sync_mode=SyncMode.full_refresh)
-
-        for _slice in slices:
+    def _submit_associations(self, executor: ThreadPoolExecutor, records: Iterable) -> Mapping[str, Future]:
+        """Starts reading every association type of records, each type is read by its own AssociationsStream"""
+        identifiers = [record[self.primary_key] for record in records]
+        futures = {}
+        for _slice in self.associations or []:
+            associations_stream = AssociationsStream(
+                api=self._api, start_date=self._start_date, credentials=self._credentials, parent_stream=self, identifiers=identifiers
+            )
             logger.info(f"Reading {_slice} associations of {self.entity}")
-            associations = associations_stream.read_records(stream_slice=_slice, sync_mode=SyncMode.full_refresh)
-            for group in associations:
+            futures[_slice] = executor.submit(
+                lambda stream, stream_slice: list(stream.read_records(stream_slice=stream_slice, sync_mode=SyncMode.full_refresh)),
+                associations_stream,
+                _slice,
+            )
+        return futures
+
+    def _read_associations(self, records: Iterable, associations: Mapping[str, Future]) -> Iterable[Mapping[str, Any]]:
+        records_by_pk = {record[self.primary_key]: record for record in records}
+        for _slice, future in associations.items():
+            for group in future.result():
                 current_record = records_by_pk[group["from"]["id"]]
                 associations_list = current_record.get(_slice, [])
                 associations_list.extend(association["toObjectId"] for association in group["to"])
@@ -927,18 +1072,39 @@ class CRMSearchStream(IncrementalStream, ABC):
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
         stream_state = stream_state or {}
+        # associations of a search page are read concurrently, overlapping with the search of the next page
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}_associations")
+        try:
+            yield from self._read_pages(executor, stream_slice, stream_state)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _read_pages(
+        self,
+        executor: ThreadPoolExecutor,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Iterable[Mapping[str, Any]]:
         pagination_complete = False
         next_page_token = None
+        next_search = None
 
         latest_cursor = None
         while not pagination_complete:
             if self.state:
-                records, raw_response = self._process_search(
-                    next_page_token=next_page_token,
-                    stream_state=stream_state,
-                    stream_slice=stream_slice,
-                )
-                records = self._read_associations(records)
+                if next_search is None:
+                    next_search = executor.submit(
+                        self._process_search, next_page_token=next_page_token, stream_state=stream_state, stream_slice=stream_slice
+                    )
+                records, raw_response = next_search.result()
+                next_search = None
+                associations = self._submit_associations(executor, records)
+                next_page_token = self.next_page_token(raw_response)
+                if next_page_token and next_page_token["payload"]["after"] < 10000:
+                    next_search = executor.submit(
+                        self._process_search, next_page_token=next_page_token, stream_state=stream_state, stream_slice=stream_slice
+                    )
+                records = self._read_associations(records, associations)
             else:
                 records, raw_response = self._read_stream_records(
                     stream_slice=stream_slice,
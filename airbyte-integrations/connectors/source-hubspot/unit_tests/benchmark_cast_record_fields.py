@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Benchmark of record fields casting over a contacts payload with 600 properties, most of them custom ones,
+comparing the per-field `_cast_value` dispatch with the casters built once per stream.
+
+    python -m unit_tests.benchmark_cast_record_fields
+"""
+
+import copy
+import random
+import time
+
+from source_hubspot.streams import Stream
+
+PROPERTIES_COUNT = 600
+RECORDS_COUNT = 500
+
+# HubSpot property types of a contacts portal, in the proportions they're usually found in
+PROPERTY_TYPES = ["string"] * 6 + ["enumeration"] * 4 + ["number"] * 3 + ["bool"] * 2 + ["datetime"] * 3 + ["date"]
+
+
+def property_value(field_type: str, n: int):
+    if n % 4 == 0:
+        return None
+    if field_type == "number":
+        return f"{n * 31 % 1000}.5"
+    if field_type == "bool":
+        return "true" if n % 2 else "false"
+    if field_type == "datetime":
+        return f"2022-{n % 12 + 1:02d}-{n % 28 + 1:02d}T{n % 24:02d}:{n % 60:02d}:17.{n % 1000:03d}Z"
+    if field_type == "date":
+        return f"2022-{n % 12 + 1:02d}-{n % 28 + 1:02d}"
+    return f"value {n}"
+
+
+def contacts_payload():
+    random.seed(39)
+    field_types = {f"property_{i}": random.choice(PROPERTY_TYPES) for i in range(PROPERTIES_COUNT)}
+    properties = {field_name: Stream._get_field_props(field_type) for field_name, field_type in field_types.items()}
+    records = [
+        {
+            "id": str(n),
+            "properties": {field_name: property_value(field_type, n + i) for i, (field_name, field_type) in enumerate(field_types.items())},
+        }
+        for n in range(RECORDS_COUNT)
+    ]
+    return properties, records
+
+
+def cast_per_field(properties, records):
+    for record in records:
+        for field_name, field_value in record["properties"].items():
+            declared_field_types = properties[field_name].get("type", [])
+            record["properties"][field_name] = Stream._cast_value(
+                declared_field_types=declared_field_types,
+                field_name=field_name,
+                field_value=field_value,
+                declared_format=properties[field_name].get("format"),
+            )
+    return records
+
+
+def cast_with_casters(properties, records):
+    field_casters = Stream._get_field_casters(properties)
+    for record in records:
+        record_properties = record["properties"]
+        for field_name, field_value in record_properties.items():
+            record_properties[field_name] = field_casters[field_name](field_value)
+    return records
+
+
+def main():
+    properties, records = contacts_payload()
+    results = {}
+    for label, cast in (("per-field _cast_value", cast_per_field), ("field casters", cast_with_casters)):
+        payload = copy.deepcopy(records)
+        started = time.perf_counter()
+        results[label] = cast(properties, payload)
+        elapsed = time.perf_counter() - started
+        print(f"{label:>22}: {RECORDS_COUNT} records x {PROPERTIES_COUNT} properties in {elapsed:.2f}s")
+    assert results["per-field _cast_value"] == results["field casters"]
+
+
+if __name__ == "__main__":
+    main()
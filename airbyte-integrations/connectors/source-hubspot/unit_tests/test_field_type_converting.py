@@ -102,3 +102,57 @@ def test_cast_type_if_needed(declared_field_types, field_name, field_value, form
 def test_cast_timestamp_to_date(field_value, declared_format, expected_casted_value):
     casted_value = Stream._cast_datetime("hs_recurring_billing_end_date", field_value, declared_format=declared_format)
     assert casted_value == expected_casted_value
+
+
+@pytest.mark.parametrize(
+    "field_props",
+    [
+        {"type": ["null", "string"]},
+        {"type": ["null", "number"]},
+        {"type": ["null", "integer"]},
+        {"type": ["null", "boolean"]},
+        {"type": ["null", "object"]},
+        {"type": ["null", "string"], "format": "date"},
+        {"type": ["null", "string"], "format": "date-time"},
+        {"type": ["string"], "format": "date-time"},
+        {"type": "string"},
+    ],
+)
+@pytest.mark.parametrize(
+    "field_value",
+    [
+        None,
+        "",
+        "test",
+        "123",
+        "123,123.456",
+        True,
+        7,
+        "2020",
+        "2022-05-28",
+        "2022-02-23 09:27:45",
+        "2022-02-23T09:27:45.123Z",
+        "2022-02-23T09:27:45.123456+02:00",
+        "2022-02-30T09:27:45Z",
+        "1645608465123",
+        1645608465000,
+    ],
+)
+@pytest.mark.parametrize("field_name", ["some_field", "user_id"])
+def test_field_caster_casts_as_cast_value(field_props, field_value, field_name):
+    def cast(cast_function):
+        try:
+            return cast_function()
+        except Exception as e:
+            return type(e)
+
+    field_caster = Stream._get_field_caster(field_name, field_props)
+    expected = cast(
+        lambda: Stream._cast_value(
+            declared_field_types=field_props["type"],
+            field_name=field_name,
+            field_value=field_value,
+            declared_format=field_props.get("format"),
+        )
+    )
+    assert cast(lambda: field_caster(field_value)) == expected
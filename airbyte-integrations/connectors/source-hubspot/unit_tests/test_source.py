@@ -13,7 +13,7 @@ from airbyte_cdk.models import ConfiguredAirbyteCatalog, SyncMode, Type
 from source_hubspot.errors import HubspotRateLimited
 from source_hubspot.helpers import APIv3Property
 from source_hubspot.source import SourceHubspot
-from source_hubspot.streams import API, Companies, Deals, Engagements, Products, Stream, Workflows
+from source_hubspot.streams import API, Companies, Deals, Engagements, Products, RateLimiter, Stream, Workflows
 
 from .utils import read_full_refresh, read_incremental
 
@@ -413,6 +413,54 @@ def test_search_based_stream_should_not_attempt_to_get_more_than_10k_records(req
     assert test_stream.state["updatedAt"] == test_stream._init_sync.to_iso8601_string()
 
 
+def test_search_based_stream_reads_associations_of_every_page(requests_mock, common_params, fake_properties_list):
+    search_responses = [
+        {
+            "json": {
+                "results": [{"id": f"{y}", "updatedAt": "2022-03-01T00:00:00Z"} for y in range(page * 2, page * 2 + 2)],
+                "paging": {"next": {"after": f"{(page + 1) * 2}"}} if page < 2 else {},
+            },
+            "status_code": 200,
+        }
+        for page in range(3)
+    ]
+    properties_response = [
+        {
+            "json": [
+                {"name": property_name, "type": "string", "updatedAt": 1571085954360, "createdAt": 1565059306048}
+                for property_name in fake_properties_list
+            ],
+            "status_code": 200,
+        }
+    ]
+
+    def associations_callback(to_object):
+        def callback(request, context):
+            return {
+                "results": [
+                    {"from": {"id": item["id"]}, "to": [{"toObjectId": f"{to_object}_{item['id']}"}]} for item in request.json()["inputs"]
+                ]
+            }
+
+        return callback
+
+    test_stream = Deals(**common_params)
+    test_stream.state = {"updatedAt": "2022-02-24T16:43:11Z"}
+    test_stream._sync_mode = SyncMode.incremental
+    requests_mock.register_uri("POST", test_stream.url, search_responses)
+    test_stream._sync_mode = None
+    requests_mock.register_uri("GET", "/properties/v2/deal/properties", properties_response)
+    for association in test_stream.associations:
+        requests_mock.register_uri("POST", f"/crm/v4/associations/deal/{association}/batch/read", json=associations_callback(association))
+
+    records, _ = read_incremental(test_stream, {})
+
+    assert [record["id"] for record in records] == [str(y) for y in range(6)]
+    for record in records:
+        for association in test_stream.associations:
+            assert record[association] == [f"{association}_{record['id']}"]
+
+
 def test_engagements_stream_pagination_works(requests_mock, common_params):
     """
     Tests the engagements stream handles pagination correctly, for both
@@ -522,3 +570,19 @@ def test_incremental_engagements_stream_stops_at_10K_records(requests_mock, comm
     # The stream should not attempt to get more than 10K records.
     assert len(records) == 10000
     assert test_stream.state["lastUpdated"] == int(test_stream._init_sync.timestamp() * 1000)
+
+
+def test_rate_limiter_spaces_out_calls(mocker):
+    monotonic = mocker.patch("source_hubspot.streams.time.monotonic", return_value=100.0)
+    sleep = mocker.patch("source_hubspot.streams.time.sleep")
+    limiter = RateLimiter(max_calls=10, period=1)
+
+    limiter.acquire()
+    sleep.assert_not_called()
+    limiter.acquire()
+    sleep.assert_called_once_with(pytest.approx(0.1))
+
+    limiter.pause(5)
+    monotonic.return_value = 101.0
+    limiter.acquire()
+    sleep.assert_called_with(pytest.approx(4))
@@ -2,10 +2,14 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import json
+import tempfile
+import threading
 import time
 from abc import ABC
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import timedelta
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional
 
 import pendulum
 import requests
@@ -14,15 +18,43 @@ from airbyte_cdk.sources.streams.http.auth import HttpAuthenticator
 from pendulum import Date
 
 
+class RequestPacer:
+    """
+    Spreads the requests evenly over the hourly quota: requests are started 3600/reqs_per_hour seconds apart.
+    The time the previous request took counts towards the interval, so a slow response isn't followed by the full wait,
+    and the requests sent from several threads at once are queued one interval after another.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self, reqs_per_hour: int) -> float:
+        """Blocks until the next request is allowed to start, returns the time waited"""
+        if reqs_per_hour <= 0:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + 3600 / reqs_per_hour
+        if start > now:
+            time.sleep(start - now)
+        return start - now
+
+
 class MixpanelStream(HttpStream, ABC):
     """
     Formatted API Rate Limit  (https://help.mixpanel.com/hc/en-us/articles/115004602563-Rate-Limits-for-API-Endpoints):
       A maximum of 5 concurrent queries
       60 queries per hour.
 
-    API Rate Limit Handler: after each request freeze for the time period: 3600/reqs_per_hour_limit seconds
+    API Rate Limit Handler: requests are started 3600/reqs_per_hour_limit seconds apart, see RequestPacer.
+    The pacer is shared by all streams of the same API, as the limits are applied per project.
     """
 
+    # one pacer per API url, the Raw Export API is limited separately from the Query API
+    _pacers: Dict[str, RequestPacer] = {}
+
     @property
     def url_base(self):
         prefix = "eu." if self.region == "EU" else ""
@@ -64,6 +96,17 @@ class MixpanelStream(HttpStream, ABC):
     ) -> Mapping[str, Any]:
         return {"Accept": "application/json"}
 
+    @property
+    def pacer(self) -> RequestPacer:
+        return self._pacers.setdefault(self.url_base, RequestPacer())
+
+    def _send(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        # every attempt, retries included, counts towards the quota
+        waited = self.pacer.wait(self.reqs_per_hour_limit)
+        if waited:
+            self.logger.info("Waited for %.1f seconds to match API limitations", waited)
+        return super()._send(request, request_kwargs)
+
     def _send_request(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
         try:
             return super()._send_request(request, request_kwargs)
@@ -95,12 +138,6 @@ class MixpanelStream(HttpStream, ABC):
         # parse the whole response
         yield from self.process_response(response, stream_state=stream_state, **kwargs)
 
-        if self.reqs_per_hour_limit > 0:
-            # we skip this block, if self.reqs_per_hour_limit = 0,
-            # in all other cases wait for X seconds to match API limitations
-            self.logger.info("Sleep for %s seconds to match API limitations", 3600 / self.reqs_per_hour_limit)
-            time.sleep(3600 / self.reqs_per_hour_limit)
-
     def backoff_time(self, response: requests.Response) -> float:
         """
         Some API endpoints do not return "Retry-After" header
@@ -128,7 +165,38 @@ class MixpanelStream(HttpStream, ABC):
         return {}
 
 
+class SliceRecordsBuffer:
+    """Records of a date slice read ahead, kept in a temporary file until the slice is read"""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(mode="w+b")
+
+    def write(self, record: Mapping[str, Any]):
+        self._file.write(json.dumps(record).encode() + b"\n")
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line)
+
+    def close(self):
+        self._file.close()
+
+
 class DateSlicesMixin:
+    """
+    Slices the stream into date windows of `date_window_size` days.
+    While a window is read, the next `concurrent_slices - 1` windows are requested in the background
+    (still paced to the hourly quota), so that the slow responses don't hold up the windows after them.
+    Windows are read in their original order, the ones read ahead are buffered on disk.
+    """
+
+    # Mixpanel allows a maximum of 5 concurrent queries
+    concurrent_slices: int = 5
+
+    _upcoming_slices: List[Mapping[str, Any]] = []
+    _executor: Optional[ThreadPoolExecutor] = None
+
     def stream_slices(
         self, sync_mode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
     ) -> Iterable[Optional[Mapping[str, Any]]]:
@@ -159,8 +227,84 @@ class DateSlicesMixin:
             # add 1 additional day because date range is inclusive
             start_date = current_end_date + timedelta(days=1)
 
+        self._set_upcoming_slices(date_slices)
         return date_slices
 
+    def _set_upcoming_slices(self, stream_slices: List[Mapping[str, Any]]):
+        """Slices to read ahead, in the order they are read"""
+        self._close_read_ahead()
+        self._upcoming_slices = list(stream_slices)
+        self._read_ahead: Dict[str, Future] = {}
+
+    @staticmethod
+    def _slice_key(stream_slice: Mapping[str, Any]) -> str:
+        return json.dumps(stream_slice, sort_keys=True, default=str)
+
+    def _read_slice(self, stream_slice: Mapping[str, Any], **kwargs) -> SliceRecordsBuffer:
+        buffer = SliceRecordsBuffer()
+        try:
+            for record in super().read_records(stream_slice=stream_slice, **kwargs):
+                buffer.write(record)
+        except BaseException:
+            buffer.close()
+            raise
+        return buffer
+
+    @staticmethod
+    def _release(future: Future):
+        if not future.cancelled() and not future.exception():
+            future.result().close()
+
+    def _close_read_ahead(self):
+        """Drops the slices which were read ahead, but weren't read"""
+        for future in getattr(self, "_read_ahead", {}).values():
+            future.cancel()
+            future.add_done_callback(self._release)
+        self._read_ahead = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def read_records(
+        self,
+        sync_mode,
+        cursor_field: List[str] = None,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Iterable[Mapping[str, Any]]:
+        keys = [self._slice_key(upcoming_slice) for upcoming_slice in self._upcoming_slices]
+        key = self._slice_key(stream_slice) if stream_slice is not None else None
+        if self.concurrent_slices <= 1 or key not in keys:
+            yield from super().read_records(sync_mode, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state)
+            return
+
+        # the slices before the current one are done with, the current one and the ones after it are read ahead
+        position = keys.index(key)
+        self._upcoming_slices = self._upcoming_slices[position:]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrent_slices, thread_name_prefix=f"{self.name}_slices")
+        stream_state = dict(stream_state or {})
+        for upcoming_slice in self._upcoming_slices[: self.concurrent_slices]:
+            upcoming_key = self._slice_key(upcoming_slice)
+            if upcoming_key not in self._read_ahead:
+                self._read_ahead[upcoming_key] = self._executor.submit(
+                    self._read_slice, upcoming_slice, sync_mode=sync_mode, cursor_field=cursor_field, stream_state=stream_state
+                )
+
+        future = self._read_ahead.pop(key)
+        completed = False
+        try:
+            buffer = future.result()
+            try:
+                yield from buffer
+            finally:
+                buffer.close()
+            completed = True
+        finally:
+            self._upcoming_slices = self._upcoming_slices[1:]
+            if not completed or not self._upcoming_slices:
+                self._close_read_ahead()
+
     def request_params(
         self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, any] = None, next_page_token: Mapping[str, Any] = None
     ) -> MutableMapping[str, Any]:
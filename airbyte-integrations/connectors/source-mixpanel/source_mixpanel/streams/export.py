@@ -4,7 +4,7 @@
 
 import json
 from functools import cache
-from typing import Any, Iterable, Mapping, MutableMapping
+from typing import Any, Iterable, Mapping, MutableMapping, Union
 
 import pendulum
 import requests
@@ -85,31 +85,42 @@ class Export(DateSlicesMixin, IncrementalMixpanelStream):
     def path(self, **kwargs) -> str:
         return "export"
 
-    def iter_dicts(self, lines):
+    # the export is read in chunks of this size, lines are split out of the decompressed chunks
+    iter_chunk_size: int = 64 * 1024
+
+    def request_headers(
+        self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
+    ) -> Mapping[str, Any]:
+        # the export is sent gzip compressed and decompressed on the fly while it's read, see process_response
+        return {**super().request_headers(stream_state, stream_slice, next_page_token), "Accept-Encoding": "gzip"}
+
+    def iter_dicts(self, lines: Iterable[Union[bytes, str]]) -> Iterable[Mapping[str, Any]]:
         """
         The incoming stream has to be JSON lines format.
         From time to time for some reason, the one record can be split into multiple lines.
         We try to combine such split parts into one record only if parts go nearby.
         """
-        parts = []
+        # the beginning of the record split into multiple lines, the following lines are appended to it until it's parsed
+        pending = None
         for record_line in lines:
-            if record_line == "terminated early":
+            if not record_line:
+                continue
+            if record_line in ("terminated early", b"terminated early"):
                 self.logger.warning(f"Couldn't fetch data from Export API. Response: {record_line}")
                 return
             try:
-                yield json.loads(record_line)
+                record = json.loads(record_line)
             except ValueError:
-                parts.append(record_line)
-            else:
-                parts = []
-
-            if len(parts) > 1:
+                if pending is None:
+                    pending = record_line
+                    continue
+                pending += record_line
                 try:
-                    yield json.loads("".join(parts))
+                    record = json.loads(pending)
                 except ValueError:
-                    pass
-                else:
-                    parts = []
+                    continue
+            pending = None
+            yield record
 
     def process_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
         """Export API return response in JSONL format but each line is a valid JSON object
@@ -131,8 +142,11 @@ class Export(DateSlicesMixin, IncrementalMixpanelStream):
             }
         """
 
-        # We prefer response.iter_lines() to response.text.split_lines() as the later can missparse text properties embeding linebreaks
-        for record in self.iter_dicts(response.iter_lines(decode_unicode=True)):
+        # We prefer response.iter_lines() to response.text.split_lines() as the later can missparse text properties embeding linebreaks.
+        # Lines are split on b"\n" only and parsed as bytes, without decoding them first: unlike str.splitlines()
+        # this doesn't break the records on unicode line separators which JSON allows within strings.
+        lines = response.iter_lines(chunk_size=self.iter_chunk_size, delimiter=b"\n")
+        for record in self.iter_dicts(lines):
             # transform record into flat dict structure
             item = {"event": record["event"]}
             properties = record["properties"]
@@ -90,6 +90,7 @@ class Funnels(DateSlicesMixin, IncrementalMixpanelStream):
             for date_slice in date_slices:
                 stream_slices.append({**funnel_slice, **date_slice})
 
+        self._set_upcoming_slices(stream_slices)
         return stream_slices
 
     def request_params(
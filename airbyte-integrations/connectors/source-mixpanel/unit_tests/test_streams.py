@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import gzip
 import json
 from datetime import timedelta
 from unittest.mock import MagicMock
@@ -24,6 +25,7 @@ from source_mixpanel.streams import (
     MixpanelStream,
     Revenue,
 )
+from source_mixpanel.streams.base import RequestPacer
 from source_mixpanel.utils import read_full_refresh
 
 from .utils import get_url_to_mock, read_incremental, setup_response
@@ -468,3 +470,59 @@ def test_export_iter_dicts(config):
     assert list(stream.iter_dicts([record_string, record_string[:2], record_string[2:], record_string])) == [record, record, record]
     # drop record parts because they are not standing nearby
     assert list(stream.iter_dicts([record_string, record_string[:2], record_string, record_string[2:]])) == [record, record]
+
+
+def test_request_pacer_counts_request_time(mocker):
+    sleeps = []
+    clock = mocker.patch("time.monotonic", return_value=1000.0)
+    mocker.patch("time.sleep", sleeps.append)
+    pacer = RequestPacer()
+
+    assert pacer.wait(reqs_per_hour=60) == 0
+    # the first request took 45 seconds, only the rest of the interval is waited
+    clock.return_value = 1045.0
+    assert pacer.wait(reqs_per_hour=60) == 15
+    # the next request is queued one more interval after the previous one
+    assert pacer.wait(reqs_per_hour=60) == 75
+    assert pacer.wait(reqs_per_hour=0) == 0
+    assert sleeps == [15, 75]
+
+
+def test_date_slices_read_ahead(requests_mock, config):
+    config["date_window_size"] = 10
+    stream = Revenue(authenticator=MagicMock(), **config)
+    requested = []
+
+    def revenue_response(request, context):
+        from_date = request.qs["from_date"][0]
+        requested.append(from_date)
+        return {"results": {from_date: {"amount": 0.0, "count": 1, "paid_count": 0}}}
+
+    requests_mock.register_uri("GET", get_url_to_mock(stream), json=revenue_response)
+
+    stream_slices = stream.stream_slices(sync_mode=SyncMode.incremental)
+    first_slice_records = list(stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slices[0]))
+    # the following windows are requested along with the first one
+    assert list(stream._read_ahead) == [stream._slice_key(stream_slice) for stream_slice in stream_slices[1:]]
+    records = first_slice_records + [
+        record
+        for stream_slice in stream_slices[1:]
+        for record in stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice)
+    ]
+
+    assert [record["date"] for record in records] == [stream_slice["start_date"] for stream_slice in stream_slices]
+    assert sorted(requested) == [stream_slice["start_date"] for stream_slice in stream_slices]
+    assert stream._executor is None
+
+
+def test_export_gzip_lines(requests_mock, config):
+    stream = Export(authenticator=MagicMock(), **config)
+    record = {"event": "Viewed Page", "properties": {"time": 1623860880, "title": "line\u2028separator"}}
+    body = "\n".join([json.dumps(record, ensure_ascii=False)] * 2 + ["terminated early", ""])
+    requests_mock.register_uri("GET", get_url_to_mock(stream), content=gzip.compress(body.encode()), headers={"Content-Encoding": "gzip"})
+
+    stream_slice = {"start_date": "2021-06-16", "end_date": "2021-06-16"}
+    records = list(stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice))
+
+    assert records == [{"event": "Viewed Page", "time": "2021-06-16T16:28:00Z", "title": "line\u2028separator"}] * 2
+    assert requests_mock.last_request.headers["Accept-Encoding"] == "gzip"
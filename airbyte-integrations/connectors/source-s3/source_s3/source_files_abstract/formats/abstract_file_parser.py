@@ -44,6 +44,13 @@ class AbstractFileParser(ABC):
         Override this per format so that file-like objects passed in are currently opened as binary or not
         """
 
+    @property
+    def is_columnar(self) -> bool:
+        """
+        True for the formats streamed as pyarrow RecordBatches (see ColumnarFileParser)
+        """
+        return False
+
     @abstractmethod
     def get_inferred_schema(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> dict:
         """
@@ -108,3 +115,25 @@ class AbstractFileParser(ABC):
         :return: converted schema dict
         """
         return {column: cls.json_type_to_pyarrow_type(json_type, reverse=reverse) for column, json_type in schema.items()}
+
+
+class ColumnarFileParser(AbstractFileParser, ABC):
+    """
+    Parser of a format read as pyarrow RecordBatches,
+    the stream then matches the target schema on whole Arrow batches instead of on each record
+    """
+
+    @property
+    def is_columnar(self) -> bool:
+        return True
+
+    @abstractmethod
+    def stream_batches(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[pa.RecordBatch]:
+        """
+        Override this with format-specific logic to stream the file as pyarrow RecordBatches
+        Note: values should already be coerced to their final JSON-compatible types, the stream converts batches to dicts as is
+
+        :param file: file-like object (opened via StorageFile)
+        :param file_info: file metadata
+        :yield: pyarrow RecordBatch of data rows
+        """
@@ -15,7 +15,7 @@ from source_s3.exceptions import S3Exception
 from source_s3.source_files_abstract.file_info import FileInfo
 from source_s3.utils import get_value_or_json_if_empty_string, run_in_external_process
 
-from .abstract_file_parser import AbstractFileParser
+from .abstract_file_parser import ColumnarFileParser
 from .csv_spec import CsvFormat
 
 MAX_CHUNK_SIZE = 50.0 * 1024**2  # in bytes
@@ -35,7 +35,7 @@ def wrap_exception(exceptions: Tuple[type, ...]):
     return wrapper
 
 
-class CsvParser(AbstractFileParser):
+class CsvParser(ColumnarFileParser):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.format_model = None
@@ -163,10 +163,10 @@ class CsvParser(AbstractFileParser):
         return {field_name.strip(): pyarrow.string() for field_name in field_names}
 
     @wrap_exception((ValueError,))
-    def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
+    def stream_batches(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[pa.RecordBatch]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.csv.open_csv.html
-        PyArrow returns lists of values for each column so we zip() these up into records which we then yield
+        PyArrow already coerces columns to the master schema types on read, so batches are yielded as they are parsed
         """
         streaming_reader = pa_csv.open_csv(
             file,
@@ -174,19 +174,11 @@ class CsvParser(AbstractFileParser):
             pa.csv.ParseOptions(**self._parse_options()),
             pa.csv.ConvertOptions(**self._convert_options(self._master_schema)),
         )
-        still_reading = True
-        while still_reading:
-            try:
-                batch = streaming_reader.read_next_batch()
-            except StopIteration:
-                still_reading = False
-            else:
-                batch_dict = batch.to_pydict()
-                batch_columns = [col_info.name for col_info in batch.schema]
-                # this gives us a list of lists where each nested list holds ordered values for a single column
-                # e.g. [ [1,2,3], ["a", "b", "c"], [True, True, False] ]
-                columnwise_record_values = [batch_dict[column] for column in batch_columns]
-                # we zip this to get row-by-row, e.g. [ [1, "a", True], [2, "b", True], [3, "c", False] ]
-                for record_values in zip(*columnwise_record_values):
-                    # create our record of {col: value, col: value} by dict comprehension, iterating through all cols in batch_columns
-                    yield {batch_columns[i]: record_values[i] for i in range(len(batch_columns))}
+        yield from streaming_reader
+
+    def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
+        """
+        PyArrow returns batches of columns so we convert each of them into row-by-row records in one go
+        """
+        for batch in self.stream_batches(file, file_info):
+            yield from batch.to_pylist()
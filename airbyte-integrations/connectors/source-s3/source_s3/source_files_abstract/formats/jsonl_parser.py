@@ -9,11 +9,11 @@ import pyarrow as pa
 from pyarrow import json as pa_json
 from source_s3.source_files_abstract.file_info import FileInfo
 
-from .abstract_file_parser import AbstractFileParser
+from .abstract_file_parser import ColumnarFileParser
 from .jsonl_spec import JsonlFormat
 
 
-class JsonlParser(AbstractFileParser):
+class JsonlParser(ColumnarFileParser):
     TYPE_MAP = {
         "boolean": ("bool_", "bool"),
         "integer": ("int64", "int8", "int16", "int32", "uint8", "uint16", "uint32", "uint64"),
@@ -94,6 +94,14 @@ class JsonlParser(AbstractFileParser):
         schema_dict = {field.name: field_type_to_str(field.type) for field in table.schema}
         return self.json_schema_to_pyarrow_schema(schema_dict, reverse=True)
 
+    def stream_batches(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[pa.RecordBatch]:
+        """
+        https://arrow.apache.org/docs/python/generated/pyarrow.json.read_json.html
+
+        """
+        table = self._read_table(file, self._master_schema)
+        yield from table.to_batches()
+
     def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.json.read_json.html
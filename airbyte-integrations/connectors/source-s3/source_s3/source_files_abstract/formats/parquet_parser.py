@@ -4,13 +4,15 @@
 
 from typing import Any, BinaryIO, Iterator, List, Mapping, TextIO, Tuple, Union
 
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from airbyte_cdk.models import FailureType
 from pyarrow.parquet import ParquetFile
 from source_s3.exceptions import S3Exception
 from source_s3.source_files_abstract.file_info import FileInfo
 
-from .abstract_file_parser import AbstractFileParser
+from .abstract_file_parser import ColumnarFileParser
 from .parquet_spec import ParquetFormat
 
 # All possible parquet data types
@@ -29,7 +31,7 @@ PARQUET_TYPES = {
 }
 
 
-class ParquetParser(AbstractFileParser):
+class ParquetParser(ColumnarFileParser):
     """Apache Parquet is a free and open-source column-oriented data storage format of the Apache Hadoop ecosystem.
 
     Docs: https://parquet.apache.org/documentation/latest/
@@ -103,10 +105,36 @@ class ParquetParser(AbstractFileParser):
             raise S3Exception(file_info, "empty Parquet file", "The .parquet file is empty!", FailureType.config_error)
         return schema_dict
 
-    def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
+    @staticmethod
+    def convert_field_array(logical_type: str, field_array: pa.Array) -> pa.Array:
+        """Converts a whole column of not JSON format to JSON one"""
+        if logical_type not in PARQUET_TYPES:
+            raise TypeError(f"unsupported field type: {logical_type}")
+        _, _, func = PARQUET_TYPES[logical_type]
+        if func is None:
+            return field_array
+        if pa.types.is_date(field_array.type):
+            # Arrow renders dates exactly like date.isoformat()
+            return field_array.cast(pa.string())
+        if pa.types.is_time(field_array.type):
+            # "HH:MM:SS.ffffff" without the fraction of whole seconds, like time.isoformat()
+            strings = field_array.cast(pa.time64("us"), safe=False).cast(pa.string())
+            return pc.replace_substring_regex(strings, r"\.000000$", "")
+        if pa.types.is_timestamp(field_array.type):
+            timestamps = field_array.cast(pa.timestamp("us", tz=field_array.type.tz), safe=False)
+            if field_array.type.tz is None:
+                strings = pc.replace_substring(timestamps.cast(pa.string()), " ", "T", max_replacements=1)
+                return pc.replace_substring_regex(strings, r"\.000000$", "")
+            # aware timestamps are rendered in their time zone, with a "+HH:MM" offset like datetime.isoformat()
+            strings = pc.strftime(timestamps, format="%Y-%m-%dT%H:%M:%S%z")
+            strings = pc.replace_substring_regex(strings, r"\.000000([+-])", r"\1")
+            return pc.replace_substring_regex(strings, r"([+-]\d\d)(\d\d)$", r"\1:\2")
+        return pa.array([None if value is None else func(value) for value in field_array.to_pylist()], type=pa.string())
+
+    def stream_batches(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[pa.RecordBatch]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.parquet.ParquetFile.html
-        PyArrow reads streaming batches from a Parquet file
+        PyArrow reads streaming batches from a Parquet file, non-JSON columns are converted per batch
         """
 
         reader = self._init_reader(file)
@@ -128,18 +156,19 @@ class ParquetParser(AbstractFileParser):
         for num_row_group in range(reader.num_row_groups):
             args["row_groups"] = [num_row_group]
             for batch in reader.iter_batches(**args):
-                # this gives us a dist of lists where each nested list holds ordered values for a single column
-                # {'number': [1.0, 2.0, 3.0], 'name': ['foo', None, 'bar'], 'flag': [True, False, True], 'delta': [-1.0, 2.5, 0.1]}
-                batch_dict = batch.to_pydict()
                 # sometimes the batch file has more columns than master_schema declares, like:
                 # master schema: ['number', 'name', 'flag', 'delta'],
                 # batch_file_schema: ['number', 'name', 'flag', 'delta', 'EXTRA_COL_NAME'].
                 # we need to check wether batch_file_schema == master_schema and reject extra columns, otherwise "KeyError" raises.
-                batch_columns = [column for column in batch_dict.keys() if column in self._master_schema]
-                columnwise_record_values = [batch_dict[column] for column in batch_columns if column in self._master_schema]
-                # we zip this to get row-by-row
-                for record_values in zip(*columnwise_record_values):
-                    yield {
-                        batch_columns[i]: self.convert_field_data(logical_types[batch_columns[i]], record_values[i])
-                        for i in range(len(batch_columns))
-                    }
+                batch_columns = [column for column in batch.schema.names if column in self._master_schema]
+                yield pa.RecordBatch.from_arrays(
+                    [self.convert_field_array(logical_types[column], batch.column(column)) for column in batch_columns],
+                    names=batch_columns,
+                )
+
+    def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
+        """
+        Converts every batch of stream_batches() into row-by-row records
+        """
+        for batch in self.stream_batches(file, file_info):
+            yield from batch.to_pylist()
@@ -0,0 +1,125 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import shutil
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Callable, Deque, Iterable, Iterator, Optional, TextIO, Tuple, Union
+
+from .file_info import FileInfo
+from .storagefile import StorageFile
+
+COPY_CHUNK_SIZE = 1024**2  # in bytes
+
+
+class FilePrefetcher:
+    """
+    Read-ahead stage for the files of a stream, so that fetching files from storage overlaps with parsing them.
+    Once schedule() is given the files in the order they will be read, a small thread pool downloads the next max_files of them
+    into spooled temporary buffers (kept in memory up to spool_max_size bytes each, spilled to disk beyond that).
+    Files are handed out by open() in read order. Prefetching pauses while the buffered files would exceed max_bytes in total,
+    a file which doesn't fit into the budget at all is simply streamed directly from storage when it's read.
+    """
+
+    def __init__(self, storagefile_factory: Callable[[FileInfo], StorageFile], max_files: int, max_bytes: int, spool_max_size: int):
+        """
+        :param storagefile_factory: builds the provider-specific StorageFile to download a file with, called from worker threads
+        :param max_files: max number of files downloaded or buffered ahead of the one being read, 0 disables prefetching
+        :param max_bytes: budget for the total size of files downloaded or buffered ahead
+        :param spool_max_size: size in bytes up to which a prefetched file is kept in memory rather than on disk
+        """
+        self._storagefile_factory = storagefile_factory
+        self._max_files = max_files
+        self._max_bytes = max_bytes
+        self._spool_max_size = spool_max_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[FileInfo] = deque()
+        self._prefetched: "OrderedDict[str, Tuple[FileInfo, Future]]" = OrderedDict()
+        self._prefetched_bytes = 0
+
+    def schedule(self, file_infos: Iterable[FileInfo]) -> None:
+        """
+        Starts prefetching file_infos, these must be in the order open() is going to be called in
+
+        :param file_infos: files of the stream in read order
+        """
+        self._pending = deque(file_infos)
+        self._fill()
+
+    def _fill(self) -> None:
+        while self._pending and len(self._prefetched) < self._max_files:
+            file_info = self._pending[0]
+            if self._prefetched_bytes + file_info.size > self._max_bytes:
+                # keeps read order, files behind this one wait until it's read
+                break
+            self._pending.popleft()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_files, thread_name_prefix="file_prefetcher")
+            self._prefetched_bytes += file_info.size
+            self._prefetched[file_info.key] = (file_info, self._executor.submit(self._download, file_info))
+
+    def _download(self, file_info: FileInfo) -> SpooledTemporaryFile:
+        buffer = SpooledTemporaryFile(max_size=self._spool_max_size)
+        try:
+            with self._storagefile_factory(file_info).open(True) as f:
+                shutil.copyfileobj(f, buffer, COPY_CHUNK_SIZE)
+            buffer.seek(0)
+        except BaseException:
+            buffer.close()
+            raise
+        return buffer
+
+    @contextmanager
+    def open(self, storage_file: StorageFile, binary: bool) -> Iterator[Union[TextIO, BinaryIO]]:
+        """
+        Yields the prefetched buffer of storage_file if there is one, else opens storage_file directly.
+        Either way downloads of the following files are kicked off before the caller starts reading.
+
+        :param storage_file: file to open
+        :param binary: whether or not to open file as binary, prefetched buffers are binary only
+        :return: file-like object
+        """
+        file_info = storage_file.file_info
+        prefetched = self._prefetched.pop(file_info.key, None)
+        if self._pending and self._pending[0].key == file_info.key:
+            self._pending.popleft()
+        if prefetched is None or not binary:
+            self._release(prefetched)
+            self._fill()
+            with storage_file.open(binary) as f:
+                yield f
+            return
+
+        try:
+            buffer = prefetched[1].result()
+        except Exception:
+            self._release(prefetched)
+            raise
+        self._fill()
+        try:
+            yield buffer
+        finally:
+            self._release(prefetched)
+            self._fill()
+
+    def _release(self, prefetched: Optional[Tuple[FileInfo, Future]]) -> None:
+        if prefetched is None:
+            return
+        file_info, future = prefetched
+        self._prefetched_bytes -= file_info.size
+        if future.done() and not future.exception():
+            future.result().close()
+        else:
+            future.add_done_callback(lambda f: f.exception() or f.result().close())
+
+    def close(self) -> None:
+        """Drops every prefetched file, e.g. when the read is interrupted"""
+        self._pending.clear()
+        while self._prefetched:
+            self._release(self._prefetched.popitem(last=False)[1])
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Mapping, Optional
+
+from airbyte_cdk.logger import AirbyteLogger
+
+from .file_info import FileInfo
+
+
+class SchemaCache:
+    """
+    Local persistent store of schemas inferred per file, so that unchanged files are never opened to infer their schema twice.
+    Entries are keyed by file key plus etag (falling back to last_modified and size if the provider has no etag),
+    so any change of a file invalidates its entry. One cache file is kept per namespace (e.g. per stream and format options).
+    """
+
+    logger = AirbyteLogger()
+
+    def __init__(self, cache_dir: Optional[str], namespace: Mapping[str, Any]):
+        """
+        :param cache_dir: directory to persist cache files in, caching is disabled if this is None
+        :param namespace: anything that changes inferred schemas beyond the file itself, e.g. the format options
+        """
+        self._path = None
+        if cache_dir is not None:
+            digest = hashlib.sha256(json.dumps(namespace, sort_keys=True, default=str).encode()).hexdigest()
+            self._path = os.path.join(cache_dir, f"{digest}.json")
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._path is None or not os.path.exists(self._path):
+            return {}
+        try:
+            with open(self._path) as fp:
+                entries: Dict[str, Dict[str, Any]] = json.load(fp)
+                return entries
+        except (OSError, ValueError) as e:
+            self.logger.warn(f"ignoring unreadable schema cache '{self._path}': {e}")
+            return {}
+
+    @staticmethod
+    def _entry_key(file_info: FileInfo) -> str:
+        version = file_info.etag or f"{file_info.last_modified.isoformat()}|{file_info.size}"
+        return f"{file_info.key}|{version}"
+
+    def get(self, file_info: FileInfo) -> Optional[Dict[str, Any]]:
+        return self._entries.get(self._entry_key(file_info))
+
+    def set(self, file_info: FileInfo, schema: Mapping[str, Any]) -> None:
+        self._entries[self._entry_key(file_info)] = dict(schema)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Writes the cache atomically, so a concurrent or interrupted run never sees a partially written file"""
+        if self._path is None or not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self._path), suffix=".tmp", delete=False) as fp:
+                json.dump(self._entries, fp)
+            os.replace(fp.name, self._path)
+        except OSError as e:
+            self.logger.warn(f"failed to persist schema cache '{self._path}': {e}")
+            return
+        self._dirty = False
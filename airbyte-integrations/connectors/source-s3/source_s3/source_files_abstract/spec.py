@@ -5,7 +5,7 @@
 
 import json
 import re
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 from jsonschema import RefResolver
 from pydantic import BaseModel, Field
@@ -77,6 +77,17 @@ class SourceFilesAbstractSpec(BaseModel):
         order=30,
     )
 
+    schema_inference_sample_size: Optional[int] = Field(
+        title="Schema Inference Sample Size",
+        default=None,
+        minimum=1,
+        description="Optionally infer the schema only from this many most recently modified files, which speeds up discovery of "
+        "buckets with many files. Any other file is inferred right before it is read and can only widen the schema. "
+        "Leave empty to infer the schema from all files.",
+        examples=[100],
+        order=40,
+    )
+
     @staticmethod
     def change_format_to_oneOf(schema: dict) -> dict:
         props_to_change = ["format"]
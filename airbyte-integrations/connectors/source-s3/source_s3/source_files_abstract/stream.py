@@ -3,14 +3,21 @@
 #
 
 
+import hashlib
 import json
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timedelta
 from functools import lru_cache
+from itertools import islice
 from traceback import format_exc
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
 
+import pyarrow as pa
 from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models import FailureType
 from airbyte_cdk.models.airbyte_protocol import SyncMode
@@ -24,6 +31,8 @@ from .formats.avro_parser import AvroParser
 from .formats.csv_parser import CsvParser
 from .formats.jsonl_parser import JsonlParser
 from .formats.parquet_parser import ParquetParser
+from .prefetcher import FilePrefetcher
+from .schema_cache import SchemaCache
 from .storagefile import StorageFile
 
 JSON_TYPES = ["string", "number", "integer", "object", "array", "boolean", "null"]
@@ -35,6 +44,10 @@ class ConfigurationError(Exception):
     """Client mis-configured"""
 
 
+class HistoryDigestSet(set):
+    """Day of incremental history which is already indexed, i.e. holds file name digests only (serialized as a list)"""
+
+
 class FileStream(Stream, ABC):
     @property
     def fileformatparser_map(self) -> Mapping[str, type]:
@@ -52,14 +65,28 @@ class FileStream(Stream, ABC):
     ab_file_name_col = "_ab_source_file_url"
     airbyte_columns = [ab_additional_col, ab_last_mod_col, ab_file_name_col]
     datetime_format_string = "%Y-%m-%dT%H:%M:%S%z"
+    schema_inference_workers = 8  # max number of files opened concurrently to infer their schema
+    schema_cache_dir = os.path.join(tempfile.gettempdir(), "airbyte_file_schema_cache")  # set to None to disable the local cache
+    prefetch_max_files = 2  # max number of files downloaded ahead of the one being parsed, set to 0 to disable read-ahead
+    prefetch_max_bytes = 1024**3  # budget for the total size of files downloaded ahead, bigger files are streamed directly
+    prefetch_spool_max_size = 32 * 1024**2  # prefetched files are kept in memory up to this size and spilled to disk beyond
 
-    def __init__(self, dataset: str, provider: dict, format: dict, path_pattern: str, schema: str = None):
+    def __init__(
+        self,
+        dataset: str,
+        provider: dict,
+        format: dict,
+        path_pattern: str,
+        schema: str = None,
+        schema_inference_sample_size: Optional[int] = None,
+    ):
         """
         :param dataset: table name for this stream
         :param provider: provider specific mapping as described in spec.json
         :param format: file format specific mapping as described in spec.json
         :param path_pattern: glob-style pattern for file-matching (https://facelessuser.github.io/wcmatch/glob/)
         :param schema: JSON-syntax user provided schema, defaults to None
+        :param schema_inference_sample_size: if set, only infer the master schema from this many newest files, defaults to None
         """
         self.dataset = dataset
         self._path_pattern = path_pattern
@@ -69,6 +96,19 @@ class FileStream(Stream, ABC):
         if schema:
             self._schema = self._parse_user_input_schema(schema)
         self.master_schema: Dict[str, Any] = None
+        # types the records are coerced to on read, the master_schema widened by the files outside of the inference sample
+        self._coercion_schema: Dict[str, Any] = None
+        self._schema_inference_sample_size = schema_inference_sample_size
+        self._schema_inferred_files: Set[str] = set()
+        self._schema_cache = SchemaCache(
+            self.schema_cache_dir, {"dataset": dataset, "provider": provider, "path_pattern": path_pattern, "format": format}
+        )
+        self._prefetcher = FilePrefetcher(
+            lambda file_info: self.storagefile_class(file_info, self._provider),
+            max_files=self.prefetch_max_files,
+            max_bytes=self.prefetch_max_bytes,
+            spool_max_size=self.prefetch_spool_max_size,
+        )
         LOGGER.info(f"initialised stream with format: {format}")
 
     @staticmethod
@@ -202,13 +242,103 @@ class FileStream(Stream, ABC):
         if types == {"number", "string"}:
             return "string"
 
+    def _infer_file_schema(self, file_reader: AbstractFileParser, file_info: FileInfo) -> Tuple[Dict[str, Any], bool]:
+        """
+        Obtains the inferred schema of a single file from the local schema cache, or by opening the file and caching the result.
+        This runs in worker threads, so it only reads the cache and leaves writing it to the caller.
+
+        :return: tuple of (inferred schema, whether it was freshly inferred and needs to be cached)
+        """
+        cached_schema = self._schema_cache.get(file_info)
+        if cached_schema is not None:
+            return cached_schema, False
+        storagefile = self.storagefile_class(file_info, self._provider)
+        with storagefile.open(file_reader.is_binary) as f:
+            return file_reader.get_inferred_schema(f, file_info), True
+
+    def _infer_file_schemas(self, file_reader: AbstractFileParser, file_infos: List[FileInfo]) -> Iterator[Tuple[FileInfo, Dict[str, Any]]]:
+        """
+        Infers schemas of file_infos in a bounded thread pool, yielding them in the order of file_infos so merging stays deterministic.
+        At most schema_inference_workers files are being opened at once, files inferred before are served from the local cache.
+        Freshly inferred schemas are only set in the cache, writing the cache file is left to the caller.
+
+        :yield: tuple of (file_info, inferred schema)
+        """
+        executor = ThreadPoolExecutor(max_workers=self.schema_inference_workers)
+        try:
+            futures = deque()
+            file_infos_iter = iter(file_infos)
+            for file_info in islice(file_infos_iter, self.schema_inference_workers * 2):
+                futures.append((file_info, executor.submit(self._infer_file_schema, file_reader, file_info)))
+            while futures:
+                file_info, future = futures.popleft()
+                this_schema, fresh = future.result()
+                for next_file_info in islice(file_infos_iter, 1):
+                    futures.append((next_file_info, executor.submit(self._infer_file_schema, file_reader, next_file_info)))
+                if fresh:
+                    self._schema_cache.set(file_info, this_schema)
+                self._schema_inferred_files.add(file_info.key)
+                yield file_info, this_schema
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _merge_into_master_schema(
+        self, master_schema: Dict[str, Any], this_schema: Mapping[str, Any], file_info: FileInfo, processed_files: List[FileInfo]
+    ) -> None:
+        """
+        Widens master_schema in place with the inferred schema of a single file.
+        This runs datatype checks to Warn or Error if we find incompatible schemas (e.g. same column is 'date' in one file but 'float' in another).
+
+        :raises S3Exception: if we find datatype mismatches between files or between a file and schema state (provided or from previous inc. batch)
+        """
+        if this_schema == master_schema:
+            return  # exact schema match so go to next file
+
+        # creates a superset of columns retaining order of master_schema with any additional columns added to end
+        column_superset = list(master_schema.keys()) + [c for c in this_schema.keys() if c not in master_schema.keys()]
+        # this compares datatype of every column that the two schemas have in common
+        for col in column_superset:
+            if (col in master_schema.keys()) and (col in this_schema.keys()) and (master_schema[col] != this_schema[col]):
+                # If this column exists in a provided schema or schema state, we'll WARN here rather than throw an error.
+                # This is to allow more leniency as we may be able to coerce this datatype mismatch on read according to
+                # provided schema state. Else we're inferring the schema (or at least this column) from scratch, and therefore
+                # we try to choose the broadest type among two if possible
+                broadest_of_types = self._broadest_type(master_schema[col], this_schema[col])
+                type_explicitly_defined = col in self._schema.keys()
+                override_type = broadest_of_types and not type_explicitly_defined
+                if override_type:
+                    master_schema[col] = broadest_of_types
+                if override_type or type_explicitly_defined:
+                    LOGGER.warn(
+                        f"Detected mismatched datatype on column '{col}', in file '{file_info}'. "
+                        + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'. "
+                        + f"Airbyte will attempt to coerce this to {master_schema[col]} on read."
+                    )
+                    continue
+                # otherwise throw an error on mismatching datatypes
+                raise S3Exception(
+                    processed_files,
+                    "Column type mismatch",
+                    f"Detected mismatched datatype on column '{col}', in file '{file_info}'. "
+                    + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'.",
+                    failure_type=FailureType.config_error,
+                )
+
+        # missing columns in this_schema doesn't affect our master_schema, so we don't check for it here
+
+        # add to master_schema any columns from this_schema that aren't already present
+        for col, datatype in this_schema.items():
+            if col not in master_schema.keys():
+                master_schema[col] = datatype
+
     def _get_master_schema(self, min_datetime: datetime = None) -> Dict[str, Any]:
         """
         In order to auto-infer a schema across many files and/or allow for additional properties (columns),
             we need to determine the superset of schemas across all relevant files.
-        This method iterates through get_time_ordered_file_infos() obtaining the inferred schema (process implemented per file format),
-            to build up this superset schema (master_schema).
-        This runs datatype checks to Warn or Error if we find incompatible schemas (e.g. same column is 'date' in one file but 'float' in another).
+        This method infers the schema of files from get_time_ordered_file_infos() concurrently (process implemented per file format),
+            to build up this superset schema (master_schema) with _merge_into_master_schema() in time order.
+        If schema_inference_sample_size is set, only that many newest files are inferred here,
+            any other file is inferred right before it is read and only widens the types records are coerced to (see _widen_master_schema()).
         This caches the master_schema after first run in order to avoid repeated compute and network calls to infer schema on all files.
 
         :param min_datetime: if passed, will only use files with last_modified >= this to determine master schema
@@ -216,69 +346,56 @@ class FileStream(Stream, ABC):
         :raises RuntimeError: if we find datatype mismatches between files or between a file and schema state (provided or from previous inc. batch)
         :return: A dict of the JSON schema representing this stream.
         """
-        # TODO: could implement a (user-beware) 'lazy' mode that skips schema checking to improve performance
         # TODO: could utilise min_datetime to add a start_date parameter in spec for user
         if self.master_schema is None:
             master_schema = deepcopy(self._schema)
 
             file_reader = self.fileformatparser_class(self._format)
 
-            processed_files = []
-            for file_info in self.get_time_ordered_file_infos():
-                # skip this file if it's earlier than min_datetime
-                if (min_datetime is not None) and (file_info.last_modified < min_datetime):
-                    continue
+            # skip files earlier than min_datetime
+            file_infos = [
+                file_info
+                for file_info in self.get_time_ordered_file_infos()
+                if (min_datetime is None) or (file_info.last_modified >= min_datetime)
+            ]
+            if self._schema_inference_sample_size:
+                file_infos = file_infos[-self._schema_inference_sample_size :]
 
-                storagefile = self.storagefile_class(file_info, self._provider)
-                with storagefile.open(file_reader.is_binary) as f:
-                    this_schema = file_reader.get_inferred_schema(f, file_info)
-                    processed_files.append(file_info)
-
-                if this_schema == master_schema:
-                    continue  # exact schema match so go to next file
-
-                # creates a superset of columns retaining order of master_schema with any additional columns added to end
-                column_superset = list(master_schema.keys()) + [c for c in this_schema.keys() if c not in master_schema.keys()]
-                # this compares datatype of every column that the two schemas have in common
-                for col in column_superset:
-                    if (col in master_schema.keys()) and (col in this_schema.keys()) and (master_schema[col] != this_schema[col]):
-                        # If this column exists in a provided schema or schema state, we'll WARN here rather than throw an error.
-                        # This is to allow more leniency as we may be able to coerce this datatype mismatch on read according to
-                        # provided schema state. Else we're inferring the schema (or at least this column) from scratch, and therefore
-                        # we try to choose the broadest type among two if possible
-                        broadest_of_types = self._broadest_type(master_schema[col], this_schema[col])
-                        type_explicitly_defined = col in self._schema.keys()
-                        override_type = broadest_of_types and not type_explicitly_defined
-                        if override_type:
-                            master_schema[col] = broadest_of_types
-                        if override_type or type_explicitly_defined:
-                            LOGGER.warn(
-                                f"Detected mismatched datatype on column '{col}', in file '{file_info}'. "
-                                + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'. "
-                                + f"Airbyte will attempt to coerce this to {master_schema[col]} on read."
-                            )
-                            continue
-                        # otherwise throw an error on mismatching datatypes
-                        raise S3Exception(
-                            processed_files,
-                            "Column type mismatch",
-                            f"Detected mismatched datatype on column '{col}', in file '{file_info}'. "
-                            + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'.",
-                            failure_type=FailureType.config_error,
-                        )
-
-                # missing columns in this_schema doesn't affect our master_schema, so we don't check for it here
-
-                # add to master_schema any columns from this_schema that aren't already present
-                for col, datatype in this_schema.items():
-                    if col not in master_schema.keys():
-                        master_schema[col] = datatype
+            processed_files = []
+            for file_info, this_schema in self._infer_file_schemas(file_reader, file_infos):
+                processed_files.append(file_info)
+                self._merge_into_master_schema(master_schema, this_schema, file_info, processed_files)
 
+            self._schema_cache.save()
             LOGGER.info(f"determined master schema: {master_schema}")
             self.master_schema = master_schema
 
         return self.master_schema
 
+    def _get_coercion_schema(self, min_datetime: datetime = None) -> Dict[str, Any]:
+        """
+        The schema file readers coerce values to. It starts as a copy of the master_schema and is widened by _widen_master_schema(),
+        the master_schema itself is kept as discovered, since it's exposed in the catalog and saved to the state.
+        """
+        if self._coercion_schema is None:
+            self._coercion_schema = deepcopy(self._get_master_schema(min_datetime))
+        return self._coercion_schema
+
+    def _widen_master_schema(self, file_reader: AbstractFileParser, file_info: FileInfo) -> None:
+        """
+        In sampling mode files outside of the sample didn't take part in master schema inference.
+        We infer those right before reading them, so that a file disagreeing with the sampled schema widens the types
+        file_reader coerces values to rather than failing the read. The master_schema isn't changed, so the columns
+        it doesn't have still end up in _ab_additional_properties. The cache file is written once the read is over.
+        """
+        if not self._schema_inference_sample_size or self._coercion_schema is None or file_info.key in self._schema_inferred_files:
+            return
+        this_schema, fresh = self._infer_file_schema(file_reader, file_info)
+        if fresh:
+            self._schema_cache.set(file_info, this_schema)
+        self._schema_inferred_files.add(file_info.key)
+        self._merge_into_master_schema(self._coercion_schema, this_schema, file_info, [file_info])
+
     def stream_slices(
         self, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
     ) -> Iterable[Optional[Dict[str, Any]]]:
@@ -290,11 +407,14 @@ class FileStream(Stream, ABC):
         Incremental stream_slices are implemented in the IncrementalFileStream child class.
         """
 
-        # TODO: this could be optimised via concurrent reads, however we'd lose chronology and need to deal with knock-ons of that
-        # we could do this concurrently both full and incremental by running batches in parallel
-        # and then incrementing the cursor per each complete batch
-        for file_info in self.get_time_ordered_file_infos():
-            yield {"files": [{"storage_file": self.storagefile_class(file_info, self._provider)}]}
+        # files are still parsed one by one to keep chronology, but the next ones are downloaded while parsing (see FilePrefetcher)
+        self._prefetcher.schedule(self.get_time_ordered_file_infos())
+        try:
+            for file_info in self.get_time_ordered_file_infos():
+                yield {"files": [{"storage_file": self.storagefile_class(file_info, self._provider)}]}
+        finally:
+            self._prefetcher.close()
+            self._schema_cache.save()
 
     def _match_target_schema(self, record: Dict[str, Any], target_columns: List) -> Dict[str, Any]:
         """
@@ -323,6 +443,41 @@ class FileStream(Stream, ABC):
 
         return record
 
+    def _match_target_schema_batch(self, batch: pa.RecordBatch, target_columns: List, extra_map: Mapping[str, Any]) -> pa.RecordBatch:
+        """
+        Columnar counterpart of _match_target_schema() and _add_extra_fields_from_map() applied to a whole pyarrow RecordBatch at once.
+        Missing columns are filled with null arrays, additional columns are packed into a struct array for _ab_additional_properties
+        and every field of extra_map is added as a constant column.
+
+        :param batch: pyarrow RecordBatch streamed by a columnar AbstractFileParser
+        :param target_columns: list of column names to mutate this batch into (obtained via self._get_schema_map().keys() as of now)
+        :param extra_map: map of additional columns and values to add
+        :return: new RecordBatch with columns lining up to target_columns
+        """
+        compare_columns = [c for c in target_columns if c not in [self.ab_last_mod_col, self.ab_file_name_col]]
+        batch_columns = batch.schema.names
+        names = list(batch_columns)
+        arrays = [batch.column(i) for i in range(batch.num_columns)]
+        # missing columns
+        for c in compare_columns:
+            if c != self.ab_additional_col and c not in batch_columns:
+                names.append(c)
+                arrays.append(pa.nulls(batch.num_rows))
+        # additional columns
+        additional_columns = [c for c in batch_columns if c not in compare_columns]
+        if additional_columns:
+            keep = [i for i, c in enumerate(names) if c not in additional_columns]
+            additional = pa.StructArray.from_arrays([batch.column(c) for c in additional_columns], names=additional_columns)
+            names, arrays = [names[i] for i in keep], [arrays[i] for i in keep]
+        else:
+            additional = pa.array([{}] * batch.num_rows, type=pa.struct([]))
+        names.append(self.ab_additional_col)
+        arrays.append(additional)
+        for key, value in extra_map.items():
+            names.append(key)
+            arrays.append(pa.repeat(value, batch.num_rows))
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+
     def _add_extra_fields_from_map(self, record: Dict[str, Any], extra_map: Mapping[str, Any]) -> Mapping[str, Any]:
         """
         Simple method to take a mapping of columns:values and add them to the provided record
@@ -343,23 +498,33 @@ class FileStream(Stream, ABC):
     ) -> Iterable[Mapping[str, Any]]:
         """
         Uses provider-relevant StorageFile to open file and then iterates through stream_records() using format-relevant AbstractFileParser.
-        Records are mutated on the fly using _match_target_schema() and _add_extra_fields_from_map() to achieve desired final schema.
+        Records are mutated on the fly using _match_target_schema() and _add_extra_fields_from_map() to achieve desired final schema,
+        or for columnar formats whole batches are matched at once using _match_target_schema_batch().
         Since this is called per stream_slice, this method works for both full_refresh and incremental.
         """
-        for file_item in stream_slice["files"]:
-            storage_file: StorageFile = file_item["storage_file"]
-            with storage_file.open(file_reader.is_binary) as f:
-                # TODO: make this more efficient than mutating every record one-by-one as they stream
-                for record in file_reader.stream_records(f, storage_file.file_info):
-                    schema_matched_record = self._match_target_schema(record, list(self._get_schema_map().keys()))
-                    complete_record = self._add_extra_fields_from_map(
-                        schema_matched_record,
-                        {
-                            self.ab_last_mod_col: datetime.strftime(storage_file.last_modified, self.datetime_format_string),
-                            self.ab_file_name_col: storage_file.url,
-                        },
-                    )
-                    yield complete_record
+        target_columns = list(self._get_schema_map().keys())
+        try:
+            for file_item in stream_slice["files"]:
+                storage_file: StorageFile = file_item["storage_file"]
+                extra_map = {
+                    self.ab_last_mod_col: datetime.strftime(storage_file.last_modified, self.datetime_format_string),
+                    self.ab_file_name_col: storage_file.url,
+                }
+                self._widen_master_schema(file_reader, storage_file.file_info)
+                with self._prefetcher.open(storage_file, file_reader.is_binary) as f:
+                    if file_reader.is_columnar:
+                        # schema matching runs once per batch on Arrow arrays, python dicts are only built for the final records
+                        for batch in file_reader.stream_batches(f, storage_file.file_info):
+                            yield from self._match_target_schema_batch(batch, target_columns, extra_map).to_pylist()
+                        continue
+                    for record in file_reader.stream_records(f, storage_file.file_info):
+                        schema_matched_record = self._match_target_schema(record, target_columns)
+                        yield self._add_extra_fields_from_map(schema_matched_record, extra_map)
+        except BaseException:
+            # the read failed or was interrupted, the files prefetched for the next slices won't be read
+            self._prefetcher.close()
+            self._schema_cache.save()
+            raise
         LOGGER.info("finished reading a stream slice")
 
     def read_records(
@@ -373,7 +538,7 @@ class FileStream(Stream, ABC):
         The heavy lifting sits in _read_from_slice() which is full refresh / incremental agnostic
         """
         if stream_slice:
-            file_reader = self.fileformatparser_class(self._format, self._get_master_schema())
+            file_reader = self.fileformatparser_class(self._format, self._get_coercion_schema())
             yield from self._read_from_slice(file_reader, stream_slice)
 
 
@@ -382,7 +547,14 @@ class IncrementalFileStream(FileStream, ABC):
     state_checkpoint_interval = None
     buffer_days = 3  # keeping track of all files synced in the last N days
     sync_all_files_always = False
-    max_history_size = 1000000000
+    max_history_size = 100000  # number of files kept in history, past this the history is dropped and every file is synced again
+    history_digest_size = 20  # history keeps this many hex chars of a sha256 per file name rather than the (potentially long) name
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # state returned for the file read most recently, every following record of the same file maps to this same state
+        self._latest_state: Optional[Mapping[str, Any]] = None
+        self._latest_state_key: Optional[Tuple[str, str]] = None
 
     @property
     def cursor_field(self) -> str:
@@ -391,12 +563,32 @@ class IncrementalFileStream(FileStream, ABC):
         """
         return self.ab_last_mod_col
 
-    @staticmethod
-    def file_in_history(file_info: FileInfo, history: dict) -> bool:
-        for slot in history.values():
-            if file_info.key in slot:
-                return file_info.key in slot
-        return False
+    @classmethod
+    def file_history_digest(cls, file_name: str) -> str:
+        return hashlib.sha256(file_name.encode()).hexdigest()[: cls.history_digest_size]
+
+    @classmethod
+    def _index_history(cls, stream_state: Optional[Mapping[str, Any]]) -> Dict[str, Set[str]]:
+        """
+        Returns the history of the state as file name digests per day, every day as a set so membership checks are O(1).
+        Digests are kept under "history_digests", states written by previous versions hold plain file names under "history" instead,
+        these are converted to digests. Days loaded from state (lists) are converted to sets, days already indexed are reused as is.
+        """
+        if not stream_state:
+            return {}
+        history = {
+            date: slot if isinstance(slot, HistoryDigestSet) else HistoryDigestSet(slot)
+            for date, slot in stream_state.get("history_digests", {}).items()
+        }
+        for date, file_names in stream_state.get("history", {}).items():
+            history.setdefault(date, HistoryDigestSet()).update(cls.file_history_digest(file_name) for file_name in file_names)
+        return history
+
+    @classmethod
+    def file_in_history(cls, file_info: FileInfo, history: dict) -> bool:
+        """history is expected to be indexed via _index_history()"""
+        digest = cls.file_history_digest(file_info.key)
+        return any(digest in slot for slot in history.values())
 
     def _get_datetime_from_stream_state(self, stream_state: Mapping[str, Any] = None) -> datetime:
         """if no state, we default to 1970-01-01 in order to pick up all files present."""
@@ -407,20 +599,20 @@ class IncrementalFileStream(FileStream, ABC):
 
     def get_updated_history(self, current_stream_state, latest_record_datetime, latest_record, current_parsed_datetime, state_date):
         """
-        History is dict which basically groups files by their modified_at date.
-        After reading each record we add its file to the history set if it wasn't already there.
+        History is dict which basically groups files by their modified_at date, storing a digest of each file name (file_history_digest()).
+        After reading each file we add it to the history set if it wasn't already there, every day is kept as a set so this is O(1).
         Then we drop from the history set any entries whose key is less than now - buffer_days
         """
 
-        history = current_stream_state.get("history", {})
+        history = self._index_history(current_stream_state)
 
         file_modification_date = latest_record_datetime.strftime("%Y-%m-%d")
 
         # add record to history if record modified date in range delta start from state
         if latest_record_datetime.date() + timedelta(days=self.buffer_days) >= state_date:
-            history_item = set(history.setdefault(file_modification_date, set()))
-            history_item.add(latest_record[self.ab_file_name_col])
-            history[file_modification_date] = history_item
+            history.setdefault(file_modification_date, HistoryDigestSet()).add(
+                self.file_history_digest(latest_record[self.ab_file_name_col])
+            )
 
         # reset history to new date state
         if current_parsed_datetime.date() != state_date:
@@ -434,13 +626,13 @@ class IncrementalFileStream(FileStream, ABC):
 
     def size_history_balancer(self, state_dict):
         """
-        Delete history if state size limit reached
+        Delete history if it holds more than max_history_size files
         """
-        history = state_dict["history"]
+        history = state_dict["history_digests"]
 
-        if history.__sizeof__() > self.max_history_size:
+        if sum(len(slot) for slot in history.values()) > self.max_history_size:
             self.sync_all_files_always = True
-            state_dict.pop("history")
+            state_dict.pop("history_digests")
 
         return state_dict
 
@@ -449,11 +641,16 @@ class IncrementalFileStream(FileStream, ABC):
         Inspects the latest record extracted from the data source and the current state object and return an updated state object.
         In the case where current_stream_state is null, we default to 1970-01-01 in order to pick up all files present.
         We also save the schema into the state here so that we can use it on future incremental batches, allowing for additional/missing columns.
+        All records of a file share the cursor value and history entry, so the state is only rebuilt once per file.
 
         :param current_stream_state: The stream's current state object
         :param latest_record: The latest record extracted from the stream
         :return: An updated state object
         """
+        state_key = (latest_record.get(self.cursor_field), latest_record.get(self.ab_file_name_col))
+        if current_stream_state is not None and current_stream_state is self._latest_state and state_key == self._latest_state_key:
+            return current_stream_state
+
         state_dict: Dict[str, Any] = {}
         current_parsed_datetime = self._get_datetime_from_stream_state(current_stream_state)
         latest_record_datetime = datetime.strptime(
@@ -466,27 +663,29 @@ class IncrementalFileStream(FileStream, ABC):
         state_date = self._get_datetime_from_stream_state(state_dict).date()
 
         if not self.sync_all_files_always:
-            state_dict["history"] = self.get_updated_history(
+            state_dict["history_digests"] = self.get_updated_history(
                 current_stream_state, latest_record_datetime, latest_record, current_parsed_datetime, state_date
             )
 
-        return self.size_history_balancer(state_dict)
+        self._latest_state, self._latest_state_key = self.size_history_balancer(state_dict), state_key
+        return self._latest_state
 
     def need_to_skip_file(self, stream_state, file_info):
         """
         Skip this file if last_mod is earlier than our cursor value from state and already in history
         or skip this file if last_mod plus delta is earlier than our cursor value
         """
+        history = self._index_history(stream_state)
         file_in_history_and_last_modified_is_earlier_than_cursor_value = (
             stream_state is not None
             and self.cursor_field in stream_state.keys()
             and file_info.last_modified <= self._get_datetime_from_stream_state(stream_state)
-            and self.file_in_history(file_info, stream_state.get("history", {}))
+            and self.file_in_history(file_info, history)
         )
 
         file_is_not_in_history_and_last_modified_plus_buffer_days_is_earlier_than_cursor_value = file_info.last_modified + timedelta(
             days=self.buffer_days
-        ) < self._get_datetime_from_stream_state(stream_state) and not self.file_in_history(file_info, stream_state.get("history", {}))
+        ) < self._get_datetime_from_stream_state(stream_state) and not self.file_in_history(file_info, history)
 
         return (
             file_in_history_and_last_modified_is_earlier_than_cursor_value
@@ -517,26 +716,36 @@ class IncrementalFileStream(FileStream, ABC):
             # logic here is to bundle all files with exact same last modified timestamp together in each slice
             prev_file_last_mod: datetime = None  # init variable to hold previous iterations last modified
             grouped_files_by_time: List[Dict[str, Any]] = []
-            for file_info in self.get_time_ordered_file_infos():
-                if self.need_to_skip_file(stream_state, file_info):
-                    continue
-
-                # check if this file belongs in the next slice, if so yield the current slice before this file
-                if (prev_file_last_mod is not None) and (file_info.last_modified != prev_file_last_mod):
+            # history is indexed once here rather than converted for every file
+            indexed_state = stream_state
+            if stream_state:
+                indexed_state = {key: value for key, value in stream_state.items() if key != "history"}
+                indexed_state["history_digests"] = self._index_history(stream_state)
+            file_infos = [
+                file_info for file_info in self.get_time_ordered_file_infos() if not self.need_to_skip_file(indexed_state, file_info)
+            ]
+            self._prefetcher.schedule(file_infos)
+            try:
+                for file_info in file_infos:
+                    # check if this file belongs in the next slice, if so yield the current slice before this file
+                    if (prev_file_last_mod is not None) and (file_info.last_modified != prev_file_last_mod):
+                        yield {"files": grouped_files_by_time}
+                        grouped_files_by_time.clear()
+
+                    # now we either have an empty stream_slice or a stream_slice that this file shares a last modified with, so append it
+                    grouped_files_by_time.append({"storage_file": self.storagefile_class(file_info, self._provider)})
+                    # update our prev_file_last_mod to the current one for next iteration
+                    prev_file_last_mod = file_info.last_modified
+
+                # now yield the final stream_slice. This is required because our loop only yields the slice previous to its current iteration.
+                if len(grouped_files_by_time) > 0:
                     yield {"files": grouped_files_by_time}
-                    grouped_files_by_time.clear()
-
-                # now we either have an empty stream_slice or a stream_slice that this file shares a last modified with, so append it
-                grouped_files_by_time.append({"storage_file": self.storagefile_class(file_info, self._provider)})
-                # update our prev_file_last_mod to the current one for next iteration
-                prev_file_last_mod = file_info.last_modified
-
-            # now yield the final stream_slice. This is required because our loop only yields the slice previous to its current iteration.
-            if len(grouped_files_by_time) > 0:
-                yield {"files": grouped_files_by_time}
-            else:
-                # in case we have no files
-                yield None
+                else:
+                    # in case we have no files
+                    yield None
+            finally:
+                self._prefetcher.close()
+                self._schema_cache.save()
 
     def read_records(
         self,
@@ -557,6 +766,6 @@ class IncrementalFileStream(FileStream, ABC):
             else:
 
                 file_reader = self.fileformatparser_class(
-                    self._format, self._get_master_schema(self._get_datetime_from_stream_state(stream_state))
+                    self._format, self._get_coercion_schema(self._get_datetime_from_stream_state(stream_state))
                 )
                 yield from self._read_from_slice(file_reader, stream_slice)
@@ -15,6 +15,7 @@ from netifaces import AF_INET, ifaddresses, interfaces
 from pytest import fixture
 from requests.exceptions import ConnectionError  # noqa
 from source_s3 import SourceS3
+from source_s3.source_files_abstract.stream import FileStream
 
 logger = AirbyteLogger()
 
@@ -35,6 +36,13 @@ def pytest_sessionfinish(session: Any, exitstatus: Any) -> None:
     shutil.rmtree(TMP_FOLDER, ignore_errors=True)
 
 
+@fixture(autouse=True)
+def schema_cache_dir(tmp_path, monkeypatch):
+    """isolates the local schema cache of every test, otherwise schemas inferred by one test would be served to another"""
+    monkeypatch.setattr(FileStream, "schema_cache_dir", str(tmp_path / "schema_cache"))
+    return tmp_path / "schema_cache"
+
+
 @fixture(name="config")
 def config_fixture(tmp_path):
     config_file = tmp_path / "config.json"
@@ -7,6 +7,7 @@ import copy
 import gzip
 import os
 import shutil
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, List, Mapping
 
@@ -251,3 +252,30 @@ class TestParquetParser(AbstractTestParser):
     def test_convert_field_data(self):
         with pytest.raises(TypeError):
             ParquetParser.convert_field_data(logical_type="", field_value="")
+
+    @pytest.mark.parametrize(
+        "logical_type,arrow_type",
+        [
+            ("timestamp", pa.timestamp("s")),
+            ("timestamp", pa.timestamp("ms")),
+            ("timestamp", pa.timestamp("ns")),
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("timestamp", pa.timestamp("ms", tz="America/New_York")),
+            ("time", pa.time32("s")),
+            ("time", pa.time32("ms")),
+            ("time", pa.time64("us")),
+            ("date", pa.date32()),
+        ],
+    )
+    def test_convert_field_array(self, logical_type: str, arrow_type: pa.DataType):
+        values = [datetime(2021, 1, 2, 3, 4, 5), datetime(2021, 1, 2, 3, 4, 5, 123000), None, datetime(1969, 12, 31, 23, 59, 59)]
+        if pa.types.is_time(arrow_type):
+            values = [value and value.time() for value in values]
+        elif pa.types.is_date(arrow_type):
+            values = [value and value.date() for value in values]
+        elif arrow_type.tz:
+            values = [value and value.replace(tzinfo=timezone.utc) for value in values]
+        field_array = pa.array(values).cast(arrow_type, safe=False)
+
+        expected = [ParquetParser.convert_field_data(logical_type, value) for value in field_array.to_pylist()]
+        assert ParquetParser.convert_field_array(logical_type, field_array).to_pylist() == expected
@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+from contextlib import contextmanager
+from datetime import datetime
+from typing import BinaryIO, Iterator, List
+
+import pytest
+from source_s3.source_files_abstract.file_info import FileInfo
+from source_s3.source_files_abstract.prefetcher import FilePrefetcher
+from source_s3.source_files_abstract.storagefile import StorageFile
+
+
+class InMemoryStorageFile(StorageFile):
+    opened: List[str] = []
+
+    @contextmanager
+    def open(self, binary: bool) -> Iterator[BinaryIO]:
+        self.opened.append(self.file_info.key)
+        if self.file_info.key == "broken":
+            raise OSError("connection reset")
+        yield io.BytesIO(self.file_info.key.encode() * self.file_info.size)
+
+
+def make_file_infos(*sizes: int) -> List[FileInfo]:
+    return [FileInfo(key=f"file_{i}", size=size, last_modified=datetime(2022, 1, 1, 0, 0, i)) for i, size in enumerate(sizes)]
+
+
+@pytest.fixture(autouse=True)
+def reset_opened():
+    InMemoryStorageFile.opened = []
+
+
+def read_all(prefetcher: FilePrefetcher, file_infos: List[FileInfo]) -> List[bytes]:
+    contents = []
+    for file_info in file_infos:
+        with prefetcher.open(InMemoryStorageFile(file_info, {}), binary=True) as f:
+            contents.append(f.read())
+    return contents
+
+
+def test_prefetched_files_are_read_in_order():
+    file_infos = make_file_infos(3, 1, 2, 5)
+    prefetcher = FilePrefetcher(lambda file_info: InMemoryStorageFile(file_info, {}), max_files=2, max_bytes=100, spool_max_size=2)
+    prefetcher.schedule(file_infos)
+
+    assert read_all(prefetcher, file_infos) == [file_info.key.encode() * file_info.size for file_info in file_infos]
+    assert sorted(InMemoryStorageFile.opened) == [file_info.key for file_info in file_infos]
+    assert prefetcher._prefetched_bytes == 0
+
+
+def test_files_over_budget_are_streamed_directly():
+    file_infos = make_file_infos(1, 50, 1)
+    prefetcher = FilePrefetcher(lambda file_info: InMemoryStorageFile(file_info, {}), max_files=2, max_bytes=10, spool_max_size=2)
+    prefetcher.schedule(file_infos)
+    # the big file holds back prefetching of the files behind it
+    assert list(prefetcher._prefetched) == ["file_0"]
+
+    assert read_all(prefetcher, file_infos) == [file_info.key.encode() * file_info.size for file_info in file_infos]
+    assert InMemoryStorageFile.opened.count("file_1") == 1
+
+
+def test_unscheduled_files_are_opened_directly():
+    file_infos = make_file_infos(1, 2)
+    prefetcher = FilePrefetcher(lambda file_info: InMemoryStorageFile(file_info, {}), max_files=0, max_bytes=10, spool_max_size=2)
+    prefetcher.schedule(file_infos)
+
+    assert read_all(prefetcher, file_infos) == [b"file_0", b"file_1file_1"]
+    assert InMemoryStorageFile.opened == ["file_0", "file_1"]
+
+
+def test_download_errors_are_raised_on_open():
+    file_info = FileInfo(key="broken", size=1, last_modified=datetime(2022, 1, 1))
+    prefetcher = FilePrefetcher(lambda file_info: InMemoryStorageFile(file_info, {}), max_files=1, max_bytes=10, spool_max_size=2)
+    prefetcher.schedule([file_info])
+
+    with pytest.raises(OSError, match="connection reset"):
+        read_all(prefetcher, [file_info])
+    assert prefetcher._prefetched_bytes == 0
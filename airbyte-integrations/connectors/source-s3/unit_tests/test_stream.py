@@ -2,10 +2,12 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+from copy import deepcopy
 from datetime import datetime
 from typing import Any, Dict, List, Mapping
 from unittest.mock import MagicMock, patch
 
+import pyarrow as pa
 import pytest
 from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.models import SyncMode
@@ -21,9 +23,7 @@ LOGGER = AirbyteLogger()
 
 
 def mock_big_size_object():
-    mock = MagicMock()
-    mock.__sizeof__.return_value = 1000000001
-    return mock
+    return {"2022-07-01": [f"old_test_file_{i}.csv" for i in range(IncrementalFileStream.max_history_size + 1)]}
 
 
 class TestIncrementalFileStream:
@@ -121,6 +121,61 @@ class TestIncrementalFileStream:
                 fs._match_target_schema(record, target_columns)
                 LOGGER.debug(str(e_info))
 
+    @pytest.mark.parametrize(
+        "target_columns, records, expected_records",
+        [
+            (  # simple case
+                ["id", "first_name", "last_name"],
+                [{"id": "1", "first_name": "Frodo", "last_name": "Baggins"}, {"id": "2", "first_name": "Samwise", "last_name": "Gamgee"}],
+                [
+                    {"id": "1", "first_name": "Frodo", "last_name": "Baggins", "_ab_additional_properties": {}, "friend": "Gollum"},
+                    {"id": "2", "first_name": "Samwise", "last_name": "Gamgee", "_ab_additional_properties": {}, "friend": "Gollum"},
+                ],
+            ),
+            (  # additional and missing columns
+                ["id", "first_name", "last_name", "friends", "enemies"],
+                [
+                    {"id": "1", "first_name": "Frodo", "last_name": "Baggins", "location": "The Shire", "items": ["The One Ring", "Sting"]},
+                    {"id": "2", "first_name": "Samwise", "last_name": "Gamgee", "location": None, "items": []},
+                ],
+                [
+                    {
+                        "id": "1",
+                        "first_name": "Frodo",
+                        "last_name": "Baggins",
+                        "friends": None,
+                        "enemies": None,
+                        "_ab_additional_properties": {"location": "The Shire", "items": ["The One Ring", "Sting"]},
+                        "friend": "Gollum",
+                    },
+                    {
+                        "id": "2",
+                        "first_name": "Samwise",
+                        "last_name": "Gamgee",
+                        "friends": None,
+                        "enemies": None,
+                        "_ab_additional_properties": {"location": None, "items": []},
+                        "friend": "Gollum",
+                    },
+                ],
+            ),
+        ],
+        ids=["simple_case", "additional_and_missing_columns"],
+    )
+    @patch(
+        "source_s3.source_files_abstract.stream.IncrementalFileStream.__abstractmethods__", set()
+    )  # patching abstractmethods to empty set so we can instantiate ABC to test
+    def test_match_target_schema_batch(
+        self, target_columns: List[str], records: List[Dict[str, Any]], expected_records: List[Mapping[str, Any]]
+    ) -> None:
+        fs = IncrementalFileStream(dataset="dummy", provider={}, format={}, path_pattern="")
+        batch = pa.RecordBatch.from_pylist(records)
+        assert fs._match_target_schema_batch(batch, target_columns, {"friend": "Gollum"}).to_pylist() == expected_records
+        # the columnar path has to produce exactly what the per-record path does
+        assert expected_records == [
+            fs._add_extra_fields_from_map(fs._match_target_schema(record, target_columns), {"friend": "Gollum"}) for record in records
+        ]
+
     @pytest.mark.parametrize(  # set expected_return_record to None for an expected fail
         "extra_map, record, expected_return_record",
         [
@@ -369,11 +424,62 @@ class TestIncrementalFileStream:
     def test_get_updated_history(self, latest_record, current_stream_state, expected, request) -> None:
         fs = IncrementalFileStream(dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**/prefix*.csv")
         fs._get_schema_map = MagicMock(return_value={})
-        assert fs.get_updated_state(current_stream_state, latest_record).get("history") == expected
+        if expected is not None:
+            # history stores digests of file names
+            expected = {date: {fs.file_history_digest(file_name) for file_name in file_names} for date, file_names in expected.items()}
+        updated_state = fs.get_updated_state(current_stream_state, latest_record)
+        assert updated_state.get("history_digests") == expected
+        # plain file names history of previous versions is not written back
+        assert "history" not in updated_state
 
         if request.node.callspec.id == "history_size_limit_reached":
             assert fs.sync_all_files_always
 
+    @patch(
+        "source_s3.source_files_abstract.stream.IncrementalFileStream.__abstractmethods__", set()
+    )  # patching abstractmethods to empty set so we can instantiate ABC to test
+    def test_get_updated_state_once_per_file(self) -> None:
+        fs = IncrementalFileStream(dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**/prefix*.csv")
+        fs._get_schema_map = MagicMock(return_value={})
+        state = {"_ab_source_file_last_modified": "2022-07-01T00:00:00+0000", "history": {"2022-07-01": ["old_test_file.csv"]}}
+        for file_name, last_modified in [("a.csv", "2022-07-02T00:00:00+0000"), ("b.csv", "2022-07-03T00:00:00+0000")]:
+            for record_id in range(3):
+                record = {"id": record_id, "_ab_source_file_last_modified": last_modified, "_ab_source_file_url": file_name}
+                state = fs.get_updated_state(state, record)
+
+        assert fs._get_schema_map.call_count == 2
+        assert state["_ab_source_file_last_modified"] == "2022-07-03T00:00:00+0000"
+        assert state["history_digests"] == {
+            "2022-07-01": {fs.file_history_digest("old_test_file.csv")},
+            "2022-07-02": {fs.file_history_digest("a.csv")},
+            "2022-07-03": {fs.file_history_digest("b.csv")},
+        }
+
+    @pytest.mark.parametrize(
+        "stream_state",
+        [
+            {"history": {"2022-07-01": ["old_test_file.csv"]}},
+            {"history_digests": {"2022-07-01": [IncrementalFileStream.file_history_digest("old_test_file.csv")]}},
+            # a file name which looks like a digest is still a file name
+            {"history": {"2022-07-01": ["0123456789abcdef0123", "old_test_file.csv"]}},
+        ],
+        ids=["file_names", "file_name_digests", "file_name_of_digest_length"],
+    )
+    @patch(
+        "source_s3.source_files_abstract.stream.IncrementalFileStream.__abstractmethods__", set()
+    )  # patching abstractmethods to empty set so we can instantiate ABC to test
+    def test_file_in_history(self, stream_state) -> None:
+        indexed_history = IncrementalFileStream._index_history(stream_state)
+        assert IncrementalFileStream.file_in_history(
+            FileInfo(key="old_test_file.csv", size=1, last_modified=datetime.now()), indexed_history
+        )
+        assert not IncrementalFileStream.file_in_history(
+            FileInfo(key="new_test_file.csv", size=1, last_modified=datetime.now()), indexed_history
+        )
+        assert IncrementalFileStream.file_in_history(
+            FileInfo(key="0123456789abcdef0123", size=1, last_modified=datetime.now()), indexed_history
+        ) == ("0123456789abcdef0123" in stream_state.get("history", {}).get("2022-07-01", []))
+
     @pytest.mark.parametrize(  # set expected_return_record to None for an expected fail
         "stream_state, expected_error",
         [
@@ -453,6 +559,34 @@ class TestIncrementalFileStream:
 
         assert not records
 
+    @pytest.mark.parametrize("sync_mode", (SyncMode.full_refresh, SyncMode.incremental))
+    def test_prefetcher_closed_after_read(self, sync_mode):
+        stream_instance = IncrementalFileStreamS3(
+            dataset="dummy", provider={"bucket": "test-test"}, format={}, path_pattern="**/prefix*.csv"
+        )
+        stream_instance._list_bucket = MagicMock()
+        stream_instance._prefetcher = MagicMock()
+
+        for slice in stream_instance.stream_slices(sync_mode=sync_mode):
+            list(stream_instance.read_records(stream_slice=slice, sync_mode=sync_mode))
+
+        stream_instance._prefetcher.close.assert_called_once()
+
+    def test_prefetcher_closed_on_failed_read(self):
+        stream_instance = IncrementalFileStreamS3(
+            dataset="dummy", provider={"bucket": "test-test"}, format={}, path_pattern="**/prefix*.csv"
+        )
+        stream_instance._prefetcher = MagicMock()
+        stream_instance._prefetcher.open.side_effect = OSError("connection reset")
+        stream_instance._get_schema_map = MagicMock(return_value={})
+        stream_instance._widen_master_schema = MagicMock()
+        storage_file = MagicMock(last_modified=datetime(2022, 2, 2), url="s3://test-test/prefix.csv")
+
+        with pytest.raises(OSError):
+            list(stream_instance._read_from_slice(MagicMock(), stream_slice={"files": [{"storage_file": storage_file}]}))
+
+        stream_instance._prefetcher.close.assert_called_once()
+
     def test_fileformatparser_map(self):
         stream_instance = IncrementalFileStreamS3(
             dataset="dummy", provider={"bucket": "test-test"}, format={}, path_pattern="**/prefix*.csv"
@@ -636,7 +770,12 @@ class TestIncrementalFileStream:
     def test_master_schema(
         self, capsys, user_schema, min_datetime, ordered_file_infos, file_schemas, expected_schema, log_expected, error_expected
     ):
-        file_format_parser_mock = MagicMock(return_value=MagicMock(get_inferred_schema=MagicMock(side_effect=file_schemas)))
+        # schemas are inferred concurrently, so they are looked up by file rather than by order of calls
+        inferred_files = [file_info for file_info in ordered_file_infos if file_info.last_modified >= min_datetime]
+        schemas_by_file = {file_info.key: schema for file_info, schema in zip(inferred_files, file_schemas)}
+        file_format_parser_mock = MagicMock(
+            return_value=MagicMock(get_inferred_schema=MagicMock(side_effect=lambda f, file_info: schemas_by_file[file_info.key]))
+        )
         with patch.object(IncrementalFileStreamS3, "fileformatparser_class", file_format_parser_mock):
             with patch.object(IncrementalFileStreamS3, "get_time_ordered_file_infos", MagicMock(return_value=ordered_file_infos)):
                 stream_instance = IncrementalFileStreamS3(
@@ -651,6 +790,96 @@ class TestIncrementalFileStream:
                         captured = capsys.readouterr()
                         assert "Detected mismatched datatype" in captured.out
 
+    @patch("source_s3.stream.IncrementalFileStreamS3.storagefile_class", MagicMock())
+    def test_master_schema_cached_per_file(self):
+        file_infos = [
+            FileInfo(last_modified=datetime(2022, 1, 1, 13, 5, 5), key="first", size=128, etag='"a"'),
+            FileInfo(last_modified=datetime(2022, 6, 7, 8, 9, 10), key="second", size=128, etag='"b"'),
+        ]
+        get_inferred_schema = MagicMock(side_effect=lambda f, file_info: {f"{file_info.key}_column": "string"})
+        file_format_parser_mock = MagicMock(return_value=MagicMock(get_inferred_schema=get_inferred_schema))
+        with patch.object(IncrementalFileStreamS3, "fileformatparser_class", file_format_parser_mock):
+            with patch.object(IncrementalFileStreamS3, "get_time_ordered_file_infos", MagicMock(return_value=file_infos)):
+                stream_kwargs = dict(dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**")
+                expected_schema = {"first_column": "string", "second_column": "string"}
+                assert IncrementalFileStreamS3(**stream_kwargs)._get_master_schema() == expected_schema
+                assert get_inferred_schema.call_count == 2
+                # a new stream instance (e.g. read after discover) doesn't open unchanged files again
+                assert IncrementalFileStreamS3(**stream_kwargs)._get_master_schema() == expected_schema
+                assert get_inferred_schema.call_count == 2
+                # a changed etag invalidates the cached schema of that file only
+                file_infos[1].etag = '"c"'
+                assert IncrementalFileStreamS3(**stream_kwargs)._get_master_schema() == expected_schema
+                assert get_inferred_schema.call_count == 3
+                # the cache isn't shared by the streams of the same name reading another bucket
+                assert IncrementalFileStreamS3(**{**stream_kwargs, "provider": {"bucket": "other"}})._get_master_schema() == expected_schema
+                assert get_inferred_schema.call_count == 5
+
+    @patch("source_s3.stream.IncrementalFileStreamS3.storagefile_class", MagicMock())
+    def test_master_schema_sampling(self):
+        file_infos = [
+            FileInfo(last_modified=datetime(2022, 1, 1, 13, 5, 5), key="first", size=128),
+            FileInfo(last_modified=datetime(2022, 6, 7, 8, 9, 10), key="second", size=128),
+            FileInfo(last_modified=datetime(2022, 7, 7, 8, 9, 10), key="third", size=128),
+        ]
+        file_schemas = {"first": {"id": "string", "name": "string"}, "second": {"id": "integer"}, "third": {"id": "integer"}}
+        get_inferred_schema = MagicMock(side_effect=lambda f, file_info: file_schemas[file_info.key])
+        file_reader = MagicMock(get_inferred_schema=get_inferred_schema)
+        with patch.object(IncrementalFileStreamS3, "fileformatparser_class", MagicMock(return_value=file_reader)):
+            with patch.object(IncrementalFileStreamS3, "get_time_ordered_file_infos", MagicMock(return_value=file_infos)):
+                stream_instance = IncrementalFileStreamS3(
+                    dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**", schema_inference_sample_size=2
+                )
+                assert stream_instance._get_master_schema() == {"id": "integer"}
+                assert [call.args[1].key for call in get_inferred_schema.call_args_list] == ["second", "third"]
+                # files outside of the sample widen the types values are coerced to right before they are read
+                assert stream_instance._get_coercion_schema() == {"id": "integer"}
+                stream_instance._widen_master_schema(file_reader, file_infos[2])
+                assert get_inferred_schema.call_count == 2
+                stream_instance._widen_master_schema(file_reader, file_infos[0])
+                assert stream_instance._get_coercion_schema() == {"id": "string", "name": "string"}
+                # the discovered schema is kept as is
+                assert stream_instance._get_master_schema() == {"id": "integer"}
+
+    @patch(
+        "source_s3.stream.IncrementalFileStreamS3.storagefile_class",
+        MagicMock(side_effect=lambda file_info, provider: MagicMock(file_info=file_info, last_modified=file_info.last_modified)),
+    )
+    def test_read_files_outside_of_sample_with_extra_columns(self):
+        file_infos = [
+            FileInfo(last_modified=datetime(2022, 1, 1, 13, 5, 5), key="first", size=128),
+            FileInfo(last_modified=datetime(2022, 2, 1, 13, 5, 5), key="second", size=128),
+            FileInfo(last_modified=datetime(2022, 7, 7, 8, 9, 10), key="third", size=128),
+        ]
+        file_records = {"first": [{"id": 1, "name": "a"}], "second": [{"id": 2, "email": "b"}], "third": [{"id": 3}]}
+        file_reader = MagicMock(
+            is_columnar=False,
+            get_inferred_schema=MagicMock(side_effect=lambda f, file_info: {c: "string" for c in file_records[file_info.key][0]}),
+            stream_records=MagicMock(side_effect=lambda f, file_info: iter(deepcopy(file_records[file_info.key]))),
+        )
+        with patch.object(IncrementalFileStreamS3, "fileformatparser_class", MagicMock(return_value=file_reader)):
+            with patch.object(IncrementalFileStreamS3, "get_time_ordered_file_infos", MagicMock(return_value=file_infos)):
+                stream_instance = IncrementalFileStreamS3(
+                    dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**", schema_inference_sample_size=1
+                )
+                stream_instance._prefetcher = MagicMock()
+                stream_instance._schema_cache = MagicMock(get=MagicMock(return_value=None))
+                json_schema = stream_instance.get_json_schema()
+                records = []
+                for stream_slice in stream_instance.stream_slices(sync_mode=SyncMode.full_refresh):
+                    records.extend(stream_instance.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice))
+
+        # the columns unknown to the discovered schema are packed into the additional properties of every file alike
+        assert [{k: v for k, v in record.items() if k in ("id", "name", "email", "_ab_additional_properties")} for record in records] == [
+            {"id": 1, "_ab_additional_properties": {"name": "a"}},
+            {"id": 2, "_ab_additional_properties": {"email": "b"}},
+            {"id": 3, "_ab_additional_properties": {}},
+        ]
+        assert stream_instance.get_json_schema() == json_schema
+        # the schemas of the files read are cached with a single write at the end of the read
+        assert stream_instance._schema_cache.set.call_count == 3
+        assert stream_instance._schema_cache.save.call_count == 2
+
     @patch.object(
         IncrementalFileStreamS3,
         "_get_master_schema",
@@ -0,0 +1,188 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import math
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, List, Mapping, Optional, Tuple
+
+import pendulum
+from pendulum import DateTime  # type: ignore[attr-defined]
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .streams import BulkSalesforceStream
+
+logger = logging.getLogger("airbyte")
+
+RUNNING_JOB_STATES = ("UploadComplete", "InProgress")
+FAILED_JOB_STATES = ("Aborted", "Failed")
+
+
+class BulkJob:
+    """
+    Bulk API query job reading one page of a stream slice.
+    The query is built only once the job is started, so jobs can be scheduled long before their stream is read.
+    """
+
+    def __init__(
+        self,
+        stream: "BulkSalesforceStream",
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+        next_page_token: Mapping[str, Any] = None,
+    ):
+        self.stream = stream
+        self.stream_slice = stream_slice
+        self.stream_state = stream_state or {}
+        self.next_page_token = next_page_token
+        self.url: Optional[str] = None
+        self.status: Optional[str] = None
+        self.attempt_number = 0
+        self._expiration_time: Optional[DateTime] = None
+
+    def __str__(self) -> str:
+        return f"BulkJob(stream={self.stream.name}, slice={self.stream_slice}, url={self.url})"
+
+    @property
+    def started(self) -> bool:
+        return self.status is not None
+
+    @property
+    def running(self) -> bool:
+        return self.status in RUNNING_JOB_STATES
+
+    @property
+    def finished(self) -> bool:
+        return self.started and not self.running
+
+    def start(self):
+        """
+        docs: https://developer.salesforce.com/docs/atlas.en-us.api_asynch.meta/api_asynch/create_job.html
+        """
+        kwargs = dict(stream_state=self.stream_state, stream_slice=self.stream_slice, next_page_token=self.next_page_token)
+        query = self.stream.request_params(**kwargs)["q"]
+        url = f"{self.stream.url_base}{self.stream.path(**kwargs)}"
+        self.attempt_number += 1
+        job_id = self.stream.create_stream_job(query=query, url=url)
+        if not job_id:
+            # the sobject can't be read with BULK API, the stream falls back to the REST one for failed jobs
+            self.url, self.status = None, "Failed"
+            return
+        self.url, self.status = f"{url}/{job_id}", "InProgress"
+        self._expiration_time = pendulum.now().add(seconds=self.stream.DEFAULT_WAIT_TIMEOUT_SECONDS)
+
+    def update_status(self):
+        job_info = self.stream._send_http_request("GET", url=self.url).json()
+        self.status = job_info["state"]
+        if self.status in FAILED_JOB_STATES:
+            # this is only job metadata without payload
+            error_message = job_info.get("errorMessage")
+            if not error_message:
+                # not all failed response can have "errorMessage" and we need to show full response body
+                error_message = job_info
+            logger.error(f"JobStatus: {self.status}, sobject options: {self.stream.sobject_options}, error message: '{error_message}'")
+        elif self.running and pendulum.now() >= self._expiration_time:
+            logger.warning(
+                f"Not wait the {self.stream.name} data for {self.stream.DEFAULT_WAIT_TIMEOUT_SECONDS} seconds, data: {job_info}!!"
+            )
+            self.stream.abort_job(url=self.url)
+            self.status = "Aborted"
+            if self.attempt_number < self.stream.MAX_RETRY_NUMBER:
+                logger.error(f"Waiting error. Try to run this job again {self.attempt_number}/{self.stream.MAX_RETRY_NUMBER}...")
+                self.stream.delete_job(url=self.url)
+                self.start()
+
+    def result(self) -> Tuple[Optional[str], str]:
+        """Returns the url of the completed job, or None if it failed, along with the job status"""
+        if self.status in FAILED_JOB_STATES:
+            if self.url:
+                self.stream.delete_job(url=self.url)
+            return None, self.status
+        return self.url, self.status
+
+    def cancel(self):
+        """Aborts and deletes the job, if it was created"""
+        if self.running:
+            self.stream.abort_job(url=self.url)
+        if self.url:
+            self.stream.delete_job(url=self.url)
+
+
+class BulkJobScheduler:
+    """
+    Keeps up to max_jobs Bulk API jobs in flight (started and not consumed yet) across slices and pages of all streams sharing it.
+    Jobs are started in the order they were submitted, all of them are polled in a single loop. Readers consume results by waiting
+    for jobs one by one, in their cursor order, so stream state stays monotonic. A job being waited for is started at once.
+    """
+
+    MAX_JOBS = 10
+
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self._max_jobs = max_jobs
+        self._pending: Deque[BulkJob] = deque()
+        self._started: List[BulkJob] = []
+
+    def submit(self, job: BulkJob) -> BulkJob:
+        self._pending.append(job)
+        self._start_jobs()
+        return job
+
+    def wait(self, job: BulkJob) -> Tuple[Optional[str], str]:
+        """
+        Waits until job is finished, polling all running jobs meanwhile.
+        Returns the tuple containing the url of completed job (None if it failed) and its status.
+        """
+        if not job.started:
+            if job in self._pending:
+                self._pending.remove(job)
+            self._start(job)
+
+        delay_timeout = 0.0
+        delay_cnt = 0
+        if job.running:
+            # minimal starting delay is 0.5 seconds.
+            # this value was received empirically
+            time.sleep(0.5)
+        while job.running:
+            for started_job in self._started:
+                if started_job.running:
+                    started_job.update_status()
+            if not job.running:
+                break
+
+            self._start_jobs()
+            if delay_timeout < job.stream.MAX_CHECK_INTERVAL_SECONDS:
+                delay_timeout = 0.5 + math.exp(delay_cnt) / 1000.0
+                delay_cnt += 1
+
+            time.sleep(delay_timeout)
+            running_jobs = len([started_job for started_job in self._started if started_job.running])
+            logger.info(
+                f"Sleeping {delay_timeout} seconds while waiting for Job: {job.stream.name}/{job.url} to complete. "
+                f"Current state: {job.status}, {running_jobs} job(s) running"
+            )
+
+        self._started.remove(job)
+        self._start_jobs()
+        return job.result()
+
+    def _start(self, job: BulkJob):
+        job.start()
+        self._started.append(job)
+
+    def _start_jobs(self):
+        while self._pending and len(self._started) < self._max_jobs:
+            self._start(self._pending.popleft())
+
+    def close(self):
+        """Drops jobs that were scheduled but never consumed, e.g. when the sync is stopped"""
+        self._pending.clear()
+        while self._started:
+            job = self._started.pop()
+            try:
+                job.cancel()
+            except Exception as error:
+                # best effort, Salesforce drops jobs on its own after a week
+                logger.warning(f"Failed to drop {job}: {error}")
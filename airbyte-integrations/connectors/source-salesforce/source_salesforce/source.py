@@ -17,6 +17,7 @@ from airbyte_cdk.utils.traced_exception import AirbyteTracedException
 from requests import codes, exceptions  # type: ignore[import]
 
 from .api import UNSUPPORTED_BULK_API_SALESFORCE_OBJECTS, UNSUPPORTED_FILTERING_STREAMS, Salesforce
+from .bulk_jobs import BulkJobScheduler
 from .streams import BulkIncrementalSalesforceStream, BulkSalesforceStream, Describe, IncrementalSalesforceStream, SalesforceStream
 
 
@@ -81,6 +82,8 @@ class SourceSalesforce(AbstractSource):
         """ "Generates a list of stream by their names. It can be used for different tests too"""
         authenticator = TokenAuthenticator(sf_object.access_token)
         stream_properties = sf_object.generate_schemas(stream_objects)
+        # BULK jobs of all streams share the limit of concurrent jobs
+        job_scheduler = BulkJobScheduler()
         streams = []
         for stream_name, sobject_options in stream_objects.items():
             streams_kwargs = {"sobject_options": sobject_options}
@@ -91,6 +94,7 @@ class SourceSalesforce(AbstractSource):
                 full_refresh, incremental = SalesforceStream, IncrementalSalesforceStream
             elif api_type == "bulk":
                 full_refresh, incremental = BulkSalesforceStream, BulkIncrementalSalesforceStream
+                streams_kwargs["job_scheduler"] = job_scheduler
             else:
                 raise Exception(f"Stream {stream_name} cannot be processed by REST or BULK API.")
 
@@ -124,6 +128,10 @@ class SourceSalesforce(AbstractSource):
             yield from super().read(logger, config, catalog, state)
         except AirbyteStopSync:
             logger.info(f"Finished syncing {self.name}")
+        finally:
+            for stream_instance in getattr(self, "_stream_to_instance_map", {}).values():
+                if isinstance(stream_instance, BulkSalesforceStream):
+                    stream_instance.job_scheduler.close()
 
     def _read_stream(
         self,
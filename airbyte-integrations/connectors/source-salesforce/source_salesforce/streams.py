@@ -4,12 +4,12 @@
 
 import csv
 import ctypes
-import math
+import json
 import os
-import time
 from abc import ABC
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import closing
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Type, Union
+from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Type, Union
 
 import pandas as pd
 import pendulum
@@ -18,11 +18,10 @@ from airbyte_cdk.models import ConfiguredAirbyteCatalog, SyncMode
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http import HttpStream
 from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
-from numpy import nan
-from pendulum import DateTime  # type: ignore[attr-defined]
 from requests import codes, exceptions
 
 from .api import UNSUPPORTED_FILTERING_STREAMS, Salesforce
+from .bulk_jobs import BulkJob, BulkJobScheduler
 from .exceptions import SalesforceException, TmpFileIOError
 from .rate_limiting import default_backoff_handler
 
@@ -141,6 +140,15 @@ class BulkSalesforceStream(SalesforceStream):
     DEFAULT_WAIT_TIMEOUT_SECONDS = 86400  # 24-hour bulk job running time
     MAX_CHECK_INTERVAL_SECONDS = 2.0
     MAX_RETRY_NUMBER = 3
+    DOWNLOAD_CHUNK_SIZE = 1024**2  # in bytes
+    CSV_CHUNK_SIZE = 10000  # in rows
+
+    def __init__(self, job_scheduler: BulkJobScheduler = None, **kwargs):
+        super().__init__(**kwargs)
+        # shared by all BULK streams of the source, so that the limit of concurrent jobs holds for the whole sync
+        self.job_scheduler = job_scheduler or BulkJobScheduler()
+        self._scheduled_jobs: Dict[str, BulkJob] = {}
+        self._scheduled_slices: Optional[Tuple[str, List[Optional[Mapping[str, Any]]]]] = None
 
     def path(self, next_page_token: Mapping[str, Any] = None, **kwargs: Any) -> str:
         return f"/services/data/{self.sf_api.version}/jobs/query"
@@ -210,61 +218,6 @@ class BulkSalesforceStream(SalesforceStream):
                 raise error
         return None
 
-    def wait_for_job(self, url: str) -> str:
-        expiration_time: DateTime = pendulum.now().add(seconds=self.DEFAULT_WAIT_TIMEOUT_SECONDS)
-        job_status = "InProgress"
-        delay_timeout = 0.0
-        delay_cnt = 0
-        job_info = None
-        # minimal starting delay is 0.5 seconds.
-        # this value was received empirically
-        time.sleep(0.5)
-        while pendulum.now() < expiration_time:
-            job_info = self._send_http_request("GET", url=url).json()
-            job_status = job_info["state"]
-            if job_status in ["JobComplete", "Aborted", "Failed"]:
-                if job_status != "JobComplete":
-                    # this is only job metadata without payload
-                    error_message = job_info.get("errorMessage")
-                    if not error_message:
-                        # not all failed response can have "errorMessage" and we need to show full response body
-                        error_message = job_info
-                    self.logger.error(f"JobStatus: {job_status}, sobject options: {self.sobject_options}, error message: '{error_message}'")
-
-                return job_status
-
-            if delay_timeout < self.MAX_CHECK_INTERVAL_SECONDS:
-                delay_timeout = 0.5 + math.exp(delay_cnt) / 1000.0
-                delay_cnt += 1
-
-            time.sleep(delay_timeout)
-            job_id = job_info["id"]
-            self.logger.info(
-                f"Sleeping {delay_timeout} seconds while waiting for Job: {self.name}/{job_id} to complete. Current state: {job_status}"
-            )
-
-        self.logger.warning(f"Not wait the {self.name} data for {self.DEFAULT_WAIT_TIMEOUT_SECONDS} seconds, data: {job_info}!!")
-        return job_status
-
-    def execute_job(self, query: str, url: str) -> Tuple[Optional[str], Optional[str]]:
-        job_status = "Failed"
-        for i in range(0, self.MAX_RETRY_NUMBER):
-            job_id = self.create_stream_job(query=query, url=url)
-            if not job_id:
-                return None, job_status
-            job_full_url = f"{url}/{job_id}"
-            job_status = self.wait_for_job(url=job_full_url)
-            if job_status not in ["UploadComplete", "InProgress"]:
-                break
-            self.logger.error(f"Waiting error. Try to run this job again {i + 1}/{self.MAX_RETRY_NUMBER}...")
-            self.abort_job(url=job_full_url)
-            job_status = "Aborted"
-
-        if job_status in ["Aborted", "Failed"]:
-            self.delete_job(url=job_full_url)
-            return None, job_status
-        return job_full_url, job_status
-
     def filter_null_bytes(self, b: bytes):
         """
         https://github.com/airbytehq/airbyte/issues/8300
@@ -274,39 +227,90 @@ class BulkSalesforceStream(SalesforceStream):
             self.logger.warning("Filter 'null' bytes from string, size reduced %d -> %d chars", len(b), len(res))
         return res
 
-    def download_data(self, url: str, chunk_size: int = 1024) -> tuple[str, str]:
+    def download_result_page(self, url: str, locator: str = None, chunk_size: int = None) -> Tuple[str, str, Optional[str]]:
         """
-        Retrieves binary data result from successfully `executed_job`, using chunks, to avoid local memory limitations.
+        Retrieves one page of the binary data result from successfully `executed_job`, using chunks, to avoid local memory limitations.
         @ url: string - the url of the `executed_job`
-        @ chunk_size: int - the buffer size for each chunk to fetch from stream, in bytes, default: 1024 bytes
-        Return the tuple containing string with file path of downloaded binary data (Saved temporarily) and file encoding.
+        @ locator: string - the locator of the result page, the first page is retrieved if None
+        @ chunk_size: int - the buffer size for each chunk to fetch from stream, in bytes, default: DOWNLOAD_CHUNK_SIZE
+        Return the tuple containing string with file path of downloaded binary data (Saved temporarily), file encoding
+        and the locator of the next result page (None if this is the last one).
+        docs: https://developer.salesforce.com/docs/atlas.en-us.api_asynch.meta/api_asynch/query_get_job_results.htm
         """
-        # set filepath for binary data from response
-        tmp_file = os.path.realpath(os.path.basename(url))
-        with closing(self._send_http_request("GET", f"{url}/results", stream=True)) as response, open(tmp_file, "wb") as data_file:
+        # set filepath for binary data from response, pages of the same job may be downloaded at the same time
+        tmp_file = os.path.realpath(os.path.basename(url) + (f"_{locator}" if locator else ""))
+        results_url = f"{url}/results" + (f"?locator={locator}" if locator else "")
+        with closing(self._send_http_request("GET", results_url, stream=True)) as response, open(tmp_file, "wb") as data_file:
             response_encoding = response.apparent_encoding or response.encoding or self.encoding
-            for chunk in response.iter_content(chunk_size=chunk_size):
+            next_locator = response.headers.get("Sforce-Locator")
+            for chunk in response.iter_content(chunk_size=chunk_size or self.DOWNLOAD_CHUNK_SIZE):
                 data_file.write(self.filter_null_bytes(chunk))
         # check the file exists
         if os.path.isfile(tmp_file):
-            return tmp_file, response_encoding
+            return tmp_file, response_encoding, next_locator if next_locator != "null" else None
         else:
             raise TmpFileIOError(f"The IO/Error occured while verifying binary data. Stream: {self.name}, file {tmp_file} doesn't exist.")
 
-    def read_with_chunks(self, path: str, file_encoding: str, chunk_size: int = 100) -> Iterable[Tuple[int, Mapping[str, Any]]]:
+    def download_data(self, url: str, chunk_size: int = None) -> Tuple[str, str]:
+        """
+        Retrieves the first page of the binary data result from successfully `executed_job`, see `download_result_page`.
+        Return the tuple containing string with file path of downloaded binary data (Saved temporarily) and file encoding.
+        """
+        tmp_file, response_encoding, _ = self.download_result_page(url, chunk_size=chunk_size)
+        return tmp_file, response_encoding
+
+    def read_job_results(self, url: str) -> Iterable[Mapping[str, Any]]:
+        """
+        Reads all result pages of successfully `executed_job`.
+        The next page is downloaded in a background thread while the current one is parsed.
+        @ url: string - the url of the `executed_job`
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.name}_results") as executor:
+            page = executor.submit(self.download_result_page, url)
+            while page:
+                tmp_file, response_encoding, next_locator = page.result()
+                page = executor.submit(self.download_result_page, url, next_locator) if next_locator else None
+                try:
+                    yield from self.read_with_chunks(tmp_file, response_encoding)
+                except BaseException:
+                    if page and not page.cancel():
+                        # don't leave the prefetched page on disk if reading is interrupted
+                        page.add_done_callback(self._remove_result_page)
+                    raise
+
+    @staticmethod
+    def _remove_result_page(page: Future):
+        if not page.exception():
+            os.remove(page.result()[0])
+
+    @staticmethod
+    def _chunk_to_records(chunk: pd.DataFrame) -> Iterable[Mapping[str, Any]]:
+        """
+        Converts a dataframe to records column by column, which is much faster than `DataFrame.to_dict` for wide chunks.
+        Missing values (NaN) are replaced with None, the values themselves are native python types.
+        """
+        columns = []
+        for name, column in chunk.items():
+            values = column.tolist()
+            if column.dtype.kind in "fO" and column.hasnans:
+                values = [None if value != value else value for value in values]
+            columns.append(values)
+        names = list(chunk.columns)
+        for row in zip(*columns):
+            yield dict(zip(names, row))
+
+    def read_with_chunks(self, path: str, file_encoding: str, chunk_size: int = None) -> Iterable[Mapping[str, Any]]:
         """
         Reads the downloaded binary data, using lines chunks, set by `chunk_size`.
         @ path: string - the path to the downloaded temporarily binary data.
         @ file_encoding: string - encoding for binary data file according to Standard Encodings from codecs module
-        @ chunk_size: int - the number of lines to read at a time, default: 100 lines / time.
+        @ chunk_size: int - the number of lines to read at a time, default: CSV_CHUNK_SIZE lines / time.
         """
         try:
             with open(path, "r", encoding=file_encoding) as data:
-                chunks = pd.read_csv(data, chunksize=chunk_size, iterator=True, dialect="unix")
+                chunks = pd.read_csv(data, chunksize=chunk_size or self.CSV_CHUNK_SIZE, iterator=True, dialect="unix")
                 for chunk in chunks:
-                    chunk = chunk.replace({nan: None}).to_dict(orient="records")
-                    for row in chunk:
-                        yield row
+                    yield from self._chunk_to_records(chunk)
         except pd.errors.EmptyDataError as e:
             self.logger.info(f"Empty data received. {e}")
             yield from []
@@ -324,11 +328,48 @@ class BulkSalesforceStream(SalesforceStream):
     def delete_job(self, url: str):
         self._send_http_request("DELETE", url=url)
 
-    def next_page_token(self, last_record: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+    def next_page_token(self, last_record: Mapping[str, Any], page_start_date: Optional[str] = None) -> Optional[Mapping[str, Any]]:
+        """
+        @ last_record: the last record of the page just read
+        @ page_start_date: the lower bound of the cursor of that page, see `page_start_date`
+        """
         if self.primary_key and self.name not in UNSUPPORTED_FILTERING_STREAMS:
             return {"next_token": f"WHERE {self.primary_key} >= '{last_record[self.primary_key]}' "}  # type: ignore[index]
         return None
 
+    def page_start_date(
+        self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
+    ) -> Optional[str]:
+        """Lower bound of the cursor of the page requested with these params, None if the stream isn't paged by cursor"""
+        return None
+
+    def job_slices(self, stream_state: Mapping[str, Any]) -> Iterable[Optional[Mapping[str, Any]]]:
+        """Slices of the stream, the first pages of all slices are read by concurrent jobs"""
+        yield None
+
+    @staticmethod
+    def _slice_key(stream_slice: Optional[Mapping[str, Any]]) -> str:
+        return json.dumps(stream_slice, sort_keys=True, default=str)
+
+    def stream_slices(
+        self, *, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
+    ) -> Iterable[Optional[Mapping[str, Any]]]:
+        """
+        Schedules the jobs of the first pages of all slices, so that they are processed by Salesforce while previous slices are read.
+        Slices are generated once per sync mode and state, repeated calls return the scheduled ones.
+        """
+        stream_state = stream_state or {}
+        slices_key = self._slice_key([sync_mode, stream_state])
+        if self._scheduled_slices and self._scheduled_slices[0] == slices_key:
+            return self._scheduled_slices[1]
+
+        stream_slices = list(self.job_slices(stream_state))
+        for stream_slice in stream_slices:
+            job = BulkJob(self, stream_slice=stream_slice, stream_state=stream_state)
+            self._scheduled_jobs[self._slice_key(stream_slice)] = self.job_scheduler.submit(job)
+        self._scheduled_slices = slices_key, stream_slices
+        return stream_slices
+
     def request_params(
         self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
     ) -> MutableMapping[str, Any]:
@@ -354,11 +395,18 @@ class BulkSalesforceStream(SalesforceStream):
     ) -> Iterable[Mapping[str, Any]]:
         stream_state = stream_state or {}
         next_page_token = None
+        # the first page is read by the job scheduled in stream_slices, if any
+        job = self._scheduled_jobs.pop(self._slice_key(stream_slice), None)
 
         while True:
-            params = self.request_params(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
-            path = self.path(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
-            job_full_url, job_status = self.execute_job(query=params["q"], url=f"{self.url_base}{path}")
+            # kept here rather than on the stream, jobs of other slices and pages are started while this one is waited for
+            page_start_date = self.page_start_date(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
+            if not job:
+                job = self.job_scheduler.submit(
+                    BulkJob(self, stream_slice=stream_slice, stream_state=stream_state, next_page_token=next_page_token)
+                )
+            job_full_url, job_status = self.job_scheduler.wait(job)
+            job = None
             if not job_full_url:
                 if job_status == "Failed":
                     # As rule as BULK logic returns unhandled error. For instance:
@@ -367,6 +415,9 @@ class BulkSalesforceStream(SalesforceStream):
                     # Thus we can try to switch to GET sync request because its response returns obvious error message
                     standard_instance = self.get_standard_instance()
                     self.logger.warning("switch to STANDARD(non-BULK) sync. Because the SalesForce BULK job has returned a failed status")
+                    if stream_slice and page_start_date:
+                        # the standard query is bounded by the date slice too, from the page that failed on
+                        stream_slice = {**stream_slice, "start_date": page_start_date}
                     yield from standard_instance.read_records(
                         sync_mode=sync_mode, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state
                     )
@@ -375,7 +426,7 @@ class BulkSalesforceStream(SalesforceStream):
 
             count = 0
             record: Mapping[str, Any] = {}
-            for record in self.read_with_chunks(*self.download_data(url=job_full_url)):
+            for record in self.read_job_results(url=job_full_url):
                 count += 1
                 yield record
             self.delete_job(url=job_full_url)
@@ -386,14 +437,14 @@ class BulkSalesforceStream(SalesforceStream):
                 # considers that batch is smaller than the `page_size` it must be the last page.
                 break
 
-            next_page_token = self.next_page_token(record)
+            next_page_token = self.next_page_token(record, page_start_date=page_start_date)
             if not next_page_token:
                 # not found a next page data.
                 break
 
     def get_standard_instance(self) -> SalesforceStream:
         """Returns a instance of standard logic(non-BULK) with same settings"""
-        stream_kwargs = dict(
+        stream_kwargs: Dict[str, Any] = dict(
             sf_api=self.sf_api,
             pk=self.pk,
             stream_name=self.stream_name,
@@ -448,11 +499,15 @@ class IncrementalSalesforceStream(SalesforceStream, ABC):
         selected_properties = self.get_json_schema().get("properties", {})
 
         stream_date = stream_state.get(self.cursor_field)
-        start_date = stream_date or self.start_date
+        # slices are only set when a bulk stream falls back to this one for a date slice of it
+        start_date = (stream_slice or {}).get("start_date") or stream_date or self.start_date
+        end_date = (stream_slice or {}).get("end_date")
 
         query = f"SELECT {','.join(selected_properties.keys())} FROM {self.name} "
         if start_date:
             query += f"WHERE {self.cursor_field} >= {start_date} "
+            if end_date:
+                query += f"AND {self.cursor_field} < {end_date} "
         if self.name not in UNSUPPORTED_FILTERING_STREAMS:
             query += f"ORDER BY {self.cursor_field} ASC"
         return {"q": query}
@@ -473,33 +528,55 @@ class IncrementalSalesforceStream(SalesforceStream, ABC):
 
 
 class BulkIncrementalSalesforceStream(BulkSalesforceStream, IncrementalSalesforceStream):
-    def next_page_token(self, last_record: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+    STREAM_SLICE_STEP = 30  # in days
+
+    def job_slices(self, stream_state: Mapping[str, Any]) -> Iterable[Optional[Mapping[str, Any]]]:
+        start_date = stream_state.get(self.cursor_field) or self.start_date
+        if not start_date:
+            yield None
+            return
+        start, end = pendulum.parse(start_date).replace(microsecond=0), pendulum.now(tz="UTC").replace(microsecond=0)
+        while start < end:
+            slice_end = min(start.add(days=self.STREAM_SLICE_STEP), end)
+            yield {"start_date": start.to_iso8601_string(), "end_date": slice_end.to_iso8601_string()}
+            start = slice_end
+
+    def next_page_token(self, last_record: Mapping[str, Any], page_start_date: Optional[str] = None) -> Optional[Mapping[str, Any]]:
         if self.name not in UNSUPPORTED_FILTERING_STREAMS:
             page_token: str = last_record[self.cursor_field]
             res = {"next_token": page_token}
             # use primary key as additional filtering param, if cursor_field is not increased from previous page
-            if self.primary_key and self.prev_start_date == page_token:
+            if self.primary_key and page_start_date == page_token:
                 res["primary_key"] = last_record[self.primary_key]
             return res
         return None
 
+    def page_start_date(
+        self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
+    ) -> Optional[str]:
+        next_token = (next_page_token or {}).get("next_token")
+        return next_token or (stream_slice or {}).get("start_date") or stream_state.get(self.cursor_field) or self.start_date
+
     def request_params(
         self, stream_state: Mapping[str, Any], stream_slice: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
     ) -> MutableMapping[str, Any]:
         selected_properties = self.get_json_schema().get("properties", {})
 
-        stream_date = stream_state.get(self.cursor_field)
-        next_token = (next_page_token or {}).get("next_token")
         primary_key = (next_page_token or {}).get("primary_key")
-        start_date = next_token or stream_date or self.start_date
-        self.prev_start_date = start_date
+        start_date = self.page_start_date(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
+        end_date = (stream_slice or {}).get("end_date")
 
         query = f"SELECT {','.join(selected_properties.keys())} FROM {self.name} "
         if start_date:
             if primary_key and self.name not in UNSUPPORTED_FILTERING_STREAMS:
-                query += f"WHERE ({self.cursor_field} = {start_date} AND {self.primary_key} > '{primary_key}') OR ({self.cursor_field} > {start_date}) "
+                condition = (
+                    f"({self.cursor_field} = {start_date} AND {self.primary_key} > '{primary_key}') OR ({self.cursor_field} > {start_date})"
+                )
             else:
-                query += f"WHERE {self.cursor_field} >= {start_date} "
+                condition = f"{self.cursor_field} >= {start_date}"
+            if end_date:
+                condition = f"({condition}) AND {self.cursor_field} < {end_date}"
+            query += f"WHERE {condition} "
         if self.name not in UNSUPPORTED_FILTERING_STREAMS:
             order_by_fields = [self.cursor_field, self.primary_key] if self.primary_key else [self.cursor_field]
             query += f"ORDER BY {','.join(order_by_fields)} ASC LIMIT {self.page_size}"
@@ -9,11 +9,13 @@ import logging
 import re
 from unittest.mock import Mock
 
+import pendulum
 import pytest
 import requests_mock
 from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteCatalog, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode, Type
 from conftest import encoding_symbols_parameters, generate_stream
 from requests.exceptions import HTTPError
+from source_salesforce.bulk_jobs import BulkJobScheduler
 from source_salesforce.source import SourceSalesforce
 from source_salesforce.streams import (
     CSV_FIELD_SIZE_LIMIT,
@@ -219,6 +221,19 @@ def test_download_data_filter_null_bytes(stream_config, stream_api):
         assert res == [{"Id": "0014W000027f6UwQAI", "IsDeleted": False}]
 
 
+def test_read_job_results_follows_locator(stream_config, stream_api):
+    job_full_url: str = "https://fase-account.salesforce.com/services/data/v52.0/jobs/query/7504W00000bkgnpQAA"
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api)
+
+    with requests_mock.Mocker() as m:
+        m.register_uri("GET", f"{job_full_url}/results", headers={"Sforce-Locator": "page2"}, text='"Id","Amount"\n"1",\n"2","2.5"\n')
+        m.register_uri("GET", f"{job_full_url}/results?locator=page2", headers={"Sforce-Locator": "null"}, text='"Id","Amount"\n"3","1"\n')
+        res = list(stream.read_job_results(url=job_full_url))
+
+    assert res == [{"Id": 1, "Amount": None}, {"Id": 2, "Amount": 2.5}, {"Id": 3, "Amount": 1}]
+    assert [r.qs.get("locator") for r in m.request_history] == [None, ["page2"]]
+
+
 @pytest.mark.parametrize(
     "chunk_size, content_type, content, expected_result",
     encoding_symbols_parameters(),
@@ -615,3 +630,108 @@ def test_bulk_stream_paging(stream_config, stream_api_pk):
 
         q = f"{SELECT} WHERE (LastModifiedDate = {last_modified_date2} AND Id > '4') OR (LastModifiedDate > {last_modified_date2}) {ORDER_BY}"
         assert get_query(12) == q
+
+
+def test_bulk_stream_slices_jobs_run_concurrently(stream_config, stream_api_pk):
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api_pk)
+    stream_state = {"LastModifiedDate": "2022-10-01T00:00:00Z"}
+
+    with requests_mock.Mocker() as m, pendulum.test(pendulum.datetime(2022, 11, 15)):
+        m.register_uri("POST", stream.path(), [{"json": {"id": "1"}}, {"json": {"id": "2"}}])
+        for job_id in ["1", "2"]:
+            m.register_uri("GET", stream.path() + f"/{job_id}", json={"state": "JobComplete"})
+            m.register_uri("GET", stream.path() + f"/{job_id}/results", text=f"LastModifiedDate,Id\n2022-10-0{job_id}T00:00:00Z,{job_id}")
+            m.register_uri("DELETE", stream.path() + f"/{job_id}")
+
+        stream_slices = stream.stream_slices(sync_mode=SyncMode.incremental, stream_state=stream_state)
+        assert stream_slices == [
+            {"start_date": "2022-10-01T00:00:00Z", "end_date": "2022-10-31T00:00:00Z"},
+            {"start_date": "2022-10-31T00:00:00Z", "end_date": "2022-11-15T00:00:00Z"},
+        ]
+        # jobs of all slices are created before any of them is read
+        assert [request.method for request in m.request_history] == ["POST", "POST"]
+        assert m.request_history[1].json()["query"] == (
+            "SELECT LastModifiedDate,Id FROM Account WHERE (LastModifiedDate >= 2022-10-31T00:00:00Z) "
+            "AND LastModifiedDate < 2022-11-15T00:00:00Z ORDER BY LastModifiedDate,Id ASC LIMIT 15000"
+        )
+
+        records = [
+            record
+            for stream_slice in stream_slices
+            for record in stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice, stream_state=stream_state)
+        ]
+        assert [record["Id"] for record in records] == [1, 2]
+        assert len([request for request in m.request_history if request.method == "POST"]) == 2
+
+
+def test_bulk_stream_slices_fallback_to_rest(stream_config, stream_api_pk):
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api_pk)
+    stream_state = {"LastModifiedDate": "2022-10-01T00:00:00Z"}
+    rest_path = stream.get_standard_instance().path()
+
+    def rest_records(request, context):
+        # a record of the window of the slice queried
+        start_date = re.search(r"LASTMODIFIEDDATE >= (\S+)", request.qs["q"][0].upper()).group(1)
+        return {"done": True, "records": [{"Id": start_date, "LastModifiedDate": start_date}]}
+
+    with requests_mock.Mocker() as m, pendulum.test(pendulum.datetime(2022, 11, 15)):
+        m.register_uri("POST", stream.path(), [{"json": {"id": "1"}}, {"json": {"id": "2"}}])
+        for job_id in ["1", "2"]:
+            m.register_uri("GET", stream.path() + f"/{job_id}", json={"state": "Failed", "errorMessage": "unexpected exception"})
+            m.register_uri("DELETE", stream.path() + f"/{job_id}")
+        m.register_uri("GET", rest_path, json=rest_records)
+
+        stream_slices = stream.stream_slices(sync_mode=SyncMode.incremental, stream_state=stream_state)
+        records = [
+            record
+            for stream_slice in stream_slices
+            for record in stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice, stream_state=stream_state)
+        ]
+
+        # every slice falls back to a REST query of its own window only, so no record is read twice
+        assert [record["Id"] for record in records] == ["2022-10-01T00:00:00Z", "2022-10-31T00:00:00Z"]
+        rest_queries = [request.qs["q"][0].upper() for request in m.request_history if request.path == rest_path.lower()]
+        assert rest_queries == [
+            "SELECT LASTMODIFIEDDATE,ID FROM ACCOUNT WHERE LASTMODIFIEDDATE >= 2022-10-01T00:00:00Z "
+            "AND LASTMODIFIEDDATE < 2022-10-31T00:00:00Z ORDER BY LASTMODIFIEDDATE ASC",
+            "SELECT LASTMODIFIEDDATE,ID FROM ACCOUNT WHERE LASTMODIFIEDDATE >= 2022-10-31T00:00:00Z "
+            "AND LASTMODIFIEDDATE < 2022-11-15T00:00:00Z ORDER BY LASTMODIFIEDDATE ASC",
+        ]
+
+
+def test_bulk_stream_paging_of_concurrent_slices(stream_config, stream_api_pk):
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api_pk)
+    stream.page_size = 2
+    # the job of the second slice is started only while the first page of the first slice is waited for
+    stream.job_scheduler = BulkJobScheduler(max_jobs=1)
+    stream_state = {"LastModifiedDate": "2022-10-01T00:00:00Z"}
+
+    csv_header = "LastModifiedDate,Id"
+    pages = [
+        ["2022-10-01T00:00:00Z,1", "2022-10-01T00:00:00Z,3"],
+        ["2022-10-31T00:00:00Z,2"],
+        ["2022-10-01T00:00:00Z,5"],
+    ]
+
+    with requests_mock.Mocker() as m, pendulum.test(pendulum.datetime(2022, 11, 15)):
+        m.register_uri("POST", stream.path(), [{"json": {"id": f"{job_id}"}} for job_id in range(1, len(pages) + 1)])
+        for job_id, page in enumerate(pages, 1):
+            m.register_uri("GET", stream.path() + f"/{job_id}", json={"state": "JobComplete"})
+            m.register_uri("GET", stream.path() + f"/{job_id}/results", text="\n".join([csv_header] + page))
+            m.register_uri("DELETE", stream.path() + f"/{job_id}")
+
+        stream_slices = stream.stream_slices(sync_mode=SyncMode.incremental, stream_state=stream_state)
+        records = [
+            record
+            for stream_slice in stream_slices[:1]
+            for record in stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice, stream_state=stream_state)
+        ]
+
+        assert [record["Id"] for record in records] == [1, 3, 5]
+        queries = [request.json()["query"] for request in m.request_history if request.method == "POST"]
+        # the second page of the first slice still breaks the cursor tie by primary key
+        assert queries[2] == (
+            "SELECT LastModifiedDate,Id FROM Account WHERE ((LastModifiedDate = 2022-10-01T00:00:00Z AND Id > '3') "
+            "OR (LastModifiedDate > 2022-10-01T00:00:00Z)) AND LastModifiedDate < 2022-10-31T00:00:00Z "
+            "ORDER BY LastModifiedDate,Id ASC LIMIT 2"
+        )
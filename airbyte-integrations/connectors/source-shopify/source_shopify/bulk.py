@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+import time
+from typing import Any, Iterable, Iterator, Mapping, MutableMapping, Optional
+
+import requests
+
+
+class ShopifyBulkError(Exception):
+    """Bulk Operation couldn't be submitted or didn't complete"""
+
+
+class ShopifyBulkManager:
+    """
+    Runs the GraphQL queries as Bulk Operations: https://shopify.dev/api/usage/bulk-operations/queries
+    The query is submitted with `bulkOperationRunQuery`, the operation is polled until it's completed,
+    then the JSONL result is streamed line by line and the child objects are nested back into their parents.
+    Only one Bulk Operation per shop is allowed to run at a time, so the operations are run one after another.
+    """
+
+    POLL_INTERVAL = 5
+    JOB_TIMEOUT = 6 * 60 * 60
+
+    CREATE_QUERY = """
+    mutation bulkOperationRunQuery($query: String!) {
+      bulkOperationRunQuery(query: $query) {
+        bulkOperation { id status }
+        userErrors { field message }
+      }
+    }
+    """
+
+    STATUS_QUERY = """
+    query bulkOperation($id: ID!) {
+      node(id: $id) {
+        ... on BulkOperation { id status errorCode objectCount url }
+      }
+    }
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        base_url: str,
+        logger: logging.Logger,
+        poll_interval: float = POLL_INTERVAL,
+        job_timeout: float = JOB_TIMEOUT,
+    ):
+        self._session = session
+        self._url = f"{base_url}graphql.json"
+        self._logger = logger
+        self._poll_interval = poll_interval
+        self._job_timeout = job_timeout
+
+    def _request(self, query: str, variables: Mapping[str, Any]) -> Mapping[str, Any]:
+        response = self._session.post(self._url, json={"query": query, "variables": variables})
+        response.raise_for_status()
+        json_response = response.json()
+        if json_response.get("errors"):
+            raise ShopifyBulkError(f"GraphQL request failed: {json_response['errors']}")
+        return json_response["data"]
+
+    def create_job(self, query: str) -> str:
+        """Submits the query as Bulk Operation, returns its id"""
+        data = self._request(self.CREATE_QUERY, {"query": query})["bulkOperationRunQuery"]
+        if data["userErrors"]:
+            raise ShopifyBulkError(f"Bulk Operation couldn't be submitted: {data['userErrors']}")
+        return data["bulkOperation"]["id"]
+
+    def wait_for_job(self, job_id: str) -> Optional[str]:
+        """Polls the Bulk Operation until it's completed, returns the url of the result, None if there are no results"""
+        started = time.monotonic()
+        while True:
+            job = self._request(self.STATUS_QUERY, {"id": job_id})["node"]
+            if job["status"] == "COMPLETED":
+                self._logger.info(f"Bulk Operation {job_id} completed with {job['objectCount']} objects.")
+                return job["url"]
+            if job["status"] in ("FAILED", "CANCELED", "EXPIRED"):
+                raise ShopifyBulkError(f"Bulk Operation {job_id} is {job['status']}, error code: {job['errorCode']}")
+            if time.monotonic() - started > self._job_timeout:
+                raise ShopifyBulkError(
+                    f"Bulk Operation {job_id} isn't completed after {self._job_timeout} seconds, status: {job['status']}"
+                )
+            time.sleep(self._poll_interval)
+
+    @staticmethod
+    def read_jsonl(url: str) -> Iterator[MutableMapping[str, Any]]:
+        # the result is a signed url of the storage bucket, the shop credentials aren't sent there
+        with requests.get(url, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def run(self, query: str) -> Iterator[MutableMapping[str, Any]]:
+        """Runs the query as Bulk Operation, yields the top level objects with their children nested"""
+        job_id = self.create_job(query)
+        self._logger.info(f"Bulk Operation {job_id} is submitted.")
+        url = self.wait_for_job(job_id)
+        if url:
+            yield from nest_records(self.read_jsonl(url))
+
+
+def gid_to_id(gid: str) -> int:
+    """The numeric id of GraphQL global id, e.g. `gid://shopify/Metafield/123` -> 123, the one REST API uses"""
+    return int(gid.rsplit("/", 1)[-1])
+
+
+def nest_records(records: Iterable[MutableMapping[str, Any]]) -> Iterator[MutableMapping[str, Any]]:
+    """
+    Nests the child objects of the Bulk Operation result back into their parents by `__parentId`,
+    children are added to the list under their `__typename` (the query has to select it for the nested connections).
+    The objects of the result are written right after their parent, so only the subtree
+    of the current top level object is kept in memory, it's yielded as soon as the next top level object starts.
+    """
+    current, subtree = None, {}
+    for record in records:
+        parent_id = record.pop("__parentId", None)
+        if parent_id is None:
+            if current is not None:
+                yield current
+            current, subtree = record, {}
+        else:
+            parent = subtree.get(parent_id)
+            if parent is None:
+                raise ShopifyBulkError(f"Parent {parent_id} of the Bulk Operation object {record.get('id')} isn't found.")
+            parent.setdefault(record.pop("__typename", "children"), []).append(record)
+        if record.get("id") is not None:
+            subtree[record["id"]] = record
+    if current is not None:
+        yield current
@@ -4,6 +4,7 @@
 
 
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
 from urllib.parse import parse_qsl, urlparse
 
@@ -14,6 +15,7 @@ from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http import HttpStream
 
 from .auth import ShopifyAuthenticator
+from .bulk import ShopifyBulkManager, gid_to_id
 from .transform import DataTypeEnforcer
 from .utils import SCOPES_MAPPING
 from .utils import EagerlyCachedStreamState as stream_state_cache
@@ -184,10 +186,11 @@ class ShopifySubstream(IncrementalShopifyStream):
     nested_substream = None
     nested_substream_list_field_id = None
 
-    @property
+    @cached_property
     def parent_stream(self) -> object:
         """
         Returns the instance of parent stream, if the substream has a `parent_stream_class` dependency.
+        The instance is created once per substream, as it's used for every record in `get_updated_state`.
         """
         return self.parent_stream_class(self.config) if self.parent_stream_class else None
 
@@ -295,7 +298,63 @@ class ShopifySubstream(IncrementalShopifyStream):
         yield from self.filter_records_newer_than_state(stream_state=stream_state, records_slice=records)
 
 
-class MetafieldShopifySubstream(ShopifySubstream):
+class BulkShopifySubstream(ShopifySubstream, ABC):
+    """
+    BulkShopifySubstream - the substream which could be read with a single GraphQL Bulk Operation,
+    instead of the API Call per parent record, once `bulk_operations` is enabled in config.
+    The parent records are read along with the substream records, within the single slice.
+
+    ::  @ bulk_parent_connection - the GraphQL connection of the parent records, the substream is read with REST API if not set.
+    """
+
+    bulk_parent_connection: str = None
+
+    @property
+    def bulk_mode(self) -> bool:
+        return bool(self.config.get("bulk_operations")) and self.bulk_parent_connection is not None
+
+    @abstractmethod
+    def bulk_query(self, parent_stream_state: Mapping[str, Any]) -> str:
+        """The Bulk Operation query of the parent records updated since the parent stream state, with the substream records nested"""
+
+    @abstractmethod
+    def parse_bulk_record(self, parent_record: Mapping[str, Any]) -> Iterable[MutableMapping[str, Any]]:
+        """The substream records, in the shape of REST API records, out of the parent record read with Bulk Operation"""
+
+    def read_bulk_records(self, stream_state: Mapping[str, Any] = None) -> Iterable[Mapping[str, Any]]:
+        parent_stream_state = stream_state.get(self.parent_stream.name) if stream_state else {}
+        bulk_manager = ShopifyBulkManager(self._session, self.url_base, self.logger)
+        updated_parent_state = {}
+        for parent_record in bulk_manager.run(self.bulk_query(parent_stream_state)):
+            # the same way as for the REST API slices, the child stream keeps the state of it's parent stream
+            updated_parent_state = self.parent_stream.get_updated_state(
+                updated_parent_state, {self.parent_stream.cursor_field: parent_record["updatedAt"]}
+            )
+            stream_state_cache.cached_state[self.parent_stream.name] = updated_parent_state
+            for record in self.parse_bulk_record(parent_record):
+                record["shop_url"] = self.config["shop"]
+                yield self._transformer.transform(record)
+
+    def stream_slices(self, stream_state: Mapping[str, Any] = None, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        if self.bulk_mode:
+            yield {}
+        else:
+            yield from super().stream_slices(stream_state=stream_state, **kwargs)
+
+    def read_records(
+        self,
+        stream_state: Mapping[str, Any] = None,
+        stream_slice: Optional[Mapping[str, Any]] = None,
+        **kwargs,
+    ) -> Iterable[Mapping[str, Any]]:
+        if self.bulk_mode:
+            self.logger.info(f"Reading {self.name} with Bulk Operation")
+            yield from self.filter_records_newer_than_state(stream_state=stream_state, records_slice=self.read_bulk_records(stream_state))
+        else:
+            yield from super().read_records(stream_state=stream_state, stream_slice=stream_slice, **kwargs)
+
+
+class MetafieldShopifySubstream(BulkShopifySubstream):
     slice_key = "id"
     data_field = "metafields"
 
@@ -305,6 +364,41 @@ class MetafieldShopifySubstream(ShopifySubstream):
         object_id = stream_slice[self.slice_key]
         return f"{self.parent_stream_class.data_field}/{object_id}/{self.data_field}.json"
 
+    def bulk_query(self, parent_stream_state: Mapping[str, Any]) -> str:
+        updated_at = (parent_stream_state or {}).get(self.parent_stream.cursor_field) or self.config["start_date"]
+        return f"""
+        {{
+          {self.bulk_parent_connection}(query: "updated_at:>='{updated_at}'", sortKey: UPDATED_AT) {{
+            edges {{
+              node {{
+                id
+                updatedAt
+                metafields {{
+                  edges {{ node {{ __typename id namespace key value type description createdAt updatedAt }} }}
+                }}
+              }}
+            }}
+          }}
+        }}
+        """
+
+    def parse_bulk_record(self, parent_record: Mapping[str, Any]) -> Iterable[MutableMapping[str, Any]]:
+        for metafield in parent_record.get("Metafield", []):
+            yield {
+                "id": gid_to_id(metafield["id"]),
+                "namespace": metafield["namespace"],
+                "key": metafield["key"],
+                "value": metafield["value"],
+                "type": metafield["type"],
+                "description": metafield["description"],
+                "owner_id": gid_to_id(parent_record["id"]),
+                # `orders` -> `order`, the same way as REST API names the owner resource
+                "owner_resource": self.parent_stream_class.data_field[:-1],
+                "created_at": metafield["createdAt"],
+                "updated_at": metafield["updatedAt"],
+                "admin_graphql_api_id": metafield["id"],
+            }
+
 
 class Articles(IncrementalShopifyStream):
     data_field = "articles"
@@ -343,6 +437,7 @@ class Customers(IncrementalShopifyStream):
 
 class MetafieldCustomers(MetafieldShopifySubstream):
     parent_stream_class: object = Customers
+    bulk_parent_connection = "customers"
 
 
 class Orders(IncrementalShopifyStream):
@@ -362,6 +457,7 @@ class Orders(IncrementalShopifyStream):
 
 class MetafieldOrders(MetafieldShopifySubstream):
     parent_stream_class: object = Orders
+    bulk_parent_connection = "orders"
 
 
 class DraftOrders(IncrementalShopifyStream):
@@ -373,6 +469,7 @@ class DraftOrders(IncrementalShopifyStream):
 
 class MetafieldDraftOrders(MetafieldShopifySubstream):
     parent_stream_class: object = DraftOrders
+    bulk_parent_connection = "draftOrders"
 
 
 class Products(IncrementalShopifyStream):
@@ -385,6 +482,7 @@ class Products(IncrementalShopifyStream):
 
 class MetafieldProducts(MetafieldShopifySubstream):
     parent_stream_class: object = Products
+    bulk_parent_connection = "products"
 
 
 class ProductImages(ShopifySubstream):
@@ -0,0 +1,184 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+
+import pytest
+import requests
+from airbyte_cdk.models import SyncMode
+from source_shopify.auth import ShopifyAuthenticator
+from source_shopify.bulk import ShopifyBulkError, ShopifyBulkManager, nest_records
+from source_shopify.source import BulkShopifySubstream, MetafieldArticles, MetafieldOrders, OrderRefunds
+from source_shopify.utils import EagerlyCachedStreamState as stream_state_cache
+
+GRAPHQL_URL = "https://test_shop.myshopify.com/admin/api/2022-10/graphql.json"
+RESULT_URL = "https://storage.googleapis.com/bulk-operation-outputs/result.jsonl"
+JOB_ID = "gid://shopify/BulkOperation/1"
+
+
+@pytest.fixture
+def bulk_config(basic_config):
+    basic_config["start_date"] = "2022-01-01"
+    basic_config["bulk_operations"] = True
+    basic_config["authenticator"] = ShopifyAuthenticator(basic_config)
+    return basic_config
+
+
+def bulk_responses(requests_mock, statuses, jsonl_lines):
+    created = {"json": {"data": {"bulkOperationRunQuery": {"bulkOperation": {"id": JOB_ID, "status": "CREATED"}, "userErrors": []}}}}
+    polled = [
+        {"json": {"data": {"node": {"id": JOB_ID, "status": status, "errorCode": None, "objectCount": "3", "url": RESULT_URL}}}}
+        for status in statuses
+    ]
+    requests_mock.post(GRAPHQL_URL, [created, *polled])
+    requests_mock.get(RESULT_URL, text="\n".join(json.dumps(line) for line in jsonl_lines))
+
+
+def test_nest_records():
+    records = [
+        {"id": "gid://shopify/Order/1"},
+        {"id": "gid://shopify/Metafield/11", "__typename": "Metafield", "__parentId": "gid://shopify/Order/1"},
+        {"id": "gid://shopify/Order/2"},
+        {"id": "gid://shopify/LineItem/21", "__typename": "LineItem", "__parentId": "gid://shopify/Order/2"},
+        {"id": "gid://shopify/Metafield/211", "__typename": "Metafield", "__parentId": "gid://shopify/LineItem/21"},
+        {"id": "gid://shopify/Metafield/22", "__typename": "Metafield", "__parentId": "gid://shopify/Order/2"},
+    ]
+
+    assert list(nest_records(records)) == [
+        {"id": "gid://shopify/Order/1", "Metafield": [{"id": "gid://shopify/Metafield/11"}]},
+        {
+            "id": "gid://shopify/Order/2",
+            "LineItem": [{"id": "gid://shopify/LineItem/21", "Metafield": [{"id": "gid://shopify/Metafield/211"}]}],
+            "Metafield": [{"id": "gid://shopify/Metafield/22"}],
+        },
+    ]
+
+
+def test_nest_records_unknown_parent():
+    records = [{"id": "gid://shopify/Order/1"}, {"id": "gid://shopify/Metafield/11", "__parentId": "gid://shopify/Order/0"}]
+
+    with pytest.raises(ShopifyBulkError, match="gid://shopify/Order/0"):
+        list(nest_records(records))
+
+
+def test_bulk_manager_run(requests_mock):
+    bulk_responses(
+        requests_mock,
+        ["RUNNING", "COMPLETED"],
+        [
+            {"id": "gid://shopify/Order/1"},
+            {"id": "gid://shopify/Metafield/11", "__typename": "Metafield", "__parentId": "gid://shopify/Order/1"},
+        ],
+    )
+    manager = ShopifyBulkManager(
+        requests.Session(), "https://test_shop.myshopify.com/admin/api/2022-10/", logging.getLogger(), poll_interval=0
+    )
+
+    assert list(manager.run("{ orders { edges { node { id } } } }")) == [
+        {"id": "gid://shopify/Order/1", "Metafield": [{"id": "gid://shopify/Metafield/11"}]}
+    ]
+    assert requests_mock.request_history[0].json()["variables"] == {"query": "{ orders { edges { node { id } } } }"}
+    assert requests_mock.request_history[1].json()["variables"] == {"id": JOB_ID}
+
+
+@pytest.mark.parametrize(
+    "create_response,poll_status,error",
+    [
+        ({"bulkOperation": None, "userErrors": [{"field": None, "message": "already in progress"}]}, None, "already in progress"),
+        ({"bulkOperation": {"id": JOB_ID, "status": "CREATED"}, "userErrors": []}, "FAILED", "is FAILED"),
+    ],
+)
+def test_bulk_manager_errors(requests_mock, create_response, poll_status, error):
+    requests_mock.post(
+        GRAPHQL_URL,
+        [
+            {"json": {"data": {"bulkOperationRunQuery": create_response}}},
+            {"json": {"data": {"node": {"id": JOB_ID, "status": poll_status, "errorCode": "INTERNAL_SERVER_ERROR", "url": None}}}},
+        ],
+    )
+    manager = ShopifyBulkManager(
+        requests.Session(), "https://test_shop.myshopify.com/admin/api/2022-10/", logging.getLogger(), poll_interval=0
+    )
+
+    with pytest.raises(ShopifyBulkError, match=error):
+        list(manager.run("{ orders { edges { node { id } } } }"))
+
+
+def test_metafield_orders_bulk_read(requests_mock, bulk_config):
+    bulk_responses(
+        requests_mock,
+        ["COMPLETED"],
+        [
+            {"id": "gid://shopify/Order/1", "updatedAt": "2022-03-01T00:00:00Z"},
+            {
+                "__typename": "Metafield",
+                "id": "gid://shopify/Metafield/11",
+                "namespace": "custom",
+                "key": "gift",
+                "value": "true",
+                "type": "boolean",
+                "description": None,
+                "createdAt": "2022-02-01T00:00:00Z",
+                "updatedAt": "2022-02-01T00:00:00Z",
+                "__parentId": "gid://shopify/Order/1",
+            },
+            {"id": "gid://shopify/Order/2", "updatedAt": "2022-03-02T00:00:00Z"},
+            {
+                "__typename": "Metafield",
+                "id": "gid://shopify/Metafield/21",
+                "namespace": "custom",
+                "key": "gift",
+                "value": "false",
+                "type": "boolean",
+                "description": None,
+                "createdAt": "2022-02-10T00:00:00Z",
+                "updatedAt": "2022-03-02T00:00:00Z",
+                "__parentId": "gid://shopify/Order/2",
+            },
+        ],
+    )
+    stream = MetafieldOrders(bulk_config)
+    stream_state = {"updated_at": "2022-02-15T00:00:00Z", "orders": {"updated_at": "2022-02-10T00:00:00Z"}}
+
+    stream_slices = list(stream.stream_slices(sync_mode=SyncMode.incremental, stream_state=stream_state))
+    records = list(stream.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slices[0], stream_state=stream_state))
+
+    assert stream_slices == [{}]
+    assert records == [
+        {
+            "id": 21,
+            "namespace": "custom",
+            "key": "gift",
+            "value": "false",
+            "type": "boolean",
+            "description": None,
+            "owner_id": 2,
+            "owner_resource": "order",
+            "created_at": "2022-02-10T00:00:00Z",
+            "updated_at": "2022-03-02T00:00:00Z",
+            "admin_graphql_api_id": "gid://shopify/Metafield/21",
+            "shop_url": "test_shop",
+        }
+    ]
+    assert "updated_at:>='2022-02-10T00:00:00Z'" in requests_mock.request_history[0].json()["variables"]["query"]
+    assert stream.get_updated_state(stream_state, records[0]) == {
+        "updated_at": "2022-03-02T00:00:00Z",
+        "orders": {"updated_at": "2022-03-02T00:00:00Z"},
+    }
+    stream_state_cache.cached_state.clear()
+
+
+def test_bulk_mode_only_for_supported_substreams(bulk_config):
+    assert MetafieldOrders(bulk_config).bulk_mode
+    assert not MetafieldArticles(bulk_config).bulk_mode
+    assert not isinstance(OrderRefunds(bulk_config), BulkShopifySubstream)
+    bulk_config["bulk_operations"] = False
+    assert not MetafieldOrders(bulk_config).bulk_mode
+
+
+def test_parent_stream_instance_is_cached(bulk_config):
+    stream = OrderRefunds(bulk_config)
+
+    assert stream.parent_stream is stream.parent_stream
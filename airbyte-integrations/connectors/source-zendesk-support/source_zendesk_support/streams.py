@@ -4,15 +4,16 @@
 
 import calendar
 import re
-import time
+import threading
 from abc import ABC
 from collections import deque
-from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from functools import partial
 from math import ceil
 from pickle import PickleError, dumps
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
+from queue import Full, Queue
+from typing import Any, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 from urllib.parse import parse_qsl, urljoin, urlparse
 
 import pendulum
@@ -45,6 +46,14 @@ class SourceZendeskException(Exception):
     """default exception of custom SourceZendesk logic"""
 
 
+class ExportTimeMissing(Exception):
+    """A record of the export has no export time, so it can't be placed in a time range"""
+
+    def __init__(self, start_time: int):
+        super().__init__(f"a record of the export page starting at {start_time} has no export time")
+        self.start_time = start_time
+
+
 class SourceZendeskSupportFuturesSession(FuturesSession):
     """
     Check the docs at https://github.com/ross/requests-futures
@@ -157,6 +166,8 @@ class SourceZendeskSupportStream(BaseSourceZendeskSupportStream):
 
     response_list_name: str = None
     future_requests: deque = None
+    # upper bound of requests sent ahead of the page being read, requests-futures runs 8 worker threads by default
+    max_in_flight_requests = 8
 
     transformer = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
 
@@ -166,6 +177,7 @@ class SourceZendeskSupportStream(BaseSourceZendeskSupportStream):
         self._session = SourceZendeskSupportFuturesSession()
         self._session.auth = authenticator
         self.future_requests = deque()
+        self._in_flight_window = self.max_in_flight_requests
 
     @property
     def url_base(self) -> str:
@@ -227,9 +239,48 @@ class SourceZendeskSupportStream(BaseSourceZendeskSupportStream):
             )
 
             request_kwargs = self.request_kwargs(stream_state=stream_state, stream_slice=stream_slice)
-            self.future_requests.append(
-                {"future": self._send_request(request, request_kwargs), "request": request, "request_kwargs": request_kwargs, "retries": 0}
-            )
+            # requests are only sent once there is room for them in the window, see `_fill_window`
+            self.future_requests.append({"future": None, "request": request, "request_kwargs": request_kwargs, "retries": 0})
+        self._fill_window()
+
+    def _fill_window(self):
+        """
+        Sends pending requests in page order, keeping at most `_in_flight_window` of them sent and not read yet.
+        Failed responses behind the first page are rescheduled as soon as they're found rather than once they're read.
+        """
+        in_flight = 0
+        for position, item in enumerate(self.future_requests):
+            if in_flight >= self._in_flight_window:
+                break
+            future = item["future"]
+            if future is None:
+                item["future"] = self._send_request(item["request"], item["request_kwargs"])
+            elif position and future.done() and item["retries"] < self.max_retries:
+                exception = future.exception()
+                response = None if exception else future.result()
+                if isinstance(exception, TRANSIENT_EXCEPTIONS) or (response is not None and self.should_retry(response)):
+                    if response is not None:
+                        self._adapt_window(response)
+                    self._schedule_retry(item, response=response)
+            in_flight += 1
+
+    def _adapt_window(self, response: requests.Response):
+        """
+        Scales the window of in-flight requests with the share of the rate limit left,
+        the X-Rate-Limit header holds the amount of requests per minute and X-Rate-Limit-Remaining the amount left of it.
+        The window is halved on every rate limited response and grows back one by one if there are no headers.
+        """
+        if response.status_code == requests.codes.too_many_requests:
+            self._in_flight_window = max(1, self._in_flight_window // 2)
+            return
+        try:
+            rate_limit = int(to_int(response.headers["X-Rate-Limit"]))
+            remaining = int(to_int(response.headers["X-Rate-Limit-Remaining"]))
+        except (KeyError, TypeError, ValueError):
+            self._in_flight_window = min(self.max_in_flight_requests, self._in_flight_window + 1)
+            return
+        if rate_limit > 0:
+            self._in_flight_window = min(self.max_in_flight_requests, max(1, ceil(self.max_in_flight_requests * remaining / rate_limit)))
 
     def _send(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> Future:
         response: Future = self._session.send_future(request, **request_kwargs)
@@ -238,6 +289,32 @@ class SourceZendeskSupportStream(BaseSourceZendeskSupportStream):
     def _send_request(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> Future:
         return self._send(request, request_kwargs)
 
+    def _send_request_later(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any], delay: float) -> Future:
+        """
+        Sends the request from a timer thread once `delay` seconds have passed.
+        The returned future completes with the response, so the reader waits on it like on any other request rather than sleeping.
+        """
+        if delay <= 0:
+            return self._send_request(request, request_kwargs)
+        future: Future = Future()
+
+        def send():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                sent = self._send_request(request, request_kwargs)
+            except Exception as exc:
+                future.set_exception(exc)
+                return
+            sent.add_done_callback(
+                lambda done: future.set_exception(done.exception()) if done.exception() else future.set_result(done.result())
+            )
+
+        timer = threading.Timer(delay, send)
+        timer.daemon = True
+        timer.start()
+        return future
+
     def request_params(
         self, stream_state: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None, **kwargs
     ) -> MutableMapping[str, Any]:
@@ -258,29 +335,21 @@ class SourceZendeskSupportStream(BaseSourceZendeskSupportStream):
 
         return params
 
-    def _retry(
-        self,
-        request: requests.PreparedRequest,
-        retries: int,
-        original_exception: Exception = None,
-        response: requests.Response = None,
-        **request_kwargs,
-    ):
-        if retries == self.max_retries:
+    def _schedule_retry(self, item: MutableMapping[str, Any], response: requests.Response = None):
+        """Sends the request again after the backoff time, the requests of the following pages keep running meanwhile"""
+        delay = 0
+        if response is not None:
+            delay = max(0, int(self.backoff_time(response) - response.elapsed.total_seconds()))
+        item.update(future=self._send_request_later(item["request"], item["request_kwargs"], delay), retries=item["retries"] + 1)
+
+    def _retry(self, item: MutableMapping[str, Any], original_exception: Exception = None, response: requests.Response = None):
+        if item["retries"] == self.max_retries:
             if original_exception:
                 raise original_exception
-            raise DefaultBackoffException(request=request, response=response)
-        if response:
-            backoff_time = self.backoff_time(response)
-            time.sleep(max(0, int(backoff_time - response.elapsed.total_seconds())))
-        self.future_requests.append(
-            {
-                "future": self._send_request(request, request_kwargs),
-                "request": request,
-                "request_kwargs": request_kwargs,
-                "retries": retries + 1,
-            }
-        )
+            raise DefaultBackoffException(request=item["request"], response=response)
+        self._schedule_retry(item, response=response)
+        # keeps the page order of records
+        self.future_requests.appendleft(item)
 
     def read_records(
         self,
@@ -292,16 +361,17 @@ class SourceZendeskSupportStream(BaseSourceZendeskSupportStream):
         self.generate_future_requests(sync_mode=sync_mode, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state)
 
         while len(self.future_requests) > 0:
+            self._fill_window()
+            # the window always holds the next page, a retried one is sent by a timer once its backoff time has passed
             item = self.future_requests.popleft()
-            request, retries, future, kwargs = item["request"], item["retries"], item["future"], item["request_kwargs"]
-
             try:
-                response = future.result()
+                response = item["future"].result()
             except TRANSIENT_EXCEPTIONS as exc:
-                self._retry(request=request, retries=retries, original_exception=exc, **kwargs)
+                self._retry(item, original_exception=exc)
                 continue
+            self._adapt_window(response)
             if self.should_retry(response):
-                self._retry(request=request, retries=retries, response=response, **kwargs)
+                self._retry(item, response=response)
                 continue
             yield from self.parse_response(response, stream_state=stream_state, stream_slice=stream_slice)
 
@@ -388,10 +458,20 @@ class SourceZendeskIncrementalExportStream(SourceZendeskSupportCursorPaginationS
     @ param response_list_name: the main nested entity to look at inside of response, default = response_list_name
     @ param sideload_param : parameter variable to include various information to response
         more info: https://developer.zendesk.com/documentation/ticketing/using-the-zendesk-api/side_loading/#supported-endpoints
+    @ param export_time_field : record field the export is ordered by, the export window is split into time ranges read
+        concurrently by it, default = None (the export is read page by page)
     """
 
     response_list_name: str = None
     sideload_param: str = None
+    export_time_field: str = None
+    # the export window is split into up to max_partitions time ranges, none of them shorter than min_partition_seconds
+    max_partitions = 4
+    min_partition_seconds = 7 * 24 * 60 * 60
+    # pages a time range reads ahead of the records being emitted
+    partition_buffer_pages = 4
+
+    _END = object()
 
     @staticmethod
     def check_start_time_param(requested_start_time: int, value: int = 1):
@@ -425,8 +505,120 @@ class SourceZendeskIncrementalExportStream(SourceZendeskSupportCursorPaginationS
         return params
 
     def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
-        for record in response.json().get(self.response_list_name, []):
-            yield record
+        yield from self.parse_records(response.json().get(self.response_list_name, []))
+
+    def parse_records(self, records: List[Mapping[str, Any]]) -> Iterable[Mapping]:
+        yield from records
+
+    def get_partitions(self, stream_state: Mapping[str, Any] = None) -> List[Tuple[int, Optional[int]]]:
+        """
+        Splits the export window, from the state (or the start date) to a minute ago, into time ranges of the same length.
+        The last range is open, it's read until the end of the export as the sequential read does.
+        """
+        if not self.export_time_field:
+            return []
+        start_time = self.request_params(stream_state=stream_state)["start_time"]
+        end_time = self.check_start_time_param(calendar.timegm(pendulum.now().utctimetuple()))
+        partitions_count = min(self.max_partitions, (end_time - start_time) // self.min_partition_seconds)
+        if partitions_count < 2:
+            return []
+        bounds = [start_time + (end_time - start_time) * n // partitions_count for n in range(partitions_count)]
+        return list(zip(bounds, bounds[1:] + [None]))
+
+    def get_export_time(self, record: Mapping[str, Any]) -> Optional[int]:
+        value = record.get(self.export_time_field)
+        return value if value is None or isinstance(value, int) else self.str2unixtime(value)
+
+    def read_partition_pages(
+        self, partition: Tuple[int, Optional[int]], stream_state: Mapping[str, Any] = None
+    ) -> Iterator[List[Mapping[str, Any]]]:
+        """
+        Reads the export from the start of the time range with the cursor based pagination, until the next page starts
+        after the range. Records exported after the range are dropped, the next range reads them.
+
+        :raises ExportTimeMissing: if a record of a bounded range has no export time
+        """
+        start_time, end_time = partition
+        while True:
+            _, response = self._fetch_next_page(stream_state=stream_state, next_page_token={self.cursor_field: start_time})
+            response_json = response.json()
+            records = response_json.get(self.response_list_name, [])
+            if end_time is not None:
+                export_times = [self.get_export_time(record) for record in records]
+                if None in export_times:
+                    raise ExportTimeMissing(start_time)
+                records = [record for record, export_time in zip(records, export_times) if export_time < end_time]
+            yield records
+
+            next_page = response_json.get(self.next_page_field)
+            next_start_time = dict(parse_qsl(urlparse(next_page or "").query)).get("start_time")
+            if response_json.get(END_OF_STREAM_KEY, False) or not next_start_time or int(next_start_time) == start_time:
+                return
+            start_time = int(next_start_time)
+            if end_time is not None and start_time >= end_time:
+                return
+
+    def _read_partition(self, partition: Tuple[int, Optional[int]], stream_state: Mapping[str, Any], pages: Queue, stop: threading.Event):
+        try:
+            for records in self.read_partition_pages(partition, stream_state=stream_state):
+                if not self._put(pages, records, stop):
+                    return
+            item = self._END
+        except BaseException as e:
+            item = e
+        self._put(pages, item, stop)
+
+    @staticmethod
+    def _put(pages: Queue, item: Any, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def read_records(
+        self,
+        sync_mode: SyncMode,
+        cursor_field: List[str] = None,
+        stream_slice: Mapping[str, Any] = None,
+        stream_state: Mapping[str, Any] = None,
+    ) -> Iterable[Mapping[str, Any]]:
+        """
+        Reads the time ranges of the export window concurrently and emits their records range by range,
+        so records come in the order of the export, as they do when it's read page by page.
+        Once a range hits a record without the export time, the rest of the export is read page by page from that page on.
+        """
+        partitions = self.get_partitions(stream_state)
+        if not partitions:
+            yield from super().read_records(sync_mode, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state)
+            return
+
+        stop = threading.Event()
+        partition_pages = [Queue(maxsize=self.partition_buffer_pages) for _ in partitions]
+        executor = ThreadPoolExecutor(max_workers=len(partitions), thread_name_prefix=f"{self.name}_partitions")
+        for partition, pages in zip(partitions, partition_pages):
+            executor.submit(self._read_partition, partition, stream_state, pages, stop)
+        try:
+            for pages in partition_pages:
+                while True:
+                    item = pages.get()
+                    if item is self._END:
+                        break
+                    if isinstance(item, ExportTimeMissing):
+                        self.logger.info(f"{item}, reading the rest of the {self.name} export page by page.")
+                        stop.set()
+                        for records in self.read_partition_pages((item.start_time, None), stream_state=stream_state):
+                            yield from self.parse_records(records)
+                        return
+                    if isinstance(item, BaseException):
+                        raise item
+                    yield from self.parse_records(item)
+        finally:
+            # workers blocked on a full buffer exit on the stop event
+            stop.set()
+            executor.shutdown(wait=False)
 
 
 class SourceZendeskSupportTicketEventsExportStream(SourceZendeskIncrementalExportStream):
@@ -450,8 +642,8 @@ class SourceZendeskSupportTicketEventsExportStream(SourceZendeskIncrementalExpor
         """Returns True/False based on list_entities_from_event property"""
         return True if len(self.list_entities_from_event) > 0 else False
 
-    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
-        for record in super().parse_response(response, **kwargs):
+    def parse_records(self, records: List[Mapping[str, Any]]) -> Iterable[Mapping]:
+        for record in super().parse_records(records):
             for event in record.get(self.response_target_entity, []):
                 if event.get("event_type") == self.event_type:
                     if self.update_event_from_record:
@@ -464,6 +656,7 @@ class Users(SourceZendeskIncrementalExportStream):
     """Users stream: https://developer.zendesk.com/api-reference/ticketing/ticket-management/incremental_exports/#incremental-user-export"""
 
     response_list_name: str = "users"
+    export_time_field: str = "updated_at"
 
 
 class Organizations(SourceZendeskSupportStream):
@@ -474,6 +667,7 @@ class Tickets(SourceZendeskIncrementalExportStream):
     """Tickets stream: https://developer.zendesk.com/api-reference/ticketing/ticket-management/incremental_exports/#incremental-ticket-export-time-based"""
 
     response_list_name: str = "tickets"
+    export_time_field: str = "generated_timestamp"
     transformer: TypeTransformer = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
 
 
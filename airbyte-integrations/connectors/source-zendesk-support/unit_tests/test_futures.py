@@ -3,6 +3,7 @@
 #
 
 import json
+from concurrent.futures import Future
 from datetime import timedelta
 from urllib.parse import urljoin
 
@@ -131,3 +132,92 @@ def test_read_records(mocker, records_count, page_size, expected_futures_deque_l
                 list(stream.read_records(sync_mode=SyncMode.full_refresh))
         else:
             assert list(stream.read_records(sync_mode=SyncMode.full_refresh)) == list(record_gen(end=expected_records_count))
+
+
+class ImmediateTimer:
+    """Stands in for threading.Timer, runs the function at once and records the delay it was scheduled with"""
+
+    delays = []
+
+    def __init__(self, interval, function):
+        self.interval, self.function = interval, function
+        self.daemon = False
+
+    def start(self):
+        self.delays.append(self.interval)
+        self.function()
+
+
+def test_read_records_window_and_page_order(mocker):
+    mocker.patch("threading.Timer", ImmediateTimer)
+    ImmediateTimer.delays = []
+    stream = Macros(**STREAM_ARGS)
+    stream.page_size = 1
+    stream.max_in_flight_requests = stream._in_flight_window = 2
+    attempts = {}
+
+    def records_callback(request, context):
+        page = int(request.qs["page"][0])
+        attempts[page] = attempts.get(page, 0) + 1
+        if page == 2 and attempts[page] == 1:
+            context.status_code = 429
+            context.headers["Retry-After"] = "30"
+            return "{}"
+        return json.dumps({"macros": [{"id": page, stream.cursor_field: "2020-01-01T00:00:00Z"}]})
+
+    with requests_mock.Mocker() as m:
+        m.get(urljoin(stream.url_base, f"{stream.path()}/count.json"), text=json.dumps({"count": {"value": 5}}))
+        m.get(urljoin(stream.url_base, stream.path()), text=records_callback, headers={"X-Rate-Limit": "700"})
+
+        stream.generate_future_requests(sync_mode=SyncMode.full_refresh, cursor_field=stream.cursor_field)
+        assert len(stream.future_requests) == 5
+        assert len([item for item in stream.future_requests if item["future"]]) == 2
+        for item in stream.future_requests:
+            if item["future"]:
+                item["future"].result()
+        stream.future_requests.clear()
+        attempts.clear()
+
+        records = list(stream.read_records(sync_mode=SyncMode.full_refresh))
+
+    # the rate limited page is retried in place, by a timer set to the Retry-After header instead of a sleep
+    assert [record["id"] for record in records] == [1, 2, 3, 4, 5]
+    assert attempts == {1: 1, 2: 2, 3: 1, 4: 1, 5: 1}
+    # less the time the rate limited response took
+    assert len(ImmediateTimer.delays) == 1 and 29 <= ImmediateTimer.delays[0] <= 30
+
+
+def test_send_request_later_waits_on_timer(mocker):
+    timer = mocker.patch("threading.Timer")
+    stream = Macros(**STREAM_ARGS)
+    response = requests.Response()
+    stream._send_request = mocker.Mock(return_value=Future())
+    stream._send_request.return_value.set_result(response)
+
+    future = stream._send_request_later(mocker.Mock(), {}, 10)
+    timer.assert_called_once()
+    assert timer.call_args[0][0] == 10
+    # nothing is sent before the timer fires
+    assert not future.done() and not stream._send_request.called
+
+    timer.call_args[0][1]()
+    assert future.result(timeout=0) is response
+
+
+@pytest.mark.parametrize(
+    "status_code, headers, window, expected_window",
+    [
+        (200, {"X-Rate-Limit": "700", "X-Rate-Limit-Remaining": "700"}, 4, 8),
+        (200, {"X-Rate-Limit": "700", "X-Rate-Limit-Remaining": "350"}, 8, 4),
+        (200, {"X-Rate-Limit": "700", "X-Rate-Limit-Remaining": "0"}, 8, 1),
+        (200, {}, 4, 5),
+        (429, {"X-Rate-Limit": "700", "X-Rate-Limit-Remaining": "0"}, 5, 2),
+    ],
+)
+def test_adapt_window(requests_mock, status_code, headers, window, expected_window):
+    stream = Macros(**STREAM_ARGS)
+    stream._in_flight_window = window
+    requests_mock.get("https://fake-subdomain.zendesk.com/api/v2/macros", status_code=status_code, headers=headers)
+
+    stream._adapt_window(requests.get("https://fake-subdomain.zendesk.com/api/v2/macros"))
+    assert stream._in_flight_window == expected_window
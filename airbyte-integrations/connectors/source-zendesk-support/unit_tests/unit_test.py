@@ -14,6 +14,7 @@ import pytest
 import pytz
 import requests
 from airbyte_cdk import AirbyteLogger
+from airbyte_cdk.models import SyncMode
 from source_zendesk_support.source import BasicApiTokenAuthenticator, SourceZendeskSupport
 from source_zendesk_support.streams import (
     DATETIME_FORMAT,
@@ -721,6 +722,58 @@ class TestSourceZendeskIncrementalExportStream:
         output = list(stream.parse_response(test_response))
         assert expected == output
 
+    def test_read_records_by_partitions(self, requests_mock):
+        start_time = calendar.timegm(pendulum.parse(STREAM_ARGS["start_date"]).utctimetuple())
+        tickets = [{"id": n, "generated_timestamp": start_time + n * 5 * 24 * 60 * 60} for n in range(40)]
+
+        def export_page(request, context):
+            page_start_time = int(request.qs["start_time"][0])
+            page = [ticket for ticket in tickets if ticket["generated_timestamp"] >= page_start_time][:3]
+            end_time = page[-1]["generated_timestamp"] + 1 if page else page_start_time
+            return {
+                "tickets": page,
+                "next_page": f"{URL_BASE}incremental/tickets.json?start_time={end_time}",
+                "end_of_stream": len(page) < 3,
+            }
+
+        requests_mock.get(f"{URL_BASE}incremental/tickets.json", json=export_page)
+        stream = Tickets(**STREAM_ARGS)
+        partitions = stream.get_partitions()
+        assert len(partitions) == stream.max_partitions
+        assert partitions[-1][1] is None
+
+        records = list(stream.read_records(sync_mode=SyncMode.incremental, stream_state={}))
+        assert records == tickets
+
+        stream.max_partitions = 1
+        assert stream.get_partitions() == []
+        assert list(stream.read_records(sync_mode=SyncMode.incremental, stream_state={})) == tickets
+
+    def test_read_records_by_partitions_without_export_time(self, requests_mock):
+        start_time = calendar.timegm(pendulum.parse(STREAM_ARGS["start_date"]).utctimetuple())
+        tickets = [{"id": n, "generated_timestamp": start_time + n * 5 * 24 * 60 * 60} for n in range(40)]
+        # a record in the middle of the export has no export time, the API still exports it in its place
+        exported_at = {
+            ticket["id"]: ticket.pop("generated_timestamp") if ticket["id"] == 15 else ticket["generated_timestamp"] for ticket in tickets
+        }
+
+        def export_page(request, context):
+            page_start_time = int(request.qs["start_time"][0])
+            page = [ticket for ticket in tickets if exported_at[ticket["id"]] >= page_start_time][:3]
+            end_time = exported_at[page[-1]["id"]] + 1 if page else page_start_time
+            return {
+                "tickets": page,
+                "next_page": f"{URL_BASE}incremental/tickets.json?start_time={end_time}",
+                "end_of_stream": len(page) < 3,
+            }
+
+        requests_mock.get(f"{URL_BASE}incremental/tickets.json", json=export_page)
+        stream = Tickets(**STREAM_ARGS)
+        assert len(stream.get_partitions()) == stream.max_partitions
+
+        # the rest of the export is read page by page, no record is lost
+        assert list(stream.read_records(sync_mode=SyncMode.incremental, stream_state={})) == tickets
+
 
 class TestSourceZendeskSupportTicketEventsExportStream:
     @pytest.mark.parametrize(